@@ -0,0 +1,127 @@
+"""Small in-process TTL + LRU cache for read-mostly query results.
+
+Entries expire ``ttl`` seconds after they are stored, and the least
+recently used entry is evicted once ``maxsize`` is reached. Writers that
+change the underlying data call ``clear()`` after committing. A cache built
+with a ``version`` function also keys each entry on the data version it
+reads from the session, or on the version the caller already holds. A
+write made by another process, or by raw SQL, therefore turns cached values
+into misses straight away.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+DASHBOARD_CACHE_SIZE = int(os.getenv("DASHBOARD_CACHE_SIZE", "256"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+        version: Optional[Callable[[Any], Hashable]] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._version = version
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by clear() so a value computed before an invalidation is
+        # not stored after it.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._timer():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (self._timer() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+    def cached(self, fn: Callable[..., T]) -> Callable[..., T]:
+        """Cache a ``fn(db, *args, **kwargs)`` service function.
+
+        The session is not part of the key, but the data version is. Callers
+        that have already read it pass it as ``data_version``, which saves a
+        query per call; otherwise it is read through the session. The
+        remaining arguments must be hashable.
+        """
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(db, *args, data_version: Optional[Hashable] = None, **kwargs):
+            if data_version is None and self._version is not None:
+                data_version = self._version(db)
+            key = (name, data_version, args, tuple(sorted(kwargs.items())))
+            generation = self._generation
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn(db, *args, **kwargs)
+                self.set(key, value, generation)
+            return value
+
+        return wrapper
+
+
+def _campaigns_version(db) -> int:
+    # Imported here because campaign_service imports this module.
+    from app.services.campaign_service import get_change_version
+
+    return get_change_version(db)
+
+
+# Keyed on the trigger-maintained campaigns version, which is also what the
+# dashboard ETags are built from, so a cached body always matches its tag.
+dashboard_cache = TTLCache(
+    maxsize=DASHBOARD_CACHE_SIZE, ttl=DASHBOARD_CACHE_TTL, version=_campaigns_version
+)
@@ -0,0 +1,64 @@
+"""Maintenance commands, run from ``backend/`` as ``python -m app.cli ...``.
+
+    python -m app.cli rollups rebuild   # recompute campaign_rollups and campaign_pacing
+    python -m app.cli rollups check     # exit 1 if either has drifted
+"""
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.services import rollup_service
+
+
+def rebuild_rollups() -> int:
+    with SessionLocal() as db:
+        groups = rollup_service.rebuild_rollups(db)
+        rows = rollup_service.rebuild_pacing(db)
+    print(f"Rebuilt campaign_rollups: {groups} groups")
+    print(f"Rebuilt campaign_pacing: {rows} rows")
+    return 0
+
+
+def check_rollups() -> int:
+    with SessionLocal() as db:
+        mismatches = rollup_service.check_rollups(db)
+        pacing = rollup_service.check_pacing(db)
+    for m in mismatches:
+        print(
+            f"{m.status}/{m.category}/{m.created_date}: "
+            f"count {m.actual_count} != {m.expected_count}, "
+            f"budget {m.actual_budget} != {m.expected_budget}"
+        )
+    for p in pacing:
+        print(
+            f"{p.status}/{p.category}/{p.platform}/{p.day}: "
+            f"count {p.actual_count} != {p.expected_count}, "
+            f"rate change {p.actual_rate_change} != {p.expected_rate_change}"
+        )
+    if mismatches or pacing:
+        print(
+            f"{len(mismatches)} rollup groups and {len(pacing)} pacing rows "
+            "out of sync; run `rollups rebuild`"
+        )
+        return 1
+    print("campaign_rollups and campaign_pacing are consistent")
+    return 0
+
+
+COMMANDS = {
+    ("rollups", "rebuild"): rebuild_rollups,
+    ("rollups", "check"): check_rollups,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    groups = parser.add_subparsers(dest="group", required=True)
+    rollups = groups.add_parser("rollups", help="campaign dashboard rollups")
+    rollups.add_argument("action", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+    return COMMANDS[(args.group, args.action)]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
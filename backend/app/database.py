@@ -1,20 +1,126 @@
 import os
+from typing import Any, Callable, TypeVar
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./campaigns.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
+# When enabled, request handlers talk to the database through an async
+# driver (aiosqlite / asyncpg) on the event loop instead of a threadpool.
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in ``url`` for its async counterpart."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(backend, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Connection pool settings for server databases (Postgres). SQLite keeps
+# SQLAlchemy's defaults since connections there are just file handles.
+POOL_OPTIONS: dict[str, Any] = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# writer commits; synchronous=NORMAL is durable across app crashes in WAL
+# mode and only risks the last commits on power loss.
+SQLITE_PRAGMAS: dict[str, Any] = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def engine_options(url: str, pool_options: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine for ``url``."""
+    if _is_sqlite(url):
+        return {"connect_args": {"check_same_thread": False}}
+    return dict(POOL_OPTIONS if pool_options is None else pool_options)
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: dict[str, Any]) -> None:
+    """Run ``PRAGMA name = value`` for each of ``pragmas`` on every new connection."""
+    statements = []
+    for name, value in pragmas.items():
+        if not (isinstance(value, int) or str(value).isalnum()):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def make_engine(
+    url: str = DATABASE_URL,
+    pool_options: dict[str, Any] | None = None,
+    sqlite_pragmas: dict[str, Any] | None = None,
+) -> Engine:
+    engine = create_engine(url, **engine_options(url, pool_options))
+    if _is_sqlite(url):
+        pragmas = SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+        install_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def make_async_engine(
+    url: str = ASYNC_DATABASE_URL,
+    pool_options: dict[str, Any] | None = None,
+    sqlite_pragmas: dict[str, Any] | None = None,
+) -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(url, pool_options))
+    if _is_sqlite(url):
+        pragmas = SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+        install_sqlite_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = make_async_engine() if USE_ASYNC_DB else None
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -26,3 +132,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+DbSession = Session | AsyncSession
+
+# Dependency used by the routers. In sync mode this *is* get_db, so
+# dependency_overrides[get_db] keeps working for tests.
+get_session = get_async_db if USE_ASYNC_DB else get_db
+
+T = TypeVar("T")
+
+
+async def run_db(
+    db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Call the sync service function ``fn(session, *args, **kwargs)`` from async code.
+
+    With an AsyncSession the function runs via ``run_sync``: its queries are
+    awaited on the event loop through the async driver, no thread involved.
+    With a plain Session it runs in the threadpool, as sync handlers did.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
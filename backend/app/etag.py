@@ -0,0 +1,51 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.database import DbSession, get_session, run_db
+from app.services import campaign_service
+
+
+def make_etag(version: int, request: Request) -> str:
+    """Strong ETag for ``request`` at campaign-table ``version``.
+
+    Query parameters are sorted so equivalent URLs share a tag.
+    """
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_session),
+) -> str:
+    """Dependency answering 304 when the client already has the current data.
+
+    The tag comes from the campaign table's change version, so it costs one
+    primary-key lookup and no body is built for a 304. Otherwise the ETag
+    and Cache-Control headers are set on the injected response; handlers
+    that return their own Response must copy ``response.headers``. The
+    version is also left on ``request.state.change_version``.
+    """
+    version = await run_db(db, campaign_service.get_change_version)
+    # Handlers that can answer from precomputed data compare against it.
+    request.state.change_version = version
+    etag = make_etag(version, request)
+    # no-cache lets browsers store the body but revalidate it on every use.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
@@ -0,0 +1,34 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.schemas.campaign import CampaignFilters
+
+
+def campaign_filters(
+    status: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    platform: Optional[str] = Query(None),
+    active_from: Optional[date] = Query(
+        None, description="Only campaigns still running on or after this date"
+    ),
+    active_to: Optional[date] = Query(
+        None, description="Only campaigns starting on or before this date"
+    ),
+) -> CampaignFilters:
+    """Query-string filters shared by campaign list, export and dashboard routes."""
+    try:
+        return CampaignFilters(
+            status=status,
+            category=category,
+            platform=platform,
+            active_from=active_from,
+            active_to=active_to,
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(
+            exc.errors(include_url=False, include_context=False)
+        )
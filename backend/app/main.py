@@ -1,15 +1,22 @@
+import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import Base, engine
-from app.models.campaign import Campaign  # noqa: F401 - register model with Base
+from app.database import SessionLocal, async_engine, engine
+from app.migrate import run_migrations
 from app.routers.campaigns import router as campaigns_router
 from app.routers.dashboard import router as dashboard_router
 from app.routers.news import router as news_router
+from app.services import news_service, news_store
+from app.services.dashboard_snapshot import (
+    DASHBOARD_SNAPSHOT_INTERVAL,
+    dashboard_snapshots,
+    run_snapshots,
+)
 
 load_dotenv()
 
@@ -18,8 +25,25 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    news_client = news_service.make_http_client()
+    news_service.set_http_client(news_client)
+    tasks = []
+    if DASHBOARD_SNAPSHOT_INTERVAL > 0:
+        tasks.append(asyncio.create_task(
+            run_snapshots(dashboard_snapshots, SessionLocal, DASHBOARD_SNAPSHOT_INTERVAL)
+        ))
+    if news_store.NEWS_INGEST_INTERVAL > 0:
+        tasks.append(asyncio.create_task(news_store.run_ingester(SessionLocal)))
     yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    news_service.set_http_client(None)
+    await news_client.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(title="Campaign Tracker API", lifespan=lifespan)
@@ -30,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Age", "ETag", "X-Next-Cursor"],
 )
 
 app.include_router(campaigns_router)
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, inspect
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+# Revision matching the schema that ``Base.metadata.create_all`` used to build
+# before migrations were introduced.
+BASELINE_REVISION = "0001"
+
+
+def _alembic_config(connection) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def run_migrations(engine: Engine, revision: str = "head") -> None:
+    """Upgrade the database schema to ``revision``.
+
+    Databases created by the old ``create_all`` startup hook have the
+    ``campaigns`` table but no ``alembic_version`` table; they are stamped
+    at the baseline revision first so only the newer migrations run.
+    """
+    with engine.connect() as connection:
+        tables = inspect(connection).get_table_names()
+        # Alembic manages its own transactions (and autocommit blocks for
+        # concurrent index builds), so release the one inspect() began.
+        connection.commit()
+
+        config = _alembic_config(connection)
+        if "campaigns" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
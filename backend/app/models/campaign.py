@@ -1,13 +1,28 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, DateTime, Float, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, query_expression
 
 from app.database import Base
 
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # Keep in sync with migrations/versions/0002_campaign_indexes.py.
+        Index("ix_campaigns_status_category_start_date", "status", "category", "start_date"),
+        Index("ix_campaigns_category_budget", "category", "budget"),
+        Index("ix_campaigns_budget_id", "budget", "id"),
+        Index("ix_campaigns_start_date_id", "start_date", "id"),
+        Index("ix_campaigns_created_at", "created_at"),
+        # Covering indexes for pivot GROUP BYs; keep in sync with
+        # migrations/versions/0007_campaign_pivot_indexes.py.
+        Index(
+            "ix_campaigns_status_category_platform_budget",
+            "status", "category", "platform", "budget",
+        ),
+        Index("ix_campaigns_platform_budget", "platform", "budget"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -22,3 +37,5 @@ class Campaign(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
+    # Populated only by full-text search queries (see campaign_service).
+    search_rank: Mapped[float | None] = query_expression()
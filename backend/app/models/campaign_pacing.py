@@ -0,0 +1,154 @@
+"""Per-(status, category, platform, day) changes in planned daily spend.
+
+A campaign spends ``budget / days`` on each day from ``start_date`` through
+``end_date``. Database triggers on ``campaigns`` add that rate to the row
+for its start day and subtract it from the row for the day after its end,
+so a running sum over days gives the planned spend per day. Pacing reads
+then scale with the number of groups and days rather than the number of
+campaigns. ``campaign_count`` counts the campaigns referencing a row, and
+rows are deleted when it drops to zero. Campaigns ending before they start
+are left out. Keep in sync with migrations/versions/0009_campaign_pacing.py.
+"""
+from datetime import date
+
+from sqlalchemy import DDL, Date, Float, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.campaign import Campaign
+
+
+class CampaignPacing(Base):
+    __tablename__ = "campaign_pacing"
+
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    platform: Mapped[str] = mapped_column(String(50), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate_change: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    campaign_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def _sqlite_edges(row: str) -> list[tuple[str, str]]:
+    """(day, signed rate) for the start and the day after the end of ``row``."""
+    rate = (
+        f"{row}.budget / (julianday({row}.end_date) - julianday({row}.start_date) + 1)"
+    )
+    return [
+        (f"date({row}.start_date)", rate),
+        (f"date({row}.end_date, '+1 day')", f"-{rate}"),
+    ]
+
+
+def _sqlite_add(row: str) -> str:
+    return "\n".join(
+        f"""INSERT INTO campaign_pacing
+            (status, category, platform, day, rate_change, campaign_count)
+        SELECT {row}.status, {row}.category, {row}.platform, {day}, {rate}, 1
+        WHERE {row}.end_date >= {row}.start_date
+        ON CONFLICT (status, category, platform, day) DO UPDATE SET
+            rate_change = rate_change + excluded.rate_change,
+            campaign_count = campaign_count + 1;"""
+        for day, rate in _sqlite_edges(row)
+    )
+
+
+def _sqlite_remove(row: str) -> str:
+    statements = []
+    for day, rate in _sqlite_edges(row):
+        key = (
+            f"status = {row}.status AND category = {row}.category"
+            f" AND platform = {row}.platform AND day = {day}"
+        )
+        statements.append(f"""UPDATE campaign_pacing SET
+            rate_change = rate_change - ({rate}),
+            campaign_count = campaign_count - 1
+        WHERE {key} AND {row}.end_date >= {row}.start_date;
+        DELETE FROM campaign_pacing WHERE {key} AND campaign_count <= 0;""")
+    return "\n".join(statements)
+
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_insert
+        AFTER INSERT ON campaigns BEGIN
+        {_sqlite_add("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_delete
+        AFTER DELETE ON campaigns BEGIN
+        {_sqlite_remove("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_update
+        AFTER UPDATE OF status, category, platform, budget, start_date, end_date
+        ON campaigns
+        WHEN OLD.status IS NOT NEW.status OR OLD.category IS NOT NEW.category
+            OR OLD.platform IS NOT NEW.platform OR OLD.budget IS NOT NEW.budget
+            OR OLD.start_date IS NOT NEW.start_date OR OLD.end_date IS NOT NEW.end_date
+        BEGIN
+        {_sqlite_remove("OLD")}
+        {_sqlite_add("NEW")}
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION maintain_campaign_pacing() RETURNS trigger AS $$
+    DECLARE
+        rate double precision;
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM campaign_pacing;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.status IS NOT DISTINCT FROM NEW.status
+            AND OLD.category IS NOT DISTINCT FROM NEW.category
+            AND OLD.platform IS NOT DISTINCT FROM NEW.platform
+            AND OLD.budget IS NOT DISTINCT FROM NEW.budget
+            AND OLD.start_date IS NOT DISTINCT FROM NEW.start_date
+            AND OLD.end_date IS NOT DISTINCT FROM NEW.end_date THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_date >= OLD.start_date THEN
+            rate := OLD.budget / (OLD.end_date - OLD.start_date + 1);
+            UPDATE campaign_pacing SET
+                rate_change = rate_change
+                    - CASE WHEN day = OLD.start_date THEN rate ELSE -rate END,
+                campaign_count = campaign_count - 1
+            WHERE status = OLD.status AND category = OLD.category
+                AND platform = OLD.platform
+                AND day IN (OLD.start_date, OLD.end_date + 1);
+            DELETE FROM campaign_pacing
+            WHERE status = OLD.status AND category = OLD.category
+                AND platform = OLD.platform
+                AND day IN (OLD.start_date, OLD.end_date + 1)
+                AND campaign_count <= 0;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.end_date >= NEW.start_date THEN
+            rate := NEW.budget / (NEW.end_date - NEW.start_date + 1);
+            INSERT INTO campaign_pacing
+                (status, category, platform, day, rate_change, campaign_count)
+            VALUES
+                (NEW.status, NEW.category, NEW.platform, NEW.start_date, rate, 1),
+                (NEW.status, NEW.category, NEW.platform, NEW.end_date + 1, -rate, 1)
+            ON CONFLICT (status, category, platform, day) DO UPDATE SET
+                rate_change = campaign_pacing.rate_change + EXCLUDED.rate_change,
+                campaign_count = campaign_pacing.campaign_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaign_pacing
+        AFTER INSERT OR UPDATE OR DELETE ON campaigns
+        FOR EACH ROW EXECUTE FUNCTION maintain_campaign_pacing()""",
+    """CREATE TRIGGER campaign_pacing_truncate
+        AFTER TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION maintain_campaign_pacing()""",
+]
+
+for statement in SQLITE_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in POSTGRES_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
@@ -0,0 +1,123 @@
+"""Per-(status, category, created date) campaign counts and budget sums.
+
+Database triggers on ``campaigns`` keep the rollups current inside the
+writing transaction, so every write path (single, bulk, PATCH, raw SQL)
+is covered and dashboard reads scale with the number of groups rather
+than the number of campaigns. Groups whose count drops to zero are
+deleted. Keep in sync with migrations/versions/0005_campaign_rollups.py.
+"""
+from datetime import date
+
+from sqlalchemy import DDL, Date, Float, Index, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.campaign import Campaign
+
+
+class CampaignRollup(Base):
+    __tablename__ = "campaign_rollups"
+    __table_args__ = (
+        # Range scans for the time series; keep in sync with
+        # migrations/versions/0006_campaign_rollups_created_date.py.
+        Index("ix_campaign_rollups_created_date", "created_date"),
+    )
+
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    created_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    campaign_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_budget: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+def _sqlite_add(row: str) -> str:
+    return f"""INSERT INTO campaign_rollups
+            (status, category, created_date, campaign_count, total_budget)
+        VALUES ({row}.status, {row}.category, date({row}.created_at), 1, {row}.budget)
+        ON CONFLICT (status, category, created_date) DO UPDATE SET
+            campaign_count = campaign_count + 1,
+            total_budget = total_budget + excluded.total_budget;"""
+
+
+def _sqlite_remove(row: str) -> str:
+    key = (
+        f"status = {row}.status AND category = {row}.category"
+        f" AND created_date = date({row}.created_at)"
+    )
+    return f"""UPDATE campaign_rollups SET
+            campaign_count = campaign_count - 1,
+            total_budget = total_budget - {row}.budget
+        WHERE {key};
+        DELETE FROM campaign_rollups WHERE {key} AND campaign_count <= 0;"""
+
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_insert
+        AFTER INSERT ON campaigns BEGIN
+        {_sqlite_add("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_delete
+        AFTER DELETE ON campaigns BEGIN
+        {_sqlite_remove("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_update
+        AFTER UPDATE OF status, category, budget, created_at ON campaigns
+        WHEN OLD.status IS NOT NEW.status OR OLD.category IS NOT NEW.category
+            OR OLD.budget IS NOT NEW.budget OR OLD.created_at IS NOT NEW.created_at
+        BEGIN
+        {_sqlite_remove("OLD")}
+        {_sqlite_add("NEW")}
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION maintain_campaign_rollups() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM campaign_rollups;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.status IS NOT DISTINCT FROM NEW.status
+            AND OLD.category IS NOT DISTINCT FROM NEW.category
+            AND OLD.budget IS NOT DISTINCT FROM NEW.budget
+            AND OLD.created_at IS NOT DISTINCT FROM NEW.created_at THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE campaign_rollups SET
+                campaign_count = campaign_count - 1,
+                total_budget = total_budget - OLD.budget
+            WHERE status = OLD.status AND category = OLD.category
+                AND created_date = OLD.created_at::date;
+            DELETE FROM campaign_rollups
+            WHERE status = OLD.status AND category = OLD.category
+                AND created_date = OLD.created_at::date AND campaign_count <= 0;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            INSERT INTO campaign_rollups
+                (status, category, created_date, campaign_count, total_budget)
+            VALUES (NEW.status, NEW.category, NEW.created_at::date, 1, NEW.budget)
+            ON CONFLICT (status, category, created_date) DO UPDATE SET
+                campaign_count = campaign_rollups.campaign_count + 1,
+                total_budget = campaign_rollups.total_budget + EXCLUDED.total_budget;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaign_rollups
+        AFTER INSERT OR UPDATE OR DELETE ON campaigns
+        FOR EACH ROW EXECUTE FUNCTION maintain_campaign_rollups()""",
+    """CREATE TRIGGER campaign_rollups_truncate
+        AFTER TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION maintain_campaign_rollups()""",
+]
+
+for statement in SQLITE_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in POSTGRES_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
@@ -0,0 +1,62 @@
+"""Full-text search index over campaign name and description.
+
+SQLite keeps an external-content FTS5 table in sync through triggers.
+Postgres uses a GIN index on a tsvector expression, which the database
+maintains itself. Keep in sync with migrations/versions/0003_campaign_search.py.
+"""
+from sqlalchemy import DDL, Index, event, func, literal_column
+
+from app.models.campaign import Campaign
+
+FTS_TABLE = "campaigns_fts"
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='campaigns', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaigns_fts_insert AFTER INSERT ON campaigns BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaigns_fts_delete AFTER DELETE ON campaigns BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaigns_fts_update
+        AFTER UPDATE OF name, description ON campaigns BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+SQLITE_DROP = [f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+
+TS_CONFIG = literal_column("'english'")
+
+
+def search_vector():
+    """The tsvector expression indexed on Postgres; queries must match it exactly."""
+    # Literal strings (not bound parameters) so the expression matches the
+    # index definition and the planner can use it.
+    return func.to_tsvector(
+        TS_CONFIG,
+        Campaign.name.op("||")(literal_column("' '")).op("||")(
+            func.coalesce(Campaign.description, literal_column("''"))
+        ),
+    )
+
+
+search_index = Index("ix_campaigns_search", search_vector(), postgresql_using="gin")
+search_index.ddl_if(dialect="postgresql")
+Campaign.__table__.append_constraint(search_index)
+
+for statement in SQLITE_CREATE:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in SQLITE_DROP:
+    event.listen(
+        Campaign.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite")
+    )
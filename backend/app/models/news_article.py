@@ -0,0 +1,31 @@
+"""NewsAPI articles kept locally by the background ingester.
+
+Articles are unique by URL; ``keyword`` is the normalised keyword the
+article was first ingested for (empty for top headlines). Keep in sync with
+migrations/versions/0008_news_articles.py.
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class StoredArticle(Base):
+    __tablename__ = "news_articles"
+    __table_args__ = (
+        Index("ix_news_articles_url", "url", unique=True),
+        # Newest-first pages overall and per keyword.
+        Index("ix_news_articles_published_at_id", "published_at", "id"),
+        Index("ix_news_articles_keyword_published_at_id", "keyword", "published_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    keyword: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    title: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    source: Mapped[str] = mapped_column(String(255), nullable=False, default="Unknown")
+    published_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -0,0 +1,51 @@
+"""Per-table change counters used to derive cheap ETags.
+
+Database triggers bump ``table_versions.version`` for ``campaigns`` inside
+the writing transaction, so readers see a new version exactly when they can
+see the new data. Keep in sync with migrations/versions/0004_table_versions.py.
+"""
+from sqlalchemy import DDL, BigInteger, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.campaign import Campaign
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+SEED = "INSERT INTO table_versions (table_name, version) VALUES ('campaigns', 0)"
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaigns_version_{event_name.lower()}
+        AFTER {event_name} ON campaigns BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = 'campaigns';
+    END"""
+    for event_name in ("INSERT", "UPDATE", "DELETE")
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION bump_campaigns_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = 'campaigns';
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaigns_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_campaigns_version()""",
+]
+
+event.listen(TableVersion.__table__, "after_create", DDL(SEED))
+for statement in SQLITE_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in POSTGRES_TRIGGERS:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
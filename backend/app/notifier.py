@@ -0,0 +1,57 @@
+"""In-process change notification for live dashboard streams.
+
+Writers call ``notify()`` after committing. It is thread-safe, so handlers
+running in the threadpool can call it. Async consumers ``await wait(seen)``
+until the version moves past the last one they handled. A consumer that
+was busy while several writes landed wakes once and sees only the latest
+version, so a burst of writes leads to one recompute.
+
+Only writes made by this process are signalled. Consumers that need to
+see other workers' writes poll the database change version as well.
+"""
+import asyncio
+import threading
+
+
+class ChangeNotifier:
+    def __init__(self) -> None:
+        self._version = 0
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def notify(self) -> None:
+        with self._lock:
+            self._version += 1
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop has closed; its wait() is gone with it.
+                pass
+
+    async def wait(self, seen: int, timeout: float | None = None) -> int:
+        """Return the current version once it differs from ``seen``.
+
+        Returns ``seen`` unchanged if ``timeout`` seconds pass first.
+        """
+        entry = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._version != seen:
+                return self._version
+            self._waiters.add(entry)
+        try:
+            await asyncio.wait_for(entry[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(entry)
+        return self._version
+
+
+campaign_changes = ChangeNotifier()
@@ -0,0 +1,68 @@
+"""Token bucket for pacing calls to a rate-limited upstream API.
+
+The bucket holds up to ``capacity`` tokens and refills at ``rate`` tokens
+per second. ``acquire()`` takes a token right away and may leave the
+balance negative. The caller then sleeps until the refill covers its
+share, so waiters are served in arrival order without a lock and the
+bucket works from any event loop.
+
+With ``max_wait``, a caller that would have to wait longer takes no token
+and is told so instead, which keeps the debt bounded. A caller cancelled
+while it waits gives its token back.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._timer = timer
+        self._tokens = float(capacity)
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token; return how many seconds to wait before using it.
+
+        Returns None, without taking a token, if the wait would be longer
+        than ``max_wait`` seconds.
+        """
+        with self._lock:
+            now = self._timer()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and delay > max_wait:
+                return None
+            self._tokens -= 1
+            return delay
+
+    def refund(self) -> None:
+        """Give back a token taken by ``reserve()`` that will not be used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Wait for a token; False if that would take over ``max_wait`` seconds."""
+        delay = self.reserve(max_wait)
+        if delay is None:
+            return False
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund()
+                raise
+        return True
@@ -1,55 +1,238 @@
-from typing import Optional
+from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.campaign import CampaignCreate, CampaignResponse, CampaignUpdate
-from app.services import campaign_service
+from app.database import DbSession, get_session, run_db
+from app.etag import conditional_get
+from app.filters import campaign_filters
+from app.schemas.campaign import (
+    BulkCreateResponse,
+    CampaignCreate,
+    CampaignFilters,
+    CampaignPatch,
+    CampaignResponse,
+    CampaignUpdate,
+)
+from app.schemas.news import CampaignNews
+from app.services import campaign_service, export_service, news_service
 
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BULK_BATCH_SIZE = 10_000
+# Campaigns per /news call; later ones are reached through the cursor.
+MAX_NEWS_CAMPAIGNS = 100
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    try:
+        return campaign_service.parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _sparse(row: Any, fields: list[str]) -> dict[str, Any]:
+    return {name: getattr(row, name) for name in fields}
+
 
 @router.post("", response_model=CampaignResponse, status_code=201)
-def create_campaign(
-    campaign_data: CampaignCreate, db: Session = Depends(get_db)
+async def create_campaign(
+    campaign_data: CampaignCreate, db: DbSession = Depends(get_session)
 ):
-    campaign = campaign_service.create_campaign(db, campaign_data)
+    campaign = await run_db(db, campaign_service.create_campaign, campaign_data)
     return campaign
 
 
-@router.get("", response_model=list[CampaignResponse])
-def list_campaigns(
-    status: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=201)
+async def bulk_create_campaigns(
+    # Items are validated one by one so a malformed item is reported by its
+    # index instead of rejecting the whole batch.
+    items: list[Any] = Body(...),
+    batch_size: Optional[int] = Query(None, ge=1, le=MAX_BULK_BATCH_SIZE),
+    db: DbSession = Depends(get_session),
+):
+    return await run_db(
+        db,
+        campaign_service.bulk_create_campaigns,
+        items,
+        batch_size or campaign_service.BULK_INSERT_BATCH_SIZE,
+    )
+
+
+@router.get(
+    "",
+    response_model=list[CampaignResponse],
+    dependencies=[Depends(conditional_get)],
+)
+async def list_campaigns(
+    response: Response,
+    filters: CampaignFilters = Depends(campaign_filters),
     sort_by: Optional[str] = Query(None),
     sort_order: Optional[str] = Query("asc"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, max_length=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: DbSession = Depends(get_session),
 ):
-    return campaign_service.get_campaigns(db, status, category, sort_by, sort_order)
+    q = q.strip() if q else None
+    selected = _parse_fields(fields)
+
+    next_cursor = None
+    if limit is None and cursor is None:
+        campaigns = await run_db(
+            db,
+            campaign_service.get_campaigns,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            q=q,
+            fields=selected,
+            filters=filters,
+        )
+    else:
+        try:
+            campaigns, next_cursor = await run_db(
+                db,
+                campaign_service.get_campaign_page,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                limit=limit or DEFAULT_PAGE_SIZE,
+                cursor=cursor,
+                q=q,
+                fields=selected,
+                filters=filters,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if selected:
+        # Rows carry only the requested columns; skip CampaignResponse
+        # validation, which would reject them as incomplete. A returned
+        # Response replaces the injected one, so its headers are copied over.
+        content = jsonable_encoder([_sparse(row, selected) for row in campaigns])
+        return JSONResponse(content, headers=response.headers)
+    return campaigns
+
 
+@router.get("/export")
+async def export_campaigns(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    filters: CampaignFilters = Depends(campaign_filters),
+    sort_by: Optional[str] = Query(None),
+    sort_order: Optional[str] = Query("asc"),
+    q: Optional[str] = Query(None, max_length=200),
+    db: DbSession = Depends(get_session),
+):
+    q = q.strip() if q else None
+    stmt = campaign_service.export_statement(
+        db.get_bind().dialect.name,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        q=q,
+        filters=filters,
+    )
+    if isinstance(db, AsyncSession):
+        body = export_service.astream_export(db, stmt, format)
+    else:
+        body = export_service.stream_export(db, stmt, format)
 
-@router.get("/{campaign_id}", response_model=CampaignResponse)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
-    campaign = campaign_service.get_campaign(db, campaign_id)
+    if format == "csv":
+        return StreamingResponse(
+            body,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="campaigns.csv"'},
+        )
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+
+@router.get("/news", response_model=CampaignNews)
+async def get_campaigns_news(
+    response: Response,
+    by: Literal["name", "category"] = Query("name", description="Campaign field to search news for"),
+    limit: int = Query(20, ge=1, le=MAX_NEWS_CAMPAIGNS),
+    cursor: Optional[str] = Query(None),
+    db: DbSession = Depends(get_session),
+):
+    """Related news for active campaigns, fetched concurrently in one call.
+
+    Campaigns are taken ``limit`` at a time in id order; pass the
+    ``X-Next-Cursor`` header back as ``cursor`` for the next ones.
+    """
+    try:
+        rows, next_cursor = await run_db(
+            db,
+            campaign_service.get_campaign_page,
+            limit=limit,
+            cursor=cursor,
+            fields=["id", "name", "category"],
+            filters=CampaignFilters(status="active"),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    campaigns = [
+        news_service.CampaignKeyword(row.id, row.name, getattr(row, by)) for row in rows
+    ]
+    return await news_service.get_campaign_news(campaigns)
+
+
+@router.get(
+    "/{campaign_id}",
+    response_model=CampaignResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_campaign(
+    campaign_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: DbSession = Depends(get_session),
+):
+    selected = _parse_fields(fields)
+    campaign = await run_db(db, campaign_service.get_campaign, campaign_id, fields=selected)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
+    if selected:
+        return JSONResponse(
+            jsonable_encoder(_sparse(campaign, selected)), headers=response.headers
+        )
     return campaign
 
 
 @router.put("/{campaign_id}", response_model=CampaignResponse)
-def update_campaign(
-    campaign_id: int, campaign_data: CampaignUpdate, db: Session = Depends(get_db)
+async def update_campaign(
+    campaign_id: int, campaign_data: CampaignUpdate, db: DbSession = Depends(get_session)
+):
+    campaign = await run_db(db, campaign_service.update_campaign, campaign_id, campaign_data)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
+
+
+@router.patch("/{campaign_id}", response_model=CampaignResponse)
+async def patch_campaign(
+    campaign_id: int, campaign_data: CampaignPatch, db: DbSession = Depends(get_session)
 ):
-    campaign = campaign_service.update_campaign(db, campaign_id, campaign_data)
+    try:
+        campaign = await run_db(
+            db, campaign_service.patch_campaign, campaign_id, campaign_data
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
 
 @router.delete("/{campaign_id}")
-def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
-    deleted = campaign_service.delete_campaign(db, campaign_id)
+async def delete_campaign(campaign_id: int, db: DbSession = Depends(get_session)):
+    deleted = await run_db(db, campaign_service.delete_campaign, campaign_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return {"message": "Campaign deleted"}
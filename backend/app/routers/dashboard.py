@@ -1,33 +1,256 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.cache import dashboard_cache
+from app.database import DbSession, get_session, run_db
+from app.etag import conditional_get
+from app.filters import campaign_filters
+from app.schemas.campaign import CampaignFilters
 from app.schemas.dashboard import (
+    CacheStats,
     CategoryBudget,
+    DashboardOverview,
     DashboardSummary,
+    Granularity,
+    PacingDimension,
+    PacingSeries,
+    PivotTable,
     StatusCount,
     TimeSeriesPoint,
 )
-from app.services import dashboard_service
+from app.services import (
+    dashboard_service,
+    dashboard_snapshot,
+    dashboard_stream,
+    pacing_service,
+)
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+_UNFILTERED = CampaignFilters()
+
+
+def _version(request: Request) -> Optional[int]:
+    """The change version ``conditional_get`` read, to key cached results on."""
+    return getattr(request.state, "change_version", None)
+
+
+def _snapshot(
+    request: Request, response: Response, filters: CampaignFilters
+) -> Optional[DashboardOverview]:
+    """The background overview snapshot, if it may answer this request.
+
+    Only a snapshot taken at the change version ``conditional_get`` just
+    read is used, so it never serves data older than its ETag. ``Age`` tells
+    the client how long ago it was computed.
+    """
+    store = dashboard_snapshot.dashboard_snapshots
+    snapshot = store.get()
+    if (
+        snapshot is None
+        or filters != _UNFILTERED
+        or snapshot.version != _version(request)
+        or not dashboard_snapshot.fresh_enough(
+            store, snapshot, request.headers.get("cache-control")
+        )
+    ):
+        return None
+    response.headers["Age"] = str(int(store.age(snapshot)))
+    return snapshot.overview
+
+
+@router.get(
+    "/overview",
+    response_model=DashboardOverview,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_overview(
+    request: Request,
+    response: Response,
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    if overview := _snapshot(request, response, filters):
+        return overview
+    return await run_db(
+        db, dashboard_service.get_overview, filters=filters, data_version=_version(request)
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=DashboardSummary,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_summary(
+    request: Request,
+    response: Response,
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    if overview := _snapshot(request, response, filters):
+        return overview.summary
+    return await run_db(
+        db, dashboard_service.get_summary, filters=filters, data_version=_version(request)
+    )
+
+
+@router.get(
+    "/status-distribution",
+    response_model=list[StatusCount],
+    dependencies=[Depends(conditional_get)],
+)
+async def get_status_distribution(
+    request: Request,
+    response: Response,
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    if overview := _snapshot(request, response, filters):
+        return overview.status_distribution
+    return await run_db(
+        db, dashboard_service.get_status_distribution, filters=filters, data_version=_version(request)
+    )
+
+
+@router.get(
+    "/budget-by-category",
+    response_model=list[CategoryBudget],
+    dependencies=[Depends(conditional_get)],
+)
+async def get_budget_by_category(
+    request: Request,
+    response: Response,
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    if overview := _snapshot(request, response, filters):
+        return overview.budget_by_category
+    return await run_db(
+        db, dashboard_service.get_budget_by_category, filters=filters, data_version=_version(request)
+    )
+
+
+@router.get(
+    "/campaigns-over-time",
+    response_model=list[TimeSeriesPoint],
+    dependencies=[Depends(conditional_get)],
+)
+async def get_campaigns_over_time(
+    request: Request,
+    granularity: Granularity = Query("day"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    fill: bool = Query(False, description="Include empty buckets with a zero count"),
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    try:
+        return await run_db(
+            db,
+            dashboard_service.get_campaigns_over_time,
+            data_version=_version(request),
+            granularity=granularity,
+            date_from=date_from,
+            date_to=date_to,
+            fill=fill,
+            filters=filters,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get(
+    "/pacing",
+    response_model=PacingSeries,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_pacing(
+    request: Request,
+    dimension: PacingDimension = Query("platform"),
+    granularity: Granularity = Query("day"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    try:
+        return await run_db(
+            db,
+            pacing_service.get_pacing,
+            data_version=_version(request),
+            dimension=dimension,
+            granularity=granularity,
+            date_from=date_from,
+            date_to=date_to,
+            filters=filters,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get(
+    "/pivot",
+    response_model=PivotTable,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_pivot(
+    request: Request,
+    dimensions: Optional[str] = Query(
+        None,
+        description="Comma-separated subset of status, category, platform, start_month",
+    ),
+    measures: Optional[str] = Query(
+        None, description="Comma-separated subset of count, sum, avg, min, max"
+    ),
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    try:
+        group_by = dashboard_service.parse_pivot_names(
+            dimensions, dashboard_service.PIVOT_DIMENSIONS
+        )
+        selected = dashboard_service.parse_pivot_names(
+            measures,
+            dashboard_service.PIVOT_MEASURES,
+            dashboard_service.DEFAULT_PIVOT_MEASURES,
+        )
+        return await run_db(
+            db,
+            dashboard_service.get_pivot,
+            data_version=_version(request),
+            dimensions=group_by,
+            measures=selected,
+            filters=filters,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-@router.get("/summary", response_model=DashboardSummary)
-def get_summary(db: Session = Depends(get_db)):
-    return dashboard_service.get_summary(db)
 
+@router.get("/stream")
+async def stream_overview(
+    filters: CampaignFilters = Depends(campaign_filters),
+    db: DbSession = Depends(get_session),
+):
+    """Server-Sent Events: an overview snapshot, then deltas after writes."""
 
-@router.get("/status-distribution", response_model=list[StatusCount])
-def get_status_distribution(db: Session = Depends(get_db)):
-    return dashboard_service.get_status_distribution(db)
+    async def load():
+        return await dashboard_stream.load_overview(db, filters)
 
+    async def version():
+        return await dashboard_stream.load_version(db)
 
-@router.get("/budget-by-category", response_model=list[CategoryBudget])
-def get_budget_by_category(db: Session = Depends(get_db)):
-    return dashboard_service.get_budget_by_category(db)
+    # Starlette cancels the generator when the client disconnects.
+    return StreamingResponse(
+        dashboard_stream.overview_events(load, version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.get("/campaigns-over-time", response_model=list[TimeSeriesPoint])
-def get_campaigns_over_time(db: Session = Depends(get_db)):
-    return dashboard_service.get_campaigns_over_time(db)
+@router.get("/cache-stats", response_model=CacheStats)
+async def get_cache_stats():
+    return dashboard_cache.stats()
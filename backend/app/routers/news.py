@@ -1,13 +1,36 @@
 from typing import Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from app.database import DbSession, get_session, run_db
 from app.schemas.news import NewsArticle
-from app.services.news_service import fetch_news
+from app.services import news_service, news_store
 
 router = APIRouter(prefix="/api", tags=["news"])
 
+MAX_PAGE_SIZE = 100
+
 
 @router.get("/news", response_model=list[NewsArticle])
-async def get_news(keyword: Optional[str] = Query(None)):
-    return await fetch_news(keyword)
+async def get_news(
+    response: Response,
+    keyword: Optional[str] = Query(None),
+    store: bool = Query(False, description="Serve from the local article store"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    db: DbSession = Depends(get_session),
+):
+    if store:
+        try:
+            articles, next_cursor = await run_db(
+                db, news_store.get_article_page, keyword, limit, cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return articles
+
+    cached = await news_service.get_news(keyword)
+    response.headers["Age"] = str(int(news_service.news_cache.age(cached)))
+    return cached.articles
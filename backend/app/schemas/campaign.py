@@ -1,22 +1,26 @@
 from datetime import date, datetime
-from typing import Literal
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+CampaignStatus = Literal["draft", "active", "paused", "completed"]
+CampaignPlatform = Literal[
+    "facebook", "instagram", "twitter", "google", "linkedin", "email", "other"
+]
+CampaignCategory = Literal[
+    "brand_awareness", "lead_generation", "sales", "engagement", "retention", "other"
+]
+
 
 class CampaignBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: str = Field(default="", max_length=2000)
-    status: Literal["draft", "active", "paused", "completed"] = "draft"
+    status: CampaignStatus = "draft"
     budget: float = Field(default=0.0, ge=0)
     start_date: date
     end_date: date
-    platform: Literal[
-        "facebook", "instagram", "twitter", "google", "linkedin", "email", "other"
-    ] = "other"
-    category: Literal[
-        "brand_awareness", "lead_generation", "sales", "engagement", "retention", "other"
-    ] = "other"
+    platform: CampaignPlatform = "other"
+    category: CampaignCategory = "other"
 
     @model_validator(mode="after")
     def validate_dates(self):
@@ -33,9 +37,63 @@ class CampaignUpdate(CampaignBase):
     pass
 
 
+class CampaignPatch(BaseModel):
+    """Partial update: only the fields present in the payload are written."""
+
+    name: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    description: Optional[str] = Field(default=None, max_length=2000)
+    status: Optional[CampaignStatus] = None
+    budget: Optional[float] = Field(default=None, ge=0)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    platform: Optional[CampaignPlatform] = None
+    category: Optional[CampaignCategory] = None
+
+    @model_validator(mode="after")
+    def validate_fields(self):
+        for field in self.model_fields_set:
+            if getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date must be on or after start_date")
+        return self
+
+
+class CampaignFilters(BaseModel):
+    """Filters shared by the campaign list, export and dashboard endpoints.
+
+    ``active_from``/``active_to`` select campaigns whose start..end span
+    overlaps that window; either bound may be left open.
+    """
+
+    status: Optional[str] = None
+    category: Optional[str] = None
+    platform: Optional[str] = None
+    active_from: Optional[date] = None
+    active_to: Optional[date] = None
+
+    model_config = ConfigDict(frozen=True)
+
+    @model_validator(mode="after")
+    def validate_window(self):
+        if self.active_from and self.active_to and self.active_to < self.active_from:
+            raise ValueError("active_to must be on or after active_from")
+        return self
+
+
 class CampaignResponse(CampaignBase):
     id: int
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    created_ids: list[int]
+    errors: list[BulkItemError]
@@ -1,5 +1,11 @@
+from datetime import date
+from typing import Literal, Optional, Union
+
 from pydantic import BaseModel
 
+Granularity = Literal["day", "week", "month"]
+PacingDimension = Literal["platform", "category"]
+
 
 class DashboardSummary(BaseModel):
     total_campaigns: int
@@ -21,3 +27,59 @@ class CategoryBudget(BaseModel):
 class TimeSeriesPoint(BaseModel):
     date: str
     count: int
+
+
+class DashboardOverview(BaseModel):
+    summary: DashboardSummary
+    status_distribution: list[StatusCount]
+    budget_by_category: list[CategoryBudget]
+    campaigns_over_time: list[TimeSeriesPoint]
+
+
+class RollupMismatch(BaseModel):
+    status: str
+    category: str
+    created_date: date
+    expected_count: int
+    actual_count: int
+    expected_budget: float
+    actual_budget: float
+
+
+class PacingMismatch(BaseModel):
+    status: str
+    category: str
+    platform: str
+    day: date
+    expected_count: int
+    actual_count: int
+    expected_rate_change: float
+    actual_rate_change: float
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    ttl: float
+
+
+class PacingSeries(BaseModel):
+    """Planned spend per bucket, as parallel arrays aligned with ``dates``."""
+
+    dimension: PacingDimension
+    granularity: Granularity
+    dates: list[str]
+    series: dict[str, list[float]]
+    total: list[float]
+
+
+class PivotTable(BaseModel):
+    """Grouped measures as parallel arrays, one per dimension and measure."""
+
+    dimensions: list[str]
+    measures: list[str]
+    row_count: int
+    columns: dict[str, list[Optional[Union[str, int, float]]]]
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import BaseModel
 
 
@@ -7,3 +9,19 @@ class NewsArticle(BaseModel):
     source: str
     url: str
     published_at: str
+
+
+class CampaignNewsResult(BaseModel):
+    campaign_id: int
+    name: str
+    keyword: str
+    status: Literal["ok", "error", "timeout"]
+    error: Optional[str] = None
+    article_urls: list[str] = []
+
+
+class CampaignNews(BaseModel):
+    """Merged articles for a set of campaigns, with the outcome for each."""
+
+    articles: list[NewsArticle]
+    campaigns: list[CampaignNewsResult]
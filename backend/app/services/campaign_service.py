@@ -1,66 +1,439 @@
-from typing import Optional
+import base64
+import json
+import os
+import re
+from datetime import date
+from typing import Any, Optional, Sequence, TypeVar
 
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import (
+    asc,
+    column,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, with_expression
+from sqlalchemy.sql import ColumnElement, Select
 
+from app.cache import dashboard_cache
+from app.notifier import campaign_changes
 from app.models.campaign import Campaign
-from app.schemas.campaign import CampaignCreate, CampaignUpdate
+from app.models.campaign_search import FTS_TABLE, TS_CONFIG, search_vector
+from app.models.table_version import TableVersion
+from app.schemas.campaign import (
+    BulkCreateResponse,
+    BulkItemError,
+    CampaignCreate,
+    CampaignFilters,
+    CampaignPatch,
+    CampaignResponse,
+    CampaignUpdate,
+)
+
+CAMPAIGN_FIELDS = tuple(CampaignResponse.model_fields)
+SORTABLE_FIELDS = ("budget", "start_date")
+RELEVANCE = "relevance"
+EXPORT_BATCH_SIZE = 1000
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+
+# Filters are shared between ORM queries and Core selects.
+Q = TypeVar("Q", Query, Select)
+
+
+def _changed() -> None:
+    """Called after a campaign write commits: drop cached aggregates and
+    wake live dashboard streams."""
+    dashboard_cache.clear()
+    campaign_changes.notify()
+
+
+def get_change_version(db: Session) -> int:
+    """Counter bumped by database triggers on every write to ``campaigns``."""
+    stmt = select(TableVersion.version).where(TableVersion.table_name == "campaigns")
+    return db.scalar(stmt) or 0
 
 
 def create_campaign(db: Session, campaign_data: CampaignCreate) -> Campaign:
     campaign = Campaign(**campaign_data.model_dump())
     db.add(campaign)
     db.commit()
+    _changed()
     db.refresh(campaign)
     return campaign
 
 
+def bulk_create_campaigns(
+    db: Session,
+    items: list[Any],
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> BulkCreateResponse:
+    """Validate ``items`` individually and insert the valid ones in one transaction.
+
+    Invalid items are reported by their index in ``items`` and skipped.
+    Valid rows are sent as multi-row INSERTs of at most ``batch_size`` rows,
+    with ``RETURNING id`` when the backend supports it.
+    """
+    valid: list[CampaignCreate] = []
+    errors: list[BulkItemError] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(CampaignCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    errors=exc.errors(include_url=False, include_context=False),
+                )
+            )
+
+    created_ids: list[int] = []
+    returning = db.get_bind().dialect.insert_executemany_returning
+    for start in range(0, len(valid), batch_size):
+        rows = [campaign.model_dump() for campaign in valid[start : start + batch_size]]
+        if returning:
+            stmt = insert(Campaign).returning(Campaign.id, sort_by_parameter_order=True)
+            created_ids.extend(db.scalars(stmt, rows))
+        else:
+            db.execute(insert(Campaign), rows)
+    db.commit()
+    if valid:
+        _changed()
+
+    return BulkCreateResponse(created_ids=created_ids, errors=errors)
+
+
+def encode_cursor(campaign: Campaign | Row, sort_by: Optional[str] = None) -> str:
+    """Build an opaque cursor pointing just past ``campaign`` in the given ordering."""
+    key: list[Any] = [campaign.id]
+    if sort_by == RELEVANCE:
+        key.insert(0, campaign.search_rank)
+    elif sort_by in SORTABLE_FIELDS:
+        value = getattr(campaign, sort_by)
+        key.insert(0, value.isoformat() if isinstance(value, date) else value)
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: Optional[str] = None) -> tuple:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ValueError if the cursor is malformed or was issued for a
+    different ``sort_by``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    expected_len = 2 if sort_by in (*SORTABLE_FIELDS, RELEVANCE) else 1
+    if not isinstance(key, list) or len(key) != expected_len:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key[-1], int) or isinstance(key[-1], bool):
+        raise ValueError("Invalid cursor")
+
+    if sort_by == "start_date":
+        try:
+            key[0] = date.fromisoformat(key[0])
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+    elif sort_by in ("budget", RELEVANCE):
+        if not isinstance(key[0], (int, float)) or isinstance(key[0], bool):
+            raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[list[str]]:
+    """Parse a comma-separated sparse fieldset such as ``"name,status"``.
+
+    ``id`` is always included. Returns None when no fieldset was requested
+    and raises ValueError for names that are not campaign fields.
+    """
+    if not raw:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(CAMPAIGN_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def _select(db: Session, fields: Optional[Sequence[str]], extra: Sequence[str] = ()) -> Query:
+    """Query whole campaigns, or only the ``fields`` (plus ``extra``) columns."""
+    if not fields:
+        return db.query(Campaign)
+    names = dict.fromkeys([*fields, *extra])
+    return db.query(*(getattr(Campaign, name) for name in names))
+
+
+def filter_conditions(filters: Optional[CampaignFilters], model: Any = Campaign) -> list:
+    """SQL conditions for ``filters``, for use in any query's WHERE clause.
+
+    ``model`` may be anything with the filtered columns as attributes, such
+    as the dashboard rollup table for status/category-only filters.
+    """
+    if filters is None:
+        return []
+    conditions = []
+    if filters.status:
+        conditions.append(model.status == filters.status)
+    if filters.category:
+        conditions.append(model.category == filters.category)
+    if filters.platform:
+        conditions.append(model.platform == filters.platform)
+    if filters.active_from:
+        conditions.append(model.end_date >= filters.active_from)
+    if filters.active_to:
+        conditions.append(model.start_date <= filters.active_to)
+    return conditions
+
+
+def _apply_filters(query: Q, filters: Optional[CampaignFilters]) -> Q:
+    conditions = filter_conditions(filters)
+    if not conditions:
+        return query
+    return query.filter(*conditions)
+
+
+def _fts5_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def _apply_search(query: Q, q: str, dialect: str) -> tuple[Q, ColumnElement]:
+    """Restrict ``query`` to campaigns matching ``q``.
+
+    Returns the filtered query and a rank expression for which lower values
+    are better matches.
+    """
+    if dialect == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"), column("rank"))
+        match = _fts5_query(q)
+        query = query.join(fts, fts.c.rowid == Campaign.id)
+        if match is None:
+            return query.filter(false()), fts.c.rank
+        return query.filter(literal_column(FTS_TABLE).op("MATCH")(match)), fts.c.rank
+
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+    vector = search_vector()
+    return query.filter(vector.op("@@")(tsquery)), -func.ts_rank(vector, tsquery)
+
+
+def _resolve_sort(sort_by: Optional[str], q: Optional[str]) -> Optional[str]:
+    if sort_by in SORTABLE_FIELDS:
+        return sort_by
+    if q and sort_by in (None, RELEVANCE):
+        return RELEVANCE
+    return None
+
+
 def get_campaigns(
     db: Session,
-    status: Optional[str] = None,
-    category: Optional[str] = None,
     sort_by: Optional[str] = None,
     sort_order: Optional[str] = "asc",
-) -> list[Campaign]:
-    query = db.query(Campaign)
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    filters: Optional[CampaignFilters] = None,
+) -> list[Campaign] | list[Row]:
+    """List campaigns, optionally filtered, sorted and paginated.
+
+    When ``q`` is given, results are restricted to full-text matches on name
+    and description and, unless another ``sort_by`` is requested, ordered
+    best match first. Each result's ``search_rank`` is then populated.
+
+    With ``fields``, only those columns (plus whatever the sort key needs)
+    are selected and plain rows are returned instead of ORM objects.
+    ``filters`` restricts the list as described on ``CampaignFilters``.
+    """
+    sort_by = _resolve_sort(sort_by, q)
+    sort_fields = [sort_by] if sort_by in SORTABLE_FIELDS else []
+    query = _apply_filters(_select(db, fields, sort_fields), filters)
+
+    sort_column = None
+    if q:
+        query, rank = _apply_search(query, q, db.get_bind().dialect.name)
+        if fields:
+            query = query.add_columns(rank.label("search_rank"))
+        else:
+            query = query.options(with_expression(Campaign.search_rank, rank))
+        if sort_by == RELEVANCE:
+            sort_column = rank
+    if sort_by in SORTABLE_FIELDS:
+        sort_column = getattr(Campaign, sort_by)
 
-    if status:
-        query = query.filter(Campaign.status == status)
-    if category:
-        query = query.filter(Campaign.category == category)
+    order_func = desc if sort_order == "desc" else asc
+    paginated = limit is not None or cursor is not None
 
-    if sort_by in ("budget", "start_date"):
-        column = getattr(Campaign, sort_by)
-        order_func = desc if sort_order == "desc" else asc
-        query = query.order_by(order_func(column))
+    if sort_column is not None:
+        if paginated:
+            # Keyset pagination needs a total order, so ``id`` breaks ties.
+            key_columns = (sort_column, Campaign.id)
+            query = query.order_by(order_func(sort_column), order_func(Campaign.id))
+        else:
+            query = query.order_by(order_func(sort_column))
+    elif paginated:
+        key_columns = (Campaign.id,)
+        query = query.order_by(order_func(Campaign.id))
+
+    if cursor is not None:
+        key = decode_cursor(cursor, sort_by)
+        if sort_order == "desc":
+            query = query.filter(tuple_(*key_columns) < tuple_(*key))
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple_(*key))
+
+    if limit is not None:
+        query = query.limit(limit)
 
     return query.all()
 
 
-def get_campaign(db: Session, campaign_id: int) -> Optional[Campaign]:
-    return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+def get_campaign_page(
+    db: Session,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    filters: Optional[CampaignFilters] = None,
+) -> tuple[list[Campaign] | list[Row], Optional[str]]:
+    """Return one page of campaigns and the cursor for the next page.
+
+    The next cursor is ``None`` once the last page has been reached.
+    """
+    campaigns = get_campaigns(
+        db,
+        sort_by,
+        sort_order,
+        limit=limit + 1,
+        cursor=cursor,
+        q=q,
+        fields=fields,
+        filters=filters,
+    )
+    if len(campaigns) <= limit:
+        return campaigns, None
+    campaigns = campaigns[:limit]
+    return campaigns, encode_cursor(campaigns[-1], _resolve_sort(sort_by, q))
+
+
+def export_statement(
+    dialect: str,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc",
+    q: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    filters: Optional[CampaignFilters] = None,
+) -> Select:
+    """Build the SELECT used for bulk export.
+
+    It selects plain columns rather than ORM objects so nothing is kept in
+    the session's identity map, and ``yield_per`` makes Postgres use a
+    server-side cursor, so memory stays flat regardless of table size.
+    """
+    stmt = _apply_filters(select(*Campaign.__table__.columns), filters)
+    if q:
+        stmt, _ = _apply_search(stmt, q, dialect)
+
+    order_func = desc if sort_order == "desc" else asc
+    if sort_by in SORTABLE_FIELDS:
+        stmt = stmt.order_by(order_func(getattr(Campaign, sort_by)))
+    stmt = stmt.order_by(order_func(Campaign.id))
+
+    return stmt.execution_options(yield_per=batch_size)
+
+
+def get_campaign(
+    db: Session, campaign_id: int, fields: Optional[Sequence[str]] = None
+) -> Optional[Campaign | Row]:
+    return _select(db, fields).filter(Campaign.id == campaign_id).first()
 
 
 def update_campaign(
     db: Session, campaign_id: int, campaign_data: CampaignUpdate
 ) -> Optional[Campaign]:
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
+    stmt = (
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(**campaign_data.model_dump())
+        .returning(Campaign)
+        .execution_options(populate_existing=True)
+    )
+    campaign = db.scalars(stmt).one_or_none()
+    if campaign is None:
+        db.rollback()
         return None
 
-    for field, value in campaign_data.model_dump().items():
-        setattr(campaign, field, value)
+    # Detach so the commit doesn't expire the RETURNING values and force a
+    # refresh SELECT when the caller reads them.
+    db.expunge(campaign)
+    db.commit()
+    _changed()
+    return campaign
 
+
+def patch_campaign(
+    db: Session, campaign_id: int, campaign_data: CampaignPatch
+) -> Optional[Campaign]:
+    """Write only the fields set on ``campaign_data``.
+
+    When just one of the dates changes, the stored value of the other one is
+    checked inside the UPDATE's WHERE clause so the happy path stays a single
+    statement. Raises ValueError if the change would put end_date before
+    start_date.
+    """
+    changes = campaign_data.model_dump(exclude_unset=True)
+    if not changes:
+        return get_campaign(db, campaign_id)
+
+    stmt = update(Campaign).where(Campaign.id == campaign_id)
+    date_guarded = True
+    if "start_date" in changes and "end_date" not in changes:
+        stmt = stmt.where(Campaign.end_date >= changes["start_date"])
+    elif "end_date" in changes and "start_date" not in changes:
+        stmt = stmt.where(Campaign.start_date <= changes["end_date"])
+    else:
+        date_guarded = False
+
+    stmt = stmt.values(**changes).returning(Campaign).execution_options(populate_existing=True)
+    campaign = db.scalars(stmt).one_or_none()
+    if campaign is None:
+        db.rollback()
+        if date_guarded and get_campaign(db, campaign_id) is not None:
+            raise ValueError("end_date must be on or after start_date")
+        return None
+
+    db.expunge(campaign)
     db.commit()
-    db.refresh(campaign)
+    _changed()
     return campaign
 
 
 def delete_campaign(db: Session, campaign_id: int) -> bool:
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
+    stmt = delete(Campaign).where(Campaign.id == campaign_id).returning(Campaign.id)
+    deleted_id = db.scalars(stmt).one_or_none()
+    if deleted_id is None:
+        db.rollback()
         return False
 
-    db.delete(campaign)
     db.commit()
+    _changed()
     return True
@@ -1,25 +1,122 @@
-from sqlalchemy import func
+"""Dashboard aggregates, filterable with the campaign list's ``CampaignFilters``.
+
+Unfiltered, or filtered by status/category only, the summary, distribution,
+time-series and overview queries read the trigger-maintained
+``campaign_rollups``, so their cost grows with the number of (status,
+category, created date) groups rather than with the number of campaigns.
+Platform and date-window filters are not in the rollups; those requests
+aggregate ``campaigns`` directly with the filters pushed into the WHERE
+clause. See ``rollup_service`` for rebuilding and checking the rollups.
+Results are kept in ``dashboard_cache``, which campaign writes clear.
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Any, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Date, Select, cast, func, literal_column, select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
 
+from app.cache import dashboard_cache
 from app.models.campaign import Campaign
+from app.models.campaign_rollup import CampaignRollup
+from app.schemas.campaign import CampaignFilters
 from app.schemas.dashboard import (
     CategoryBudget,
+    DashboardOverview,
     DashboardSummary,
+    Granularity,
+    PivotTable,
     StatusCount,
     TimeSeriesPoint,
 )
+from app.services.campaign_service import filter_conditions
+
+# Upper bound on zero-filled time-series points (about 27 years of days).
+MAX_FILLED_POINTS = 10_000
+
+
+class _Source(NamedTuple):
+    """The grouping columns and measures an aggregate is computed from."""
+
+    status: ColumnElement
+    category: ColumnElement
+    created_date: ColumnElement
+    # Indexed column to range-filter creation time on.
+    created_at: ColumnElement
+    count: ColumnElement
+    active: ColumnElement
+    budget: ColumnElement
+    conditions: list
+
+    def select(self, *columns: Any) -> Select:
+        return select(*columns).where(*self.conditions)
+
+
+def _rollups_cover(filters: Optional[CampaignFilters]) -> bool:
+    return filters is None or not (
+        filters.platform or filters.active_from or filters.active_to
+    )
+
+
+def _source(db: Session, filters: Optional[CampaignFilters]) -> _Source:
+    if _rollups_cover(filters):
+        count = CampaignRollup.campaign_count
+        return _Source(
+            status=CampaignRollup.status,
+            category=CampaignRollup.category,
+            created_date=CampaignRollup.created_date,
+            created_at=CampaignRollup.created_date,
+            count=func.coalesce(func.sum(count), 0),
+            active=func.coalesce(
+                func.sum(count).filter(CampaignRollup.status == "active"), 0
+            ),
+            budget=func.coalesce(func.sum(CampaignRollup.total_budget), 0.0),
+            conditions=filter_conditions(filters, CampaignRollup),
+        )
+    if db.get_bind().dialect.name == "postgresql":
+        created_date = cast(Campaign.created_at, Date)
+    else:
+        created_date = func.date(Campaign.created_at, type_=Date)
+    return _Source(
+        status=Campaign.status,
+        category=Campaign.category,
+        created_date=created_date,
+        created_at=Campaign.created_at,
+        count=func.count(Campaign.id),
+        active=func.count(Campaign.id).filter(Campaign.status == "active"),
+        budget=func.coalesce(func.sum(Campaign.budget), 0.0),
+        conditions=filter_conditions(filters),
+    )
+
+
+def _money(value) -> float:
+    # Rollup budgets accumulate float additions and subtractions, so report
+    # sums at cent precision.
+    return round(float(value), 2)
 
 
-def get_summary(db: Session) -> DashboardSummary:
-    result = db.query(
-        func.count(Campaign.id).label("total_campaigns"),
-        func.coalesce(func.sum(Campaign.budget), 0.0).label("total_budget"),
-        func.count(Campaign.id).filter(Campaign.status == "active").label("active_campaigns"),
-    ).first()
+@dashboard_cache.cached
+def get_summary(
+    db: Session, filters: Optional[CampaignFilters] = None
+) -> DashboardSummary:
+    source = _source(db, filters)
+    result = db.execute(
+        source.select(
+            source.count.label("total_campaigns"),
+            source.budget.label("total_budget"),
+            source.active.label("active_campaigns"),
+        )
+    ).one()
+
+    return _summary(
+        result.total_campaigns, _money(result.total_budget), result.active_campaigns
+    )
+
 
-    total_campaigns = result.total_campaigns
-    total_budget = float(result.total_budget)
-    active_campaigns = result.active_campaigns
+def _summary(
+    total_campaigns: int, total_budget: float, active_campaigns: int
+) -> DashboardSummary:
     average_budget = total_budget / total_campaigns if total_campaigns > 0 else 0.0
 
     return DashboardSummary(
@@ -30,38 +127,308 @@ def get_summary(db: Session) -> DashboardSummary:
     )
 
 
-def get_status_distribution(db: Session) -> list[StatusCount]:
-    results = (
-        db.query(Campaign.status, func.count(Campaign.id).label("count"))
-        .group_by(Campaign.status)
-        .all()
+@dashboard_cache.cached
+def get_status_distribution(
+    db: Session, filters: Optional[CampaignFilters] = None
+) -> list[StatusCount]:
+    source = _source(db, filters)
+    results = db.execute(
+        source.select(source.status.label("status"), source.count.label("count"))
+        .group_by(source.status)
+        .order_by(source.status)
     )
     return [StatusCount(status=row.status, count=row.count) for row in results]
 
 
-def get_budget_by_category(db: Session) -> list[CategoryBudget]:
-    results = (
-        db.query(
-            Campaign.category,
-            func.coalesce(func.sum(Campaign.budget), 0.0).label("total_budget"),
+@dashboard_cache.cached
+def get_budget_by_category(
+    db: Session, filters: Optional[CampaignFilters] = None
+) -> list[CategoryBudget]:
+    source = _source(db, filters)
+    results = db.execute(
+        source.select(
+            source.category.label("category"), source.budget.label("total_budget")
         )
-        .group_by(Campaign.category)
-        .all()
+        .group_by(source.category)
+        .order_by(source.category)
     )
     return [
-        CategoryBudget(category=row.category, total_budget=float(row.total_budget))
+        CategoryBudget(category=row.category, total_budget=_money(row.total_budget))
         for row in results
     ]
 
 
-def get_campaigns_over_time(db: Session) -> list[TimeSeriesPoint]:
-    date_col = func.date(Campaign.created_at)
-    results = (
-        db.query(date_col.label("date"), func.count(Campaign.id).label("count"))
-        .group_by(date_col)
-        .order_by(date_col)
-        .all()
+def _bucket_expr(day: ColumnElement, granularity: Granularity, dialect: str) -> ColumnElement:
+    """SQL for the first day of the bucket containing the date ``day``."""
+    if granularity == "day":
+        return day
+    if dialect == "postgresql":
+        # A literal unit keeps the SELECT and GROUP BY expressions identical.
+        unit = literal_column(f"'{granularity}'")
+        return cast(func.date_trunc(unit, day), Date)
+    if granularity == "week":
+        # Next Sunday (or today if Sunday), then back to that week's Monday.
+        return func.date(day, "weekday 0", "-6 days", type_=Date)
+    return func.date(day, "start of month", type_=Date)
+
+
+def _bucket_start(day: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, granularity: Granularity) -> date:
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(weeks=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+@dashboard_cache.cached
+def get_campaigns_over_time(
+    db: Session,
+    granularity: Granularity = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fill: bool = False,
+    filters: Optional[CampaignFilters] = None,
+) -> list[TimeSeriesPoint]:
+    """Campaigns created per day, ISO week (Monday) or calendar month.
+
+    ``date_from``/``date_to`` bound the creation date inclusively. With
+    ``fill``, buckets without campaigns are returned with a zero count,
+    spanning the bounds when given and the data otherwise.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise ValueError("from must be on or before to")
+
+    source = _source(db, filters)
+    dialect = db.get_bind().dialect.name
+    bucket = _bucket_expr(source.created_date, granularity, dialect).label("bucket")
+    stmt = (
+        source.select(bucket, source.count.label("count"))
+        .group_by(bucket)
+        .order_by(bucket)
     )
+    # Half-open bounds work for both the rollup date and the raw timestamp,
+    # and keep the range sargable on either index.
+    if date_from:
+        stmt = stmt.where(source.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(source.created_at < date_to + timedelta(days=1))
+    counts = {row.bucket: row.count for row in db.execute(stmt)}
+
+    if fill and (counts or (date_from and date_to)):
+        start = _bucket_start(date_from or min(counts), granularity)
+        end = _bucket_start(date_to or max(counts), granularity)
+        filled = {}
+        while start <= end:
+            if len(filled) == MAX_FILLED_POINTS:
+                raise ValueError(
+                    f"range spans more than {MAX_FILLED_POINTS} {granularity} buckets"
+                )
+            filled[start] = counts.get(start, 0)
+            start = _next_bucket(start, granularity)
+        counts = filled
+
     return [
-        TimeSeriesPoint(date=str(row.date), count=row.count) for row in results
+        TimeSeriesPoint(date=str(bucket), count=count)
+        for bucket, count in counts.items()
     ]
+
+
+# grouping() bitmask per grouping set, with status as the high bit:
+# a 1 bit means that column is rolled up in the row.
+_GROUP_TOTAL = 0b111
+_GROUP_STATUS = 0b011
+_GROUP_CATEGORY = 0b101
+_GROUP_DATE = 0b110
+
+
+def _overview_grouping_sets(source: _Source) -> Select:
+    """Postgres: GROUPING SETS yields each aggregate as its own rows."""
+    status, category, day = source.status, source.category, source.created_date
+    return source.select(
+        func.grouping(status, category, day).label("grp"),
+        status.label("status"),
+        category.label("category"),
+        day.label("created_date"),
+        source.count.label("count"),
+        source.budget.label("budget"),
+    ).group_by(
+        func.grouping_sets(tuple_(), tuple_(status), tuple_(category), tuple_(day))
+    )
+
+
+def _fold_grouping_sets(rows) -> DashboardOverview:
+    total = (0, 0.0)
+    statuses: dict[str, int] = {}
+    categories: dict[str, float] = {}
+    days: dict[str, int] = {}
+    for row in rows:
+        if row.grp == _GROUP_TOTAL:
+            total = (row.count, float(row.budget))
+        elif row.grp == _GROUP_STATUS:
+            statuses[row.status] = row.count
+        elif row.grp == _GROUP_CATEGORY:
+            categories[row.category] = float(row.budget)
+        elif row.grp == _GROUP_DATE:
+            days[str(row.created_date)] = row.count
+    return _overview(total, statuses, categories, days)
+
+
+def _overview_grouped_scan(source: _Source) -> Select:
+    """Elsewhere: one GROUP BY over all three dimensions, folded in Python.
+
+    On the rollups this groups by the primary key, so it reads each rollup
+    row once.
+    """
+    status, category, day = source.status, source.category, source.created_date
+    return source.select(
+        status.label("status"),
+        category.label("category"),
+        day.label("created_date"),
+        source.count.label("count"),
+        source.budget.label("budget"),
+    ).group_by(status, category, day)
+
+
+def _fold_grouped_scan(rows) -> DashboardOverview:
+    total_count, total_budget = 0, 0.0
+    statuses: Counter[str] = Counter()
+    categories: defaultdict[str, float] = defaultdict(float)
+    days: Counter[str] = Counter()
+    for row in rows:
+        budget = float(row.budget)
+        total_count += row.count
+        total_budget += budget
+        statuses[row.status] += row.count
+        categories[row.category] += budget
+        days[str(row.created_date)] += row.count
+    return _overview((total_count, total_budget), statuses, categories, days)
+
+
+def _overview(
+    total: tuple[int, float],
+    statuses: dict[str, int],
+    categories: dict[str, float],
+    days: dict[str, int],
+) -> DashboardOverview:
+    return DashboardOverview(
+        summary=_summary(total[0], _money(total[1]), statuses.get("active", 0)),
+        status_distribution=[
+            StatusCount(status=status, count=count)
+            for status, count in sorted(statuses.items())
+        ],
+        budget_by_category=[
+            CategoryBudget(category=category, total_budget=_money(budget))
+            for category, budget in sorted(categories.items())
+        ],
+        campaigns_over_time=[
+            TimeSeriesPoint(date=day, count=count)
+            for day, count in sorted(days.items())
+        ],
+    )
+
+
+@dashboard_cache.cached
+def get_overview(
+    db: Session, filters: Optional[CampaignFilters] = None
+) -> DashboardOverview:
+    """All four dashboard aggregates from a single query, so they agree."""
+    source = _source(db, filters)
+    if db.get_bind().dialect.name == "postgresql":
+        return _fold_grouping_sets(db.execute(_overview_grouping_sets(source)))
+    return _fold_grouped_scan(db.execute(_overview_grouped_scan(source)))
+
+
+PIVOT_DIMENSIONS = ("status", "category", "platform", "start_month")
+PIVOT_MEASURES = ("count", "sum", "avg", "min", "max")
+DEFAULT_PIVOT_MEASURES = ("count", "sum")
+
+
+def parse_pivot_names(
+    raw: Optional[str], allowed: Sequence[str], default: tuple[str, ...] = ()
+) -> tuple[str, ...]:
+    """Parse a comma-separated list such as ``"status,platform"``.
+
+    Order is kept and duplicates dropped; ``default`` is returned when no
+    names are given (e.g. ``","``). Raises ValueError for names not in
+    ``allowed``.
+    """
+    requested = [name.strip() for name in (raw or "").split(",") if name.strip()]
+    if not requested:
+        return default
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown names: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(requested))
+
+
+def _pivot_dimension(name: str, dialect: str) -> ColumnElement:
+    if name == "start_month":
+        # Literal formats keep the SELECT and GROUP BY expressions identical.
+        if dialect == "postgresql":
+            return func.to_char(Campaign.start_date, literal_column("'YYYY-MM'"))
+        return func.strftime(literal_column("'%Y-%m'"), Campaign.start_date)
+    return getattr(Campaign, name)
+
+
+_PIVOT_MEASURES = {
+    "count": func.count(Campaign.id),
+    "sum": func.coalesce(func.sum(Campaign.budget), 0.0),
+    "avg": func.avg(Campaign.budget),
+    "min": func.min(Campaign.budget),
+    "max": func.max(Campaign.budget),
+}
+
+
+@dashboard_cache.cached
+def get_pivot(
+    db: Session,
+    dimensions: tuple[str, ...] = (),
+    measures: tuple[str, ...] = DEFAULT_PIVOT_MEASURES,
+    filters: Optional[CampaignFilters] = None,
+) -> PivotTable:
+    """Budget measures grouped by any subset of ``PIVOT_DIMENSIONS``.
+
+    Runs as a single GROUP BY over ``campaigns`` and returns one array per
+    dimension and measure, with rows ordered by the dimensions. With no
+    dimensions the result is a single grand-total row.
+    """
+    if not measures:
+        raise ValueError("At least one measure is required")
+    dialect = db.get_bind().dialect.name
+    keys = [_pivot_dimension(name, dialect).label(name) for name in dimensions]
+    values = [_PIVOT_MEASURES[name].label(name) for name in measures]
+    stmt = (
+        select(*keys, *values)
+        .where(*filter_conditions(filters))
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+    columns: dict[str, list] = {name: [] for name in (*dimensions, *measures)}
+    row_count = 0
+    for row in db.execute(stmt):
+        row_count += 1
+        for name in dimensions:
+            columns[name].append(getattr(row, name))
+        for name in measures:
+            value = getattr(row, name)
+            if name != "count" and value is not None:
+                value = _money(value)
+            columns[name].append(value)
+
+    return PivotTable(
+        dimensions=list(dimensions),
+        measures=list(measures),
+        row_count=row_count,
+        columns=columns,
+    )
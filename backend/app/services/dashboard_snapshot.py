@@ -0,0 +1,114 @@
+"""Background-precomputed snapshot of the unfiltered dashboard overview.
+
+A task started by the app lifespan recomputes the overview every
+``DASHBOARD_SNAPSHOT_INTERVAL`` seconds, and shortly after campaign writes.
+It publishes each result by swapping one reference, so request handlers
+see either the previous snapshot or the new one, never a partial one.
+Handlers use a snapshot only while its change version is still current.
+They report the snapshot's age in the ``Age`` header. Clients that need
+fresher data send ``Cache-Control: no-cache`` or ``max-age=<seconds>``.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.notifier import ChangeNotifier, campaign_changes
+from app.schemas.campaign import CampaignFilters
+from app.schemas.dashboard import DashboardOverview
+from app.services import campaign_service, dashboard_service
+
+logger = logging.getLogger(__name__)
+
+# Seconds between refreshes when nothing is written; 0 disables the task.
+DASHBOARD_SNAPSHOT_INTERVAL = float(os.getenv("DASHBOARD_SNAPSHOT_INTERVAL", "60"))
+# Delay after a write before refreshing, so a burst of writes is one refresh.
+DASHBOARD_SNAPSHOT_COALESCE = float(os.getenv("DASHBOARD_SNAPSHOT_COALESCE", "0.25"))
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?\s*(?:,|$)", re.IGNORECASE)
+_NO_CACHE = re.compile(r"(?:^|,)\s*no-cache\s*(?:,|$)", re.IGNORECASE)
+
+
+class Snapshot(NamedTuple):
+    overview: DashboardOverview
+    # Campaign change version read before the overview was computed.
+    version: int
+    taken_at: float
+
+
+class SnapshotStore:
+    def __init__(self, timer: Callable[[], float] = time.monotonic):
+        self._timer = timer
+        self._snapshot: Optional[Snapshot] = None
+
+    def get(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def age(self, snapshot: Snapshot) -> float:
+        return max(self._timer() - snapshot.taken_at, 0.0)
+
+    def refresh(self, db: Session) -> Snapshot:
+        version = campaign_service.get_change_version(db)
+        # Same cache key as an unfiltered /overview request, so that is warm too.
+        overview = dashboard_service.get_overview(db, filters=CampaignFilters())
+        snapshot = Snapshot(overview, version, self._timer())
+        self._snapshot = snapshot
+        return snapshot
+
+    def clear(self) -> None:
+        self._snapshot = None
+
+
+def max_acceptable_age(cache_control: Optional[str]) -> Optional[float]:
+    """Oldest snapshot, in seconds, the request's Cache-Control allows.
+
+    ``None`` means any age is fine; ``no-cache`` allows none.
+    """
+    if not cache_control:
+        return None
+    if _NO_CACHE.search(cache_control):
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    return float(match.group(1)) if match else None
+
+
+def fresh_enough(
+    store: SnapshotStore, snapshot: Snapshot, cache_control: Optional[str]
+) -> bool:
+    limit = max_acceptable_age(cache_control)
+    if limit is None:
+        return True
+    # max-age=0 asks for a live computation, not a snapshot taken this second.
+    return limit > 0 and store.age(snapshot) <= limit
+
+
+def _refresh(store: SnapshotStore, session_factory: Callable[[], Session]) -> None:
+    with session_factory() as db:
+        store.refresh(db)
+
+
+async def run_snapshots(
+    store: SnapshotStore,
+    session_factory: Callable[[], Session],
+    interval: float = DASHBOARD_SNAPSHOT_INTERVAL,
+    notifier: ChangeNotifier = campaign_changes,
+    coalesce: float = DASHBOARD_SNAPSHOT_COALESCE,
+) -> None:
+    """Refresh ``store`` forever: every ``interval`` seconds or after writes."""
+    while True:
+        seen = notifier.version
+        try:
+            await run_in_threadpool(_refresh, store, session_factory)
+        except Exception:
+            # Keep serving the previous snapshot; the next tick retries.
+            logger.exception("dashboard snapshot refresh failed")
+        if await notifier.wait(seen, interval) != seen:
+            await asyncio.sleep(coalesce)
+
+
+dashboard_snapshots = SnapshotStore()
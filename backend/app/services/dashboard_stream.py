@@ -0,0 +1,96 @@
+"""Server-Sent Events that push dashboard overview changes.
+
+A stream first sends the full overview as a ``snapshot`` event. After that,
+each campaign write wakes it through ``campaign_changes``. The stream waits
+out a short coalescing window so the rest of a burst can land, recomputes
+once, and sends a ``delta`` event holding only the top-level overview
+sections that changed. Streams with the same filters share one recompute:
+the first to take the lock fills the dashboard cache, and the rest read it.
+
+The notifier only hears about this process's writes. At every keepalive a
+stream also re-reads the trigger-maintained campaign change version, and
+recomputes if another worker (or raw SQL) has moved it.
+"""
+import asyncio
+import json
+import os
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from app.database import run_db
+from app.notifier import ChangeNotifier, campaign_changes
+from app.schemas.campaign import CampaignFilters
+from app.services import campaign_service, dashboard_service
+
+STREAM_COALESCE_SECONDS = float(os.getenv("DASHBOARD_STREAM_COALESCE", "0.25"))
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("DASHBOARD_STREAM_KEEPALIVE", "15"))
+
+_load_locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def format_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _overview(db, filters: Optional[CampaignFilters]) -> dict[str, Any]:
+    overview = dashboard_service.get_overview(db, filters=filters)
+    # End the read transaction so an idle stream does not pin a connection.
+    db.rollback()
+    return overview.model_dump(mode="json")
+
+
+def _change_version(db) -> int:
+    version = campaign_service.get_change_version(db)
+    db.rollback()
+    return version
+
+
+async def load_version(db) -> int:
+    """The campaign change version, without holding a transaction open."""
+    return await run_db(db, _change_version)
+
+
+async def load_overview(db, filters: Optional[CampaignFilters]) -> dict[str, Any]:
+    """The overview as JSON-ready data, computed once per filters at a time."""
+    lock = _load_locks.setdefault(filters, asyncio.Lock())
+    async with lock:
+        return await run_db(db, _overview, filters)
+
+
+async def overview_events(
+    load: Callable[[], Awaitable[dict[str, Any]]],
+    version: Optional[Callable[[], Awaitable[int]]] = None,
+    notifier: ChangeNotifier = campaign_changes,
+    coalesce: float = STREAM_COALESCE_SECONDS,
+    keepalive: float = STREAM_KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for ``load()``: a snapshot, then deltas on change.
+
+    ``version()`` returns the shared change version. It is checked whenever
+    ``keepalive`` seconds pass without a local write.
+    """
+    seen = notifier.version
+    shared = await version() if version else None
+    previous = await load()
+    yield format_event("snapshot", previous, seen)
+    while True:
+        if await notifier.wait(seen, keepalive) != seen:
+            await asyncio.sleep(coalesce)
+            seen = notifier.version
+        elif version is None or await version() == shared:
+            # Comment line: keeps proxies from timing out an idle stream.
+            yield ": keepalive\n\n"
+            continue
+        if version is not None:
+            shared = await version()
+        current = await load()
+        delta = {key: value for key, value in current.items() if previous.get(key) != value}
+        previous = current
+        if delta:
+            yield format_event("delta", delta, seen)
@@ -0,0 +1,63 @@
+import csv
+import io
+from typing import AsyncIterator, Callable, Iterable, Iterator, Literal
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.schemas.campaign import CampaignResponse
+
+EXPORT_FIELDS = list(CampaignResponse.model_fields)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def ndjson_chunk(rows: Iterable[Row]) -> str:
+    """Serialize a batch of campaign rows as newline-delimited JSON."""
+    return "".join(
+        CampaignResponse.model_validate(row).model_dump_json() + "\n" for row in rows
+    )
+
+
+def csv_header() -> str:
+    out = io.StringIO()
+    csv.writer(out).writerow(EXPORT_FIELDS)
+    return out.getvalue()
+
+
+def csv_chunk(rows: Iterable[Row]) -> str:
+    """Serialize a batch of campaign rows as CSV lines."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    for row in rows:
+        writer.writerow(getattr(row, field) for field in EXPORT_FIELDS)
+    return out.getvalue()
+
+
+ENCODERS: dict[str, Callable[[Iterable[Row]], str]] = {
+    "ndjson": ndjson_chunk,
+    "csv": csv_chunk,
+}
+
+
+def stream_export(db: Session, stmt: Select, fmt: ExportFormat) -> Iterator[str]:
+    """Run ``stmt`` and yield one encoded chunk per ``yield_per`` batch."""
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        yield csv_header()
+    for rows in db.execute(stmt).partitions():
+        yield encode(rows)
+
+
+async def astream_export(
+    db: AsyncSession, stmt: Select, fmt: ExportFormat
+) -> AsyncIterator[str]:
+    """Async counterpart of ``stream_export`` using a streaming result."""
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        yield csv_header()
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        yield encode(rows)
@@ -1,19 +1,87 @@
+import asyncio
+import logging
 import os
-from typing import List
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Sequence
 
 import httpx
 from fastapi import HTTPException
 
-from app.schemas.news import NewsArticle
+from app.ratelimit import TokenBucket
+from app.schemas.news import CampaignNews, CampaignNewsResult, NewsArticle
+from app.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 NEWS_API_BASE_URL = "https://newsapi.org/v2"
 
+# Seconds a cached result is served as fresh.
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "300"))
+# Further seconds an expired result is served while it refreshes in the
+# background. Older results are refreshed before answering.
+NEWS_CACHE_STALE = float(os.getenv("NEWS_CACHE_STALE", "3600"))
+NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "128"))
+
+# Outbound connection pool for the shared client created at startup.
+NEWS_HTTP_MAX_CONNECTIONS = int(os.getenv("NEWS_HTTP_MAX_CONNECTIONS", "20"))
+NEWS_HTTP_MAX_KEEPALIVE = int(os.getenv("NEWS_HTTP_MAX_KEEPALIVE", "10"))
+NEWS_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("NEWS_HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]").
+NEWS_HTTP2 = os.getenv("NEWS_HTTP2", "false").lower() in ("1", "true", "yes")
+NEWS_HTTP_TIMEOUT = 10.0
+
+# Upstream call budget; size to the NewsAPI plan (requests per second and
+# how many may go out back to back).
+NEWS_API_RATE = float(os.getenv("NEWS_API_RATE", "1"))
+NEWS_API_BURST = int(os.getenv("NEWS_API_BURST", "10"))
+# Longest a request waits for a token; past that it is treated as a 429.
+NEWS_API_MAX_WAIT = float(os.getenv("NEWS_API_MAX_WAIT", "5"))
+# Campaign fan-out: keywords fetched at once, and seconds each may take.
+NEWS_FANOUT_CONCURRENCY = int(os.getenv("NEWS_FANOUT_CONCURRENCY", "5"))
+NEWS_FANOUT_TIMEOUT = float(os.getenv("NEWS_FANOUT_TIMEOUT", "15"))
+
+# Set by the app lifespan; fetch_news falls back to a one-off client without it.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def make_http_client(
+    max_connections: int = NEWS_HTTP_MAX_CONNECTIONS,
+    max_keepalive: int = NEWS_HTTP_MAX_KEEPALIVE,
+    keepalive_expiry: float = NEWS_HTTP_KEEPALIVE_EXPIRY,
+    http2: bool = NEWS_HTTP2,
+) -> httpx.AsyncClient:
+    """A pooled client that reuses TCP/TLS connections across requests."""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=NEWS_HTTP_TIMEOUT)
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    global _http_client
+    _http_client = client
 
-async def fetch_news(keyword: str | None = None) -> List[NewsArticle]:
+
+async def _get(url: str, params: dict) -> httpx.Response:
+    if _http_client is not None:
+        return await _http_client.get(url, params=params)
+    async with httpx.AsyncClient() as client:
+        return await client.get(url, params=params, timeout=NEWS_HTTP_TIMEOUT)
+
+
+async def fetch_news(
+    keyword: str | None = None, since: datetime | None = None
+) -> List[NewsArticle]:
     """Fetch news articles from NewsAPI.
 
     If keyword is provided, uses /v2/everything endpoint.
     Otherwise, uses /v2/top-headlines with country=us.
+    With ``since`` (UTC), keyword searches ask only for articles published
+    from then on, newest first; top-headlines has no such filter.
     """
     api_key = os.environ.get("NEWS_API_KEY")
     if not api_key:
@@ -25,13 +93,15 @@ async def fetch_news(keyword: str | None = None) -> List[NewsArticle]:
     if keyword:
         url = f"{NEWS_API_BASE_URL}/everything"
         params = {"q": keyword, "apiKey": api_key, "pageSize": 20}
+        if since is not None:
+            params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+            params["sortBy"] = "publishedAt"
     else:
         url = f"{NEWS_API_BASE_URL}/top-headlines"
         params = {"country": "us", "apiKey": api_key, "pageSize": 20}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
+        response = await _get(url, params)
     except httpx.RequestError:
         raise HTTPException(
             status_code=502,
@@ -64,3 +134,205 @@ async def fetch_news(keyword: str | None = None) -> List[NewsArticle]:
         )
 
     return articles
+
+
+class CachedNews(NamedTuple):
+    articles: List[NewsArticle]
+    fetched_at: float
+
+
+class NewsCache:
+    """Keyword-keyed LRU of NewsAPI results, kept past expiry for fallback.
+
+    Entries are only dropped by LRU eviction, so the last good copy for a
+    keyword is still there when the upstream fails.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        stale: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale = stale
+        self._timer = timer
+        self._entries: OrderedDict[str, CachedNews] = OrderedDict()
+        # Pending background refreshes, at most one per key.
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> Optional[CachedNews]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, articles: List[NewsArticle]) -> CachedNews:
+        entry = CachedNews(articles, self._timer())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def age(self, entry: CachedNews) -> float:
+        return max(self._timer() - entry.fetched_at, 0.0)
+
+    def revalidate(self, key: str, refresh: Callable[[], Awaitable[None]]) -> None:
+        """Run ``refresh()`` in the background unless one is pending for ``key``."""
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+
+        def _done(_: asyncio.Task) -> None:
+            if self._refreshing.get(key) is task:
+                del self._refreshing[key]
+
+        task.add_done_callback(_done)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._refreshing.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+news_cache = NewsCache(
+    maxsize=NEWS_CACHE_SIZE, ttl=NEWS_CACHE_TTL, stale=NEWS_CACHE_STALE
+)
+
+
+def normalize_keyword(keyword: str | None) -> str:
+    # The other query params are fixed per endpoint, so the keyword decides them.
+    return " ".join((keyword or "").split()).lower()
+
+
+def _upstream_unavailable(exc: HTTPException) -> bool:
+    return exc.status_code == 429 or exc.status_code >= 500
+
+
+# Upstream fetches in flight, keyed like the cache: a burst of requests for
+# a keyword that is missing or expired makes one NewsAPI call.
+news_flights = SingleFlight()
+# Every NewsAPI call made on behalf of a request waits for a token here, for
+# at most NEWS_API_MAX_WAIT seconds.
+news_api_bucket = TokenBucket(rate=NEWS_API_RATE, capacity=NEWS_API_BURST)
+
+
+async def _refresh(key: str, keyword: str | None) -> CachedNews:
+    async def fetch() -> CachedNews:
+        if not await news_api_bucket.acquire(NEWS_API_MAX_WAIT):
+            # Same handling as an upstream 429: stale copy or error to the caller.
+            raise HTTPException(
+                status_code=429,
+                detail="News API rate limit exceeded. Please try again later.",
+            )
+        return news_cache.set(key, await fetch_news(keyword))
+
+    return await news_flights.do(key, fetch)
+
+
+async def _refresh_in_background(key: str, keyword: str | None) -> None:
+    try:
+        await _refresh(key, keyword)
+    except HTTPException as exc:
+        # The stale copy stays in place and is retried on the next request.
+        logger.warning("news refresh for %r failed: %s", key, exc.detail)
+
+
+async def get_news(keyword: str | None = None) -> CachedNews:
+    """Articles for ``keyword``, served from ``news_cache`` when possible.
+
+    Fresh entries are returned as is. Entries up to ``stale`` seconds past
+    their TTL are returned at once while a background task refreshes them.
+    Older entries are refreshed first. If NewsAPI is rate limiting or
+    failing, or ``news_api_bucket`` has no token within
+    ``NEWS_API_MAX_WAIT`` seconds, the cached copy is returned instead of
+    the error.
+    """
+    keyword = keyword.strip() if keyword else None
+    key = normalize_keyword(keyword)
+    entry = news_cache.get(key)
+    if entry is None:
+        return await _refresh(key, keyword)
+
+    age = news_cache.age(entry)
+    if age < news_cache.ttl:
+        return entry
+    if age < news_cache.ttl + news_cache.stale:
+        news_cache.revalidate(key, lambda: _refresh_in_background(key, keyword))
+        return entry
+    try:
+        return await _refresh(key, keyword)
+    except HTTPException as exc:
+        if not _upstream_unavailable(exc):
+            raise
+        logger.warning("serving cached news for %r: %s", key, exc.detail)
+        return entry
+
+
+class CampaignKeyword(NamedTuple):
+    campaign_id: int
+    name: str
+    keyword: str
+
+
+async def get_campaign_news(
+    campaigns: Sequence[CampaignKeyword],
+    concurrency: int = NEWS_FANOUT_CONCURRENCY,
+    timeout: float = NEWS_FANOUT_TIMEOUT,
+) -> CampaignNews:
+    """News for each campaign's keyword, merged and deduplicated by URL.
+
+    Distinct keywords are fetched concurrently, at most ``concurrency`` at
+    a time, through the cache and ``news_api_bucket``. A keyword that fails
+    or takes longer than ``timeout`` seconds marks its campaigns as failed
+    without failing the others.
+    """
+    gate = asyncio.Semaphore(concurrency)
+
+    async def fetch(keyword: str) -> CachedNews:
+        async with gate:
+            return await asyncio.wait_for(get_news(keyword), timeout)
+
+    keys = {campaign.keyword: normalize_keyword(campaign.keyword) for campaign in campaigns}
+    distinct: dict[str, str] = {}
+    for keyword, key in keys.items():
+        distinct.setdefault(key, keyword)
+    fetched = await asyncio.gather(
+        *(fetch(keyword) for keyword in distinct.values()), return_exceptions=True
+    )
+    outcomes = dict(zip(distinct, fetched))
+
+    articles: dict[str, NewsArticle] = {}
+    results = []
+    for campaign in campaigns:
+        outcome = outcomes[keys[campaign.keyword]]
+        result = CampaignNewsResult(
+            campaign_id=campaign.campaign_id,
+            name=campaign.name,
+            keyword=campaign.keyword,
+            status="ok",
+        )
+        if isinstance(outcome, CachedNews):
+            for article in outcome.articles:
+                # NewsAPI URLs identify articles; ones without a URL are dropped.
+                if article.url:
+                    articles.setdefault(article.url, article)
+                    result.article_urls.append(article.url)
+        elif isinstance(outcome, asyncio.TimeoutError):
+            result.status = "timeout"
+            result.error = f"No response within {timeout:g} seconds"
+        elif isinstance(outcome, HTTPException):
+            result.status = "error"
+            result.error = outcome.detail
+        else:
+            raise outcome
+        results.append(result)
+    return CampaignNews(articles=list(articles.values()), campaigns=results)
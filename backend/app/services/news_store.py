@@ -0,0 +1,185 @@
+"""Local store of NewsAPI articles, filled by a background ingester.
+
+The ingester polls each configured keyword (and the top headlines) every
+``NEWS_INGEST_INTERVAL`` seconds. It asks only for articles published since
+the newest one already stored for that keyword, and inserts new URLs while
+skipping ones it already has. ``GET /api/news?store=true`` pages through the
+store newest first, so reads never wait on the upstream.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Callable, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.models.news_article import StoredArticle
+from app.schemas.news import NewsArticle
+from app.services import news_service
+
+logger = logging.getLogger(__name__)
+
+# Seconds between ingestion passes; 0 (the default) disables the ingester.
+NEWS_INGEST_INTERVAL = float(os.getenv("NEWS_INGEST_INTERVAL", "0"))
+# Comma-separated keywords to ingest in addition to the top headlines.
+NEWS_INGEST_KEYWORDS = [
+    keyword.strip()
+    for keyword in os.getenv("NEWS_INGEST_KEYWORDS", "").split(",")
+    if keyword.strip()
+]
+
+_PUBLISHED_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def parse_published_at(value: str) -> Optional[datetime]:
+    """NewsAPI's ``publishedAt`` as a naive UTC datetime, or None if invalid."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def latest_published_at(db: Session, keyword: Optional[str]) -> Optional[datetime]:
+    key = news_service.normalize_keyword(keyword)
+    stmt = select(func.max(StoredArticle.published_at)).where(StoredArticle.keyword == key)
+    return db.scalar(stmt)
+
+
+def store_articles(
+    db: Session,
+    keyword: Optional[str],
+    articles: Sequence[NewsArticle],
+    since: Optional[datetime] = None,
+) -> int:
+    """Insert articles not yet stored; returns how many were added.
+
+    Articles without a URL or a parseable date, or published before
+    ``since``, are skipped. An article already stored under another keyword
+    keeps its first keyword.
+    """
+    key = news_service.normalize_keyword(keyword)
+    rows: dict[str, dict] = {}
+    for article in articles:
+        published_at = parse_published_at(article.published_at)
+        if not article.url or published_at is None:
+            continue
+        if since is not None and published_at < since:
+            continue
+        rows.setdefault(article.url, {
+            "url": article.url,
+            "keyword": key,
+            "title": article.title or "",
+            "description": article.description,
+            "source": article.source,
+            "published_at": published_at,
+        })
+    if not rows:
+        return 0
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = (
+        dialect.insert(StoredArticle)
+        .values(list(rows.values()))
+        .on_conflict_do_nothing(index_elements=["url"])
+        .returning(StoredArticle.id)
+    )
+    # RETURNING yields only the rows actually inserted.
+    added = len(db.execute(stmt).all())
+    db.commit()
+    return added
+
+
+def _session_call(session_factory: Callable[[], Session], fn, *args):
+    with session_factory() as db:
+        return fn(db, *args)
+
+
+async def ingest(session_factory: Callable[[], Session], keyword: Optional[str]) -> int:
+    """Fetch and store articles for ``keyword`` newer than the stored ones."""
+    since = await run_in_threadpool(
+        _session_call, session_factory, latest_published_at, keyword
+    )
+    await news_service.news_api_bucket.acquire()
+    articles = await news_service.fetch_news(keyword or None, since=since)
+    return await run_in_threadpool(
+        _session_call, session_factory, store_articles, keyword, articles, since
+    )
+
+
+async def run_ingester(
+    session_factory: Callable[[], Session],
+    keywords: Sequence[str] = NEWS_INGEST_KEYWORDS,
+    interval: float = NEWS_INGEST_INTERVAL,
+) -> None:
+    """Ingest the top headlines and each of ``keywords`` every ``interval`` seconds."""
+    while True:
+        for keyword in ("", *keywords):
+            try:
+                added = await ingest(session_factory, keyword)
+                logger.info("ingested %d news articles for %r", added, keyword)
+            except HTTPException as exc:
+                logger.warning("news ingest for %r failed: %s", keyword, exc.detail)
+            except Exception:
+                logger.exception("news ingest for %r failed", keyword)
+        await asyncio.sleep(interval)
+
+
+def encode_cursor(article: StoredArticle) -> str:
+    raw = json.dumps([article.published_at.isoformat(), article.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises ValueError if ``cursor`` was not produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, article_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        published_at = datetime.fromisoformat(published_at)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(article_id, int) or isinstance(article_id, bool):
+        raise ValueError("Invalid cursor")
+    return published_at, article_id
+
+
+def get_article_page(
+    db: Session,
+    keyword: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> tuple[list[NewsArticle], Optional[str]]:
+    """Stored articles newest first, with the cursor for the next page.
+
+    With ``keyword``, only articles ingested for it; otherwise all of them.
+    Raises ValueError for an invalid cursor.
+    """
+    order = (StoredArticle.published_at, StoredArticle.id)
+    stmt = select(StoredArticle).order_by(*(column.desc() for column in order))
+    if keyword and keyword.strip():
+        stmt = stmt.where(StoredArticle.keyword == news_service.normalize_keyword(keyword))
+    if cursor:
+        stmt = stmt.where(tuple_(*order) < tuple_(*decode_cursor(cursor)))
+    rows = db.scalars(stmt.limit(limit + 1)).all()
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    articles = [
+        NewsArticle(
+            title=row.title,
+            description=row.description,
+            source=row.source,
+            url=row.url,
+            published_at=row.published_at.strftime(_PUBLISHED_FORMAT),
+        )
+        for row in rows[:limit]
+    ]
+    return articles, next_cursor
@@ -0,0 +1,164 @@
+"""Rebuild and verify the trigger-maintained rollup tables against ``campaigns``.
+
+``campaign_rollups`` feeds the dashboard aggregates and ``campaign_pacing``
+the pacing series.
+"""
+import math
+
+from sqlalchemy import Date, delete, func, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.cache import dashboard_cache
+from app.notifier import campaign_changes
+from app.models.campaign import Campaign
+from app.models.campaign_pacing import CampaignPacing
+from app.models.campaign_rollup import CampaignRollup
+from app.schemas.dashboard import PacingMismatch, RollupMismatch
+
+ROLLUP_COLUMNS = ("status", "category", "created_date", "campaign_count", "total_budget")
+PACING_COLUMNS = ("status", "category", "platform", "day", "rate_change", "campaign_count")
+
+
+def _campaign_groups():
+    """The rollups as they should be, aggregated straight from ``campaigns``."""
+    created_date = func.date(Campaign.created_at, type_=Date)
+    return select(
+        Campaign.status,
+        Campaign.category,
+        created_date.label("created_date"),
+        func.count(Campaign.id).label("campaign_count"),
+        func.coalesce(func.sum(Campaign.budget), 0.0).label("total_budget"),
+    ).group_by(Campaign.status, Campaign.category, created_date)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup group from scratch; returns the group count.
+
+    On Postgres ``campaigns`` is locked against writes for the duration so
+    no trigger update can interleave with the recomputation.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE campaigns IN SHARE MODE"))
+    db.execute(delete(CampaignRollup))
+    db.execute(
+        insert(CampaignRollup).from_select(ROLLUP_COLUMNS, _campaign_groups())
+    )
+    count = db.scalar(select(func.count()).select_from(CampaignRollup))
+    db.commit()
+    dashboard_cache.clear()
+    campaign_changes.notify()
+    return count
+
+
+def check_rollups(db: Session) -> list[RollupMismatch]:
+    """Compare stored rollups with a fresh aggregation; empty when consistent."""
+    expected = {
+        (row.status, row.category, row.created_date): row
+        for row in db.execute(_campaign_groups())
+    }
+    actual = {
+        (row.status, row.category, row.created_date): row
+        for row in db.execute(select(CampaignRollup.__table__))
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want, have = expected.get(key), actual.get(key)
+        want_count = want.campaign_count if want else 0
+        have_count = have.campaign_count if have else 0
+        want_budget = float(want.total_budget) if want else 0.0
+        have_budget = float(have.total_budget) if have else 0.0
+        if want_count != have_count or not math.isclose(
+            want_budget, have_budget, rel_tol=1e-9, abs_tol=0.005
+        ):
+            status, category, created_date = key
+            mismatches.append(RollupMismatch(
+                status=status,
+                category=category,
+                created_date=created_date,
+                expected_count=want_count,
+                actual_count=have_count,
+                expected_budget=want_budget,
+                actual_budget=have_budget,
+            ))
+    return mismatches
+
+
+def _pacing_groups(dialect: str):
+    """The pacing rows as they should be, aggregated straight from ``campaigns``."""
+    if dialect == "postgresql":
+        start = Campaign.start_date
+        after_end = Campaign.end_date + 1
+        span = Campaign.end_date - Campaign.start_date + 1
+    else:
+        start = func.date(Campaign.start_date, type_=Date)
+        after_end = func.date(Campaign.end_date, "+1 day", type_=Date)
+        span = func.julianday(Campaign.end_date) - func.julianday(Campaign.start_date) + 1
+    rate = Campaign.budget / span
+    keys = (Campaign.status, Campaign.category, Campaign.platform)
+    valid = Campaign.end_date >= Campaign.start_date
+    changes = union_all(
+        select(*keys, start.label("day"), rate.label("rate_change")).where(valid),
+        select(*keys, after_end.label("day"), (-rate).label("rate_change")).where(valid),
+    ).subquery()
+    group = (changes.c.status, changes.c.category, changes.c.platform, changes.c.day)
+    return select(
+        *group,
+        func.sum(changes.c.rate_change).label("rate_change"),
+        func.count().label("campaign_count"),
+    ).group_by(*group)
+
+
+def rebuild_pacing(db: Session) -> int:
+    """Recompute every ``campaign_pacing`` row from scratch; returns the row count.
+
+    Locks ``campaigns`` on Postgres like ``rebuild_rollups``.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("LOCK TABLE campaigns IN SHARE MODE"))
+    db.execute(delete(CampaignPacing))
+    db.execute(
+        insert(CampaignPacing).from_select(PACING_COLUMNS, _pacing_groups(dialect))
+    )
+    count = db.scalar(select(func.count()).select_from(CampaignPacing))
+    db.commit()
+    dashboard_cache.clear()
+    campaign_changes.notify()
+    return count
+
+
+def check_pacing(db: Session) -> list[PacingMismatch]:
+    """Compare stored pacing rows with a fresh aggregation; empty when consistent."""
+    dialect = db.get_bind().dialect.name
+    expected = {
+        (row.status, row.category, row.platform, row.day): row
+        for row in db.execute(_pacing_groups(dialect))
+    }
+    actual = {
+        (row.status, row.category, row.platform, row.day): row
+        for row in db.execute(select(CampaignPacing.__table__))
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want, have = expected.get(key), actual.get(key)
+        want_count = want.campaign_count if want else 0
+        have_count = have.campaign_count if have else 0
+        want_rate = float(want.rate_change) if want else 0.0
+        have_rate = float(have.rate_change) if have else 0.0
+        if want_count != have_count or not math.isclose(
+            want_rate, have_rate, rel_tol=1e-9, abs_tol=0.005
+        ):
+            status, category, platform, day = key
+            mismatches.append(PacingMismatch(
+                status=status,
+                category=category,
+                platform=platform,
+                day=day,
+                expected_count=want_count,
+                actual_count=have_count,
+                expected_rate_change=want_rate,
+                actual_rate_change=have_rate,
+            ))
+    return mismatches
@@ -0,0 +1,42 @@
+"""Coalesce concurrent identical async calls into one.
+
+While a call for a key is in flight, further callers with the same key
+await the same task instead of starting their own, and all of them get its
+result or exception. The task is shielded, so a caller that is cancelled
+(e.g. a client disconnecting) does not cancel it for the others.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled.
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, Any]:
+        return {"started": self.started, "shared": self.shared, "in_flight": len(self)}
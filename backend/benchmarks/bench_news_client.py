@@ -0,0 +1,143 @@
+"""fetch_news latency and throughput: a client per call vs the shared pool.
+
+Starts a local stand-in for NewsAPI and calls ``news_service.fetch_news``
+against it, first with a fresh ``httpx.AsyncClient`` per call and then with
+the pooled client the app creates at startup. It prints per-call latency
+(sequential) and calls per second (concurrent).
+
+The stand-in speaks plain HTTP on loopback, so the saving here is TCP
+setup plus client construction, which loads the CA bundle into a new SSL
+context on every call. Against the real API each new connection
+also pays a TLS handshake and network round trips, so the gap is wider.
+
+    cd backend
+    python -m benchmarks.bench_news_client --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services import news_service
+
+ARTICLES = {
+    "status": "ok",
+    "articles": [
+        {
+            "source": {"name": "Stand-in"},
+            "title": f"Headline {i}",
+            "description": "Benchmark article",
+            "url": f"https://example.com/{i}",
+            "publishedAt": "2025-01-01T00:00:00Z",
+        }
+        for i in range(20)
+    ],
+}
+
+
+async def _headlines(request):
+    return JSONResponse(ARTICLES)
+
+
+def _serve(port: int) -> None:
+    app = Starlette(routes=[
+        Route("/v2/top-headlines", _headlines),
+        Route("/v2/everything", _headlines),
+    ])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _start_server() -> tuple[subprocess.Popen, str]:
+    # A separate process, so the server does not compete with the client
+    # for the GIL and skew the timings.
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_news_client", "--serve", str(port)]
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError("stand-in server did not start")
+            time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/v2"
+
+
+async def _latency(requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await news_service.fetch_news()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def _throughput(requests: int, concurrency: int) -> float:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            await news_service.fetch_news()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(label: str, shared: bool, requests: int, concurrency: int) -> None:
+    client = news_service.make_http_client() if shared else None
+    news_service.set_http_client(client)
+    try:
+        await news_service.fetch_news()  # warm up (and open the pool)
+        timings = await _latency(requests)
+        rate = await _throughput(requests, concurrency)
+    finally:
+        news_service.set_http_client(None)
+        if client is not None:
+            await client.aclose()
+    timings.sort()
+    print(
+        f"{label:<22} p50 {statistics.median(timings) * 1000:6.2f} ms"
+        f"  p95 {timings[int(len(timings) * 0.95) - 1] * 1000:6.2f} ms"
+        f"  {rate:8.0f} calls/s at concurrency {concurrency}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        _serve(args.serve)
+        return
+
+    server, base_url = _start_server()
+    news_service.NEWS_API_BASE_URL = base_url
+    os.environ.setdefault("NEWS_API_KEY", "benchmark")
+    try:
+        asyncio.run(run("client per call", False, args.requests, args.concurrency))
+        asyncio.run(run("shared pooled client", True, args.requests, args.concurrency))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
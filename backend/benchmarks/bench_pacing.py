@@ -0,0 +1,101 @@
+"""Budget pacing: get_pacing end to end against a seeded SQLite file.
+
+Seeds synthetic campaigns through the ORM insert (so the campaign_pacing
+triggers fill the rate-change table, as in production), then times
+pacing_service.get_pacing with the dashboard cache cleared before every
+call: unfiltered, filtered by status (both read campaign_pacing) and with
+an ``active_from`` window (which falls back to scanning campaigns).
+
+    cd backend
+    python -m benchmarks.bench_pacing --campaigns 300000
+"""
+import argparse
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import dashboard_cache
+from app.database import Base, make_engine
+from app.models.campaign import Campaign
+from app.models.campaign_pacing import CampaignPacing
+from app.schemas.campaign import CampaignFilters
+from app.services import pacing_service
+
+PLATFORMS = ["facebook", "instagram", "twitter", "google", "linkedin", "email", "other"]
+STATUSES = ["draft", "active", "paused", "completed"]
+
+
+def _synthetic(n: int, rng: np.random.Generator):
+    first_day = np.datetime64("2023-01-01")
+    starts = first_day + rng.integers(0, 3 * 365, n)
+    ends = starts + rng.integers(0, 180, n)
+    budgets = rng.uniform(100, 50_000, n).round(2)
+    groups = rng.integers(0, len(PLATFORMS), n)
+    statuses = rng.integers(0, len(STATUSES), n)
+    return budgets, starts, ends, groups, statuses
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_end_to_end(n: int, repeat: int) -> None:
+    budgets, starts, ends, groups, statuses = _synthetic(n, np.random.default_rng(1))
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'pacing.db'}")
+        Base.metadata.create_all(engine)
+        rows = [
+            {
+                "name": f"Campaign {i}",
+                "status": STATUSES[statuses[i]],
+                "budget": float(budgets[i]),
+                "start_date": starts[i].item(),
+                "end_date": ends[i].item(),
+                "platform": PLATFORMS[groups[i]],
+            }
+            for i in range(n)
+        ]
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(insert(Campaign), rows)
+            pacing_rows = conn.scalar(select(func.count()).select_from(CampaignPacing))
+        print(f"seeded {n} campaigns in {time.perf_counter() - started:.1f} s "
+              f"({pacing_rows} campaign_pacing rows)")
+
+        cases = {
+            "unfiltered": CampaignFilters(),
+            "status=active": CampaignFilters(status="active"),
+            "active_from (scans campaigns)": CampaignFilters(active_from=date(2024, 1, 1)),
+        }
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            for label, filters in cases.items():
+                def run():
+                    dashboard_cache.clear()
+                    pacing_service.get_pacing(db, "platform", "week", filters=filters)
+
+                print(f"get_pacing, {label}: {_best_of(run, repeat) * 1000:.1f} ms")
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bench_end_to_end(args.campaigns, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
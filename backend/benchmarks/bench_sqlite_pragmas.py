@@ -0,0 +1,120 @@
+"""Mixed read/write throughput on SQLite: rollback journal vs tuned WAL.
+
+Runs reader threads listing a page of campaigns and writer threads creating
+campaigns against a fresh database file for each configuration, then prints
+operations per second and lock errors.
+
+    cd backend
+    python -m benchmarks.bench_sqlite_pragmas --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, make_engine
+from app.schemas.campaign import CampaignCreate
+from app.services import campaign_service
+
+CONFIGS = {
+    "rollback journal (defaults)": {"journal_mode": "DELETE", "synchronous": "FULL"},
+    "WAL + tuned pragmas": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -65536,
+        "busy_timeout": 5000,
+    },
+}
+
+SEED_ROWS = 5000
+
+
+def _campaign(i: int) -> CampaignCreate:
+    return CampaignCreate(
+        name=f"Campaign {i}",
+        description="Benchmark campaign " * 10,
+        budget=float(i % 1000),
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 12, 31),
+    )
+
+
+def run(pragmas: dict, readers: int, writers: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", sqlite_pragmas=pragmas)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            campaign_service.bulk_create_campaigns(
+                db, [_campaign(i).model_dump() for i in range(SEED_ROWS)]
+            )
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def reader():
+            with Session() as db:
+                while not stop.is_set():
+                    try:
+                        campaign_service.get_campaigns(db, sort_by="budget", limit=50)
+                        db.rollback()
+                        key = "reads"
+                    except OperationalError:
+                        db.rollback()
+                        key = "errors"
+                    with lock:
+                        counts[key] += 1
+
+        def writer():
+            i = 0
+            with Session() as db:
+                while not stop.is_set():
+                    try:
+                        campaign_service.create_campaign(db, _campaign(i))
+                        key = "writes"
+                    except OperationalError:
+                        db.rollback()
+                        key = "errors"
+                    i += 1
+                    with lock:
+                        counts[key] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {name: count / seconds for name, count in counts.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per config")
+    print(f"{'config':<30} {'reads/s':>10} {'writes/s':>10} {'errors/s':>10}")
+    for name, pragmas in CONFIGS.items():
+        result = run(pragmas, args.readers, args.writers, args.seconds)
+        print(
+            f"{name:<30} {result['reads']:>10.0f} {result['writes']:>10.0f} "
+            f"{result['errors']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, engine
+from app.models import (  # noqa: F401 - register models and DDL
+    campaign_pacing,
+    campaign_rollup,
+    campaign_search,
+    news_article,
+    table_version,
+)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Full-text search objects are dialect-specific and managed by hand in
+    # 0003_campaign_search.py, so keep them out of autogenerate comparisons.
+    if type_ == "table" and name.startswith("campaigns_fts"):
+        return False
+    if type_ == "index" and name == "ix_campaigns_search":
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is None:
+        with engine.connect() as connection:
+            _run_with_connection(connection)
+    else:
+        _run_with_connection(connection)
+
+
+def _run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
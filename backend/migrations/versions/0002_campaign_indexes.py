@@ -0,0 +1,34 @@
+"""add composite indexes for campaign filter, sort and dashboard paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-02 00:00:00
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_campaigns_status_category_start_date": ["status", "category", "start_date"],
+    "ix_campaigns_category_budget": ["category", "budget"],
+    "ix_campaigns_budget_id": ["budget", "id"],
+    "ix_campaigns_start_date_id": ["start_date", "id"],
+    "ix_campaigns_created_at": ["created_at"],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the table writable while Postgres builds each index;
+    # it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "campaigns", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    for name in reversed(list(INDEXES)):
+        op.drop_index(name, table_name="campaigns")
@@ -0,0 +1,67 @@
+"""add full-text search index over campaign name and description
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-03 00:00:00
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS campaigns_fts USING fts5(
+        name, description, content='campaigns', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_insert AFTER INSERT ON campaigns BEGIN
+        INSERT INTO campaigns_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_delete AFTER DELETE ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_update
+        AFTER UPDATE OF name, description ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO campaigns_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    # Index the rows that existed before the table was created.
+    "INSERT INTO campaigns_fts(campaigns_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS campaigns_fts_update",
+    "DROP TRIGGER IF EXISTS campaigns_fts_delete",
+    "DROP TRIGGER IF EXISTS campaigns_fts_insert",
+    "DROP TABLE IF EXISTS campaigns_fts",
+]
+
+POSTGRES_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_campaigns_search ON campaigns "
+    "USING gin (to_tsvector('english', name || ' ' || coalesce(description, '')))"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(POSTGRES_INDEX)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_campaigns_search")
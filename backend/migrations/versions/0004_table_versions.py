@@ -0,0 +1,63 @@
+"""add table_versions change counter maintained by campaign triggers
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-04 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaigns_version_{event_name.lower()}
+        AFTER {event_name} ON campaigns BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = 'campaigns';
+    END"""
+    for event_name in ("INSERT", "UPDATE", "DELETE")
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION bump_campaigns_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = 'campaigns';
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaigns_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_campaigns_version()""",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('campaigns', 0)")
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRES_TRIGGERS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for event_name in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS campaigns_version_{event_name}")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS campaigns_version ON campaigns")
+        op.execute("DROP FUNCTION IF EXISTS bump_campaigns_version()")
+    op.drop_table("table_versions")
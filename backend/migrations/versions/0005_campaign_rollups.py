@@ -0,0 +1,142 @@
+"""add campaign_rollups maintained by campaign triggers
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-05 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def _sqlite_add(row: str) -> str:
+    return f"""INSERT INTO campaign_rollups
+            (status, category, created_date, campaign_count, total_budget)
+        VALUES ({row}.status, {row}.category, date({row}.created_at), 1, {row}.budget)
+        ON CONFLICT (status, category, created_date) DO UPDATE SET
+            campaign_count = campaign_count + 1,
+            total_budget = total_budget + excluded.total_budget;"""
+
+
+def _sqlite_remove(row: str) -> str:
+    key = (
+        f"status = {row}.status AND category = {row}.category"
+        f" AND created_date = date({row}.created_at)"
+    )
+    return f"""UPDATE campaign_rollups SET
+            campaign_count = campaign_count - 1,
+            total_budget = total_budget - {row}.budget
+        WHERE {key};
+        DELETE FROM campaign_rollups WHERE {key} AND campaign_count <= 0;"""
+
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_insert
+        AFTER INSERT ON campaigns BEGIN
+        {_sqlite_add("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_delete
+        AFTER DELETE ON campaigns BEGIN
+        {_sqlite_remove("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_rollups_update
+        AFTER UPDATE OF status, category, budget, created_at ON campaigns
+        WHEN OLD.status IS NOT NEW.status OR OLD.category IS NOT NEW.category
+            OR OLD.budget IS NOT NEW.budget OR OLD.created_at IS NOT NEW.created_at
+        BEGIN
+        {_sqlite_remove("OLD")}
+        {_sqlite_add("NEW")}
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION maintain_campaign_rollups() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM campaign_rollups;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.status IS NOT DISTINCT FROM NEW.status
+            AND OLD.category IS NOT DISTINCT FROM NEW.category
+            AND OLD.budget IS NOT DISTINCT FROM NEW.budget
+            AND OLD.created_at IS NOT DISTINCT FROM NEW.created_at THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE campaign_rollups SET
+                campaign_count = campaign_count - 1,
+                total_budget = total_budget - OLD.budget
+            WHERE status = OLD.status AND category = OLD.category
+                AND created_date = OLD.created_at::date;
+            DELETE FROM campaign_rollups
+            WHERE status = OLD.status AND category = OLD.category
+                AND created_date = OLD.created_at::date AND campaign_count <= 0;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            INSERT INTO campaign_rollups
+                (status, category, created_date, campaign_count, total_budget)
+            VALUES (NEW.status, NEW.category, NEW.created_at::date, 1, NEW.budget)
+            ON CONFLICT (status, category, created_date) DO UPDATE SET
+                campaign_count = campaign_rollups.campaign_count + 1,
+                total_budget = campaign_rollups.total_budget + EXCLUDED.total_budget;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaign_rollups
+        AFTER INSERT OR UPDATE OR DELETE ON campaigns
+        FOR EACH ROW EXECUTE FUNCTION maintain_campaign_rollups()""",
+    """CREATE TRIGGER campaign_rollups_truncate
+        AFTER TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION maintain_campaign_rollups()""",
+]
+
+
+def _backfill(created_date: str) -> str:
+    return f"""INSERT INTO campaign_rollups
+            (status, category, created_date, campaign_count, total_budget)
+        SELECT status, category, {created_date}, count(id), coalesce(sum(budget), 0)
+        FROM campaigns
+        GROUP BY status, category, {created_date}"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_rollups",
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("created_date", sa.Date(), nullable=False),
+        sa.Column("campaign_count", sa.Integer(), nullable=False),
+        sa.Column("total_budget", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "category", "created_date"),
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(_backfill("date(created_at)"))
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        # Hold off writers until the triggers exist and the backfill has
+        # run, so no row is counted twice or missed.
+        op.execute("LOCK TABLE campaigns IN SHARE ROW EXCLUSIVE MODE")
+        for statement in POSTGRES_TRIGGERS:
+            op.execute(statement)
+        op.execute(_backfill("created_at::date"))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for event_name in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS campaign_rollups_{event_name}")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS campaign_rollups ON campaigns")
+        op.execute("DROP TRIGGER IF EXISTS campaign_rollups_truncate ON campaigns")
+        op.execute("DROP FUNCTION IF EXISTS maintain_campaign_rollups()")
+    op.drop_table("campaign_rollups")
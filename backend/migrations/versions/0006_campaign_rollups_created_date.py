@@ -0,0 +1,22 @@
+"""index campaign_rollups by created_date for time-series range reads
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-06 00:00:00
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_campaign_rollups_created_date", "campaign_rollups", ["created_date"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_campaign_rollups_created_date", table_name="campaign_rollups")
@@ -0,0 +1,32 @@
+"""add covering indexes for dashboard pivot group-bys
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-07 00:00:00
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_campaigns_status_category_platform_budget": [
+        "status", "category", "platform", "budget"
+    ],
+    "ix_campaigns_platform_budget": ["platform", "budget"],
+}
+
+
+def upgrade() -> None:
+    # Built concurrently so campaigns stays writable; see 0002.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "campaigns", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    for name in reversed(list(INDEXES)):
+        op.drop_index(name, table_name="campaigns")
@@ -0,0 +1,44 @@
+"""add news_articles store for ingested NewsAPI articles
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-08 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "news_articles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=2048), nullable=False),
+        sa.Column("keyword", sa.String(length=255), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("source", sa.String(length=255), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_news_articles_url", "news_articles", ["url"], unique=True)
+    op.create_index(
+        "ix_news_articles_published_at_id", "news_articles", ["published_at", "id"]
+    )
+    op.create_index(
+        "ix_news_articles_keyword_published_at_id",
+        "news_articles",
+        ["keyword", "published_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_articles_keyword_published_at_id", table_name="news_articles")
+    op.drop_index("ix_news_articles_published_at_id", table_name="news_articles")
+    op.drop_index("ix_news_articles_url", table_name="news_articles")
+    op.drop_table("news_articles")
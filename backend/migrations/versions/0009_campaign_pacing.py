@@ -0,0 +1,186 @@
+"""add campaign_pacing daily-rate changes maintained by campaign triggers
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-01-09 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def _sqlite_edges(row: str) -> list[tuple[str, str]]:
+    """(day, signed rate) for the start and the day after the end of ``row``."""
+    rate = (
+        f"{row}.budget / (julianday({row}.end_date) - julianday({row}.start_date) + 1)"
+    )
+    return [
+        (f"date({row}.start_date)", rate),
+        (f"date({row}.end_date, '+1 day')", f"-{rate}"),
+    ]
+
+
+def _sqlite_add(row: str) -> str:
+    return "\n".join(
+        f"""INSERT INTO campaign_pacing
+            (status, category, platform, day, rate_change, campaign_count)
+        SELECT {row}.status, {row}.category, {row}.platform, {day}, {rate}, 1
+        WHERE {row}.end_date >= {row}.start_date
+        ON CONFLICT (status, category, platform, day) DO UPDATE SET
+            rate_change = rate_change + excluded.rate_change,
+            campaign_count = campaign_count + 1;"""
+        for day, rate in _sqlite_edges(row)
+    )
+
+
+def _sqlite_remove(row: str) -> str:
+    statements = []
+    for day, rate in _sqlite_edges(row):
+        key = (
+            f"status = {row}.status AND category = {row}.category"
+            f" AND platform = {row}.platform AND day = {day}"
+        )
+        statements.append(f"""UPDATE campaign_pacing SET
+            rate_change = rate_change - ({rate}),
+            campaign_count = campaign_count - 1
+        WHERE {key} AND {row}.end_date >= {row}.start_date;
+        DELETE FROM campaign_pacing WHERE {key} AND campaign_count <= 0;""")
+    return "\n".join(statements)
+
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_insert
+        AFTER INSERT ON campaigns BEGIN
+        {_sqlite_add("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_delete
+        AFTER DELETE ON campaigns BEGIN
+        {_sqlite_remove("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS campaign_pacing_update
+        AFTER UPDATE OF status, category, platform, budget, start_date, end_date
+        ON campaigns
+        WHEN OLD.status IS NOT NEW.status OR OLD.category IS NOT NEW.category
+            OR OLD.platform IS NOT NEW.platform OR OLD.budget IS NOT NEW.budget
+            OR OLD.start_date IS NOT NEW.start_date OR OLD.end_date IS NOT NEW.end_date
+        BEGIN
+        {_sqlite_remove("OLD")}
+        {_sqlite_add("NEW")}
+    END""",
+]
+
+POSTGRES_TRIGGERS = [
+    """CREATE OR REPLACE FUNCTION maintain_campaign_pacing() RETURNS trigger AS $$
+    DECLARE
+        rate double precision;
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM campaign_pacing;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.status IS NOT DISTINCT FROM NEW.status
+            AND OLD.category IS NOT DISTINCT FROM NEW.category
+            AND OLD.platform IS NOT DISTINCT FROM NEW.platform
+            AND OLD.budget IS NOT DISTINCT FROM NEW.budget
+            AND OLD.start_date IS NOT DISTINCT FROM NEW.start_date
+            AND OLD.end_date IS NOT DISTINCT FROM NEW.end_date THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_date >= OLD.start_date THEN
+            rate := OLD.budget / (OLD.end_date - OLD.start_date + 1);
+            UPDATE campaign_pacing SET
+                rate_change = rate_change
+                    - CASE WHEN day = OLD.start_date THEN rate ELSE -rate END,
+                campaign_count = campaign_count - 1
+            WHERE status = OLD.status AND category = OLD.category
+                AND platform = OLD.platform
+                AND day IN (OLD.start_date, OLD.end_date + 1);
+            DELETE FROM campaign_pacing
+            WHERE status = OLD.status AND category = OLD.category
+                AND platform = OLD.platform
+                AND day IN (OLD.start_date, OLD.end_date + 1)
+                AND campaign_count <= 0;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.end_date >= NEW.start_date THEN
+            rate := NEW.budget / (NEW.end_date - NEW.start_date + 1);
+            INSERT INTO campaign_pacing
+                (status, category, platform, day, rate_change, campaign_count)
+            VALUES
+                (NEW.status, NEW.category, NEW.platform, NEW.start_date, rate, 1),
+                (NEW.status, NEW.category, NEW.platform, NEW.end_date + 1, -rate, 1)
+            ON CONFLICT (status, category, platform, day) DO UPDATE SET
+                rate_change = campaign_pacing.rate_change + EXCLUDED.rate_change,
+                campaign_count = campaign_pacing.campaign_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER campaign_pacing
+        AFTER INSERT OR UPDATE OR DELETE ON campaigns
+        FOR EACH ROW EXECUTE FUNCTION maintain_campaign_pacing()""",
+    """CREATE TRIGGER campaign_pacing_truncate
+        AFTER TRUNCATE ON campaigns
+        FOR EACH STATEMENT EXECUTE FUNCTION maintain_campaign_pacing()""",
+]
+
+
+def _backfill(start: str, after_end: str, span: str) -> str:
+    rate = f"budget / ({span})"
+    return f"""INSERT INTO campaign_pacing
+            (status, category, platform, day, rate_change, campaign_count)
+        SELECT status, category, platform, day, sum(rate_change), count(*)
+        FROM (
+            SELECT status, category, platform, {start} AS day, {rate} AS rate_change
+            FROM campaigns WHERE end_date >= start_date
+            UNION ALL
+            SELECT status, category, platform, {after_end}, -{rate}
+            FROM campaigns WHERE end_date >= start_date
+        ) AS changes
+        GROUP BY status, category, platform, day"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_pacing",
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("platform", sa.String(length=50), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("rate_change", sa.Float(), nullable=False),
+        sa.Column("campaign_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "category", "platform", "day"),
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(_backfill(
+            "date(start_date)",
+            "date(end_date, '+1 day')",
+            "julianday(end_date) - julianday(start_date) + 1",
+        ))
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        # Hold off writers until the triggers exist and the backfill has
+        # run, so no campaign is counted twice or missed.
+        op.execute("LOCK TABLE campaigns IN SHARE ROW EXCLUSIVE MODE")
+        for statement in POSTGRES_TRIGGERS:
+            op.execute(statement)
+        op.execute(_backfill("start_date", "end_date + 1", "end_date - start_date + 1"))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for event_name in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS campaign_pacing_{event_name}")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS campaign_pacing ON campaigns")
+        op.execute("DROP TRIGGER IF EXISTS campaign_pacing_truncate ON campaigns")
+        op.execute("DROP FUNCTION IF EXISTS maintain_campaign_pacing()")
+    op.drop_table("campaign_pacing")
@@ -1,10 +1,13 @@
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from app.cache import dashboard_cache
 from app.database import Base, get_db
+from app.services.dashboard_snapshot import dashboard_snapshots
+from app.services.news_service import news_cache
 from app.routers.campaigns import router as campaigns_router
 
 TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -15,6 +18,29 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class FakeClock:
+    """A ``time.monotonic`` stand-in that only moves when ``now`` is set."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    dashboard_cache.clear()
+    dashboard_snapshots.clear()
+    news_cache.clear()
+    yield
+
+
 @pytest.fixture
 def db():
     Base.metadata.create_all(bind=engine)
@@ -26,6 +52,19 @@ def db():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def statements():
+    """SQL statements issued against the test engine while the test runs."""
+    captured = []
+
+    def _capture(conn, cursor, statement, *args):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
 @pytest.fixture
 def client(db):
     """TestClient wired to the campaigns router with a test DB session."""
@@ -0,0 +1,92 @@
+"""The routers running on an AsyncSession (USE_ASYNC_DB mode)."""
+
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import get_session, run_db, to_async_url
+from app.routers.campaigns import router as campaigns_router
+from app.routers.dashboard import router as dashboard_router
+from app.services import campaign_service
+from tests.conftest import TEST_DATABASE_URL
+
+VALID_CAMPAIGN = {
+    "name": "Async Campaign",
+    "status": "active",
+    "budget": 250.0,
+    "start_date": "2025-01-01",
+    "end_date": "2025-06-30",
+    "platform": "email",
+    "category": "retention",
+}
+
+
+@pytest_asyncio.fixture
+async def async_session_factory(db):
+    engine = create_async_engine(to_async_url(TEST_DATABASE_URL))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def client(async_session_factory):
+    app = FastAPI()
+    app.include_router(campaigns_router)
+    app.include_router(dashboard_router)
+
+    async def _override_get_session():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    with TestClient(app) as c:
+        yield c
+
+
+def test_to_async_url_swaps_driver():
+    assert to_async_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("postgresql+psycopg2://h/db") == "postgresql+asyncpg://h/db"
+
+
+@pytest.mark.asyncio
+async def test_run_db_uses_run_sync_for_async_sessions(async_session_factory):
+    async with async_session_factory() as session:
+        assert isinstance(session, AsyncSession)
+        assert await run_db(session, campaign_service.get_campaigns) == []
+
+
+def test_crud_round_trip(client):
+    created = client.post("/api/campaigns", json=VALID_CAMPAIGN)
+    assert created.status_code == 201
+    campaign_id = created.json()["id"]
+
+    assert client.get(f"/api/campaigns/{campaign_id}").json()["name"] == "Async Campaign"
+    patched = client.patch(f"/api/campaigns/{campaign_id}", json={"budget": 300})
+    assert patched.json()["budget"] == 300
+    assert [c["id"] for c in client.get("/api/campaigns", params={"q": "async"}).json()] == [
+        campaign_id
+    ]
+    assert client.delete(f"/api/campaigns/{campaign_id}").status_code == 200
+    assert client.get(f"/api/campaigns/{campaign_id}").status_code == 404
+
+
+def test_export_streams_from_async_result(client):
+    client.post("/api/campaigns/bulk", json=[VALID_CAMPAIGN, VALID_CAMPAIGN])
+    resp = client.get("/api/campaigns/export")
+    assert [json.loads(line)["name"] for line in resp.text.splitlines()] == [
+        "Async Campaign",
+        "Async Campaign",
+    ]
+
+
+def test_dashboard_and_etag(client):
+    client.post("/api/campaigns", json=VALID_CAMPAIGN)
+    resp = client.get("/api/dashboard/summary")
+    assert resp.json()["total_budget"] == 250.0
+    again = client.get("/api/dashboard/summary", headers={"If-None-Match": resp.headers["ETag"]})
+    assert again.status_code == 304
@@ -0,0 +1,94 @@
+import pytest
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self, clock):
+        cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self, clock):
+        cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_clear_discards_values_computed_before_it(self, clock):
+        cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+        calls = []
+
+        @cache.cached
+        def load(db, key):
+            calls.append(key)
+            if len(calls) == 1:
+                cache.clear()  # a write lands while the first load runs
+            return len(calls)
+
+        assert load(None, "k") == 1
+        assert load(None, "k") == 2
+        assert load(None, "k") == 2
+        assert calls == ["k", "k"]
+
+    def test_cached_keys_on_arguments_but_not_session(self, clock):
+        cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+
+        @cache.cached
+        def load(db, n, scale=1):
+            return n * scale
+
+        assert load("session-1", 2) == 2
+        assert load("session-2", 2) == 2
+        assert load("session-1", 2, scale=3) == 6
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_maxsize_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0, ttl=1)
+
+
+def test_version_is_part_of_the_key(clock):
+    data = {"version": 1}
+    cache = TTLCache(maxsize=4, ttl=10, timer=clock, version=lambda db: data["version"])
+    calls = []
+
+    @cache.cached
+    def load(db):
+        calls.append(data["version"])
+        return data["version"]
+
+    assert load(None) == 1
+    assert load(None) == 1
+    data["version"] = 2  # written elsewhere; no clear() in this process
+    assert load(None) == 2
+    assert calls == [1, 2]
+
+
+def test_data_version_from_caller_skips_the_version_read(clock):
+    reads = []
+    cache = TTLCache(maxsize=4, ttl=10, timer=clock, version=lambda db: reads.append(db) or 1)
+
+    @cache.cached
+    def load(db):
+        return "value"
+
+    assert load(None, data_version=5) == "value"
+    assert load(None, data_version=5) == "value"
+    assert reads == []
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -1,5 +1,12 @@
 """Unit tests for the campaign router REST endpoints."""
 
+import csv
+import io
+import json
+
+from app.schemas.news import NewsArticle
+from app.services import export_service, news_service
+
 VALID_CAMPAIGN = {
     "name": "Test Campaign",
     "description": "A test campaign",
@@ -57,6 +64,23 @@ class TestListCampaigns:
         assert resp.status_code == 200
         assert len(resp.json()) == 2
 
+    def test_filter_by_platform_and_active_window(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "platform": "email"})
+        _create_campaign(client, {**VALID_CAMPAIGN, "platform": "google"})
+        resp = client.get(
+            "/api/campaigns",
+            params={"platform": "email", "active_from": "2025-01-01", "active_to": "2025-01-31"},
+        )
+        assert [c["platform"] for c in resp.json()] == ["email"]
+        resp = client.get("/api/campaigns", params={"active_from": "2099-01-01"})
+        assert resp.json() == []
+
+    def test_invalid_active_window_returns_422(self, client):
+        resp = client.get(
+            "/api/campaigns", params={"active_from": "2025-06-01", "active_to": "2025-01-01"}
+        )
+        assert resp.status_code == 422
+
     def test_filter_by_status(self, client):
         _create_campaign(client, {**VALID_CAMPAIGN, "status": "active"})
         _create_campaign(client, {**VALID_CAMPAIGN, "status": "draft"})
@@ -90,6 +114,27 @@ class TestListCampaigns:
         budgets = [c["budget"] for c in resp.json()]
         assert budgets == sorted(budgets, reverse=True)
 
+    def test_limit_returns_next_cursor_header(self, client):
+        for i in range(3):
+            _create_campaign(client, {**VALID_CAMPAIGN, "name": f"C{i}"})
+        resp = client.get("/api/campaigns", params={"limit": 2})
+        assert resp.status_code == 200
+        assert [c["name"] for c in resp.json()] == ["C0", "C1"]
+        cursor = resp.headers["X-Next-Cursor"]
+
+        resp = client.get("/api/campaigns", params={"limit": 2, "cursor": cursor})
+        assert [c["name"] for c in resp.json()] == ["C2"]
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_invalid_cursor_returns_400(self, client):
+        resp = client.get("/api/campaigns", params={"limit": 2, "cursor": "bogus"})
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid cursor"
+
+    def test_limit_out_of_range_returns_422(self, client):
+        resp = client.get("/api/campaigns", params={"limit": 0})
+        assert resp.status_code == 422
+
 
 class TestGetCampaign:
     def test_get_existing(self, client):
@@ -125,6 +170,34 @@ class TestUpdateCampaign:
         assert resp.status_code == 422
 
 
+class TestPatchCampaign:
+    def test_patch_updates_supplied_fields_only(self, client):
+        created = _create_campaign(client).json()
+        resp = client.patch(f"/api/campaigns/{created['id']}", json={"budget": 2500})
+        assert resp.status_code == 200
+        assert resp.json()["budget"] == 2500
+        assert resp.json()["name"] == VALID_CAMPAIGN["name"]
+        assert resp.json()["description"] == VALID_CAMPAIGN["description"]
+
+    def test_patch_date_conflicting_with_stored_date_returns_422(self, client):
+        created = _create_campaign(client).json()
+        resp = client.patch(
+            f"/api/campaigns/{created['id']}", json={"start_date": "2025-12-01"}
+        )
+        assert resp.status_code == 422
+        assert resp.json()["detail"] == "end_date must be on or after start_date"
+
+    def test_patch_null_field_returns_422(self, client):
+        created = _create_campaign(client).json()
+        resp = client.patch(f"/api/campaigns/{created['id']}", json={"name": None})
+        assert resp.status_code == 422
+
+    def test_patch_not_found(self, client):
+        resp = client.patch("/api/campaigns/99999", json={"name": "X"})
+        assert resp.status_code == 404
+        assert resp.json()["detail"] == "Campaign not found"
+
+
 class TestDeleteCampaign:
     def test_delete_existing(self, client):
         created = _create_campaign(client).json()
@@ -139,3 +212,217 @@ class TestDeleteCampaign:
         resp = client.delete("/api/campaigns/99999")
         assert resp.status_code == 404
         assert resp.json()["detail"] == "Campaign not found"
+
+
+class TestExportCampaigns:
+    def test_export_ndjson_streams_one_object_per_line(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "A"})
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "B"})
+        resp = client.get("/api/campaigns/export")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = resp.text.splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["A", "B"]
+        assert "created_at" in json.loads(lines[0])
+
+    def test_export_csv_has_header_and_rows(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "A", "budget": 5})
+        resp = client.get("/api/campaigns/export", params={"format": "csv"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        assert len(rows) == 1
+        assert rows[0]["name"] == "A"
+        assert float(rows[0]["budget"]) == 5
+
+    def test_export_applies_filters_and_sort(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "status": "active", "budget": 900})
+        _create_campaign(client, {**VALID_CAMPAIGN, "status": "active", "budget": 100})
+        _create_campaign(client, {**VALID_CAMPAIGN, "status": "draft"})
+        resp = client.get(
+            "/api/campaigns/export",
+            params={"status": "active", "sort_by": "budget", "sort_order": "asc"},
+        )
+        budgets = [json.loads(line)["budget"] for line in resp.text.splitlines()]
+        assert budgets == [100, 900]
+
+    def test_export_empty_csv_is_header_only(self, client):
+        resp = client.get("/api/campaigns/export", params={"format": "csv"})
+        assert resp.text.splitlines() == [",".join(export_service.EXPORT_FIELDS)]
+
+    def test_export_unknown_format_returns_422(self, client):
+        resp = client.get("/api/campaigns/export", params={"format": "xml"})
+        assert resp.status_code == 422
+
+
+class TestBulkCreateCampaigns:
+    def test_bulk_create_returns_ids_and_item_errors(self, client):
+        payload = [
+            {**VALID_CAMPAIGN, "name": "One"},
+            {**VALID_CAMPAIGN, "name": ""},
+            {**VALID_CAMPAIGN, "name": "Three"},
+        ]
+        resp = client.post("/api/campaigns/bulk", json=payload)
+        assert resp.status_code == 201
+        body = resp.json()
+        assert len(body["created_ids"]) == 2
+        assert [e["index"] for e in body["errors"]] == [1]
+        assert body["errors"][0]["errors"][0]["loc"] == ["name"]
+        assert len(client.get("/api/campaigns").json()) == 2
+
+    def test_bulk_create_honours_batch_size(self, client):
+        payload = [{**VALID_CAMPAIGN, "name": f"C{i}"} for i in range(5)]
+        resp = client.post("/api/campaigns/bulk", params={"batch_size": 2}, json=payload)
+        assert resp.status_code == 201
+        assert len(resp.json()["created_ids"]) == 5
+
+    def test_bulk_create_reports_non_object_items_by_index(self, client):
+        payload = [{**VALID_CAMPAIGN, "name": "One"}, "garbage", None]
+        resp = client.post("/api/campaigns/bulk", json=payload)
+        assert resp.status_code == 201
+        body = resp.json()
+        assert len(body["created_ids"]) == 1
+        assert [e["index"] for e in body["errors"]] == [1, 2]
+        assert body["errors"][0]["errors"][0]["type"] == "model_type"
+
+    def test_bulk_create_requires_a_list(self, client):
+        resp = client.post("/api/campaigns/bulk", json=VALID_CAMPAIGN)
+        assert resp.status_code == 422
+
+
+class TestSearchCampaigns:
+    def test_q_filters_list(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "Black Friday"})
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "Cyber Monday"})
+        resp = client.get("/api/campaigns", params={"q": "friday"})
+        assert resp.status_code == 200
+        assert [c["name"] for c in resp.json()] == ["Black Friday"]
+
+    def test_q_applies_to_export(self, client):
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "Black Friday"})
+        _create_campaign(client, {**VALID_CAMPAIGN, "name": "Cyber Monday"})
+        resp = client.get("/api/campaigns/export", params={"q": "cyber"})
+        assert [json.loads(line)["name"] for line in resp.text.splitlines()] == ["Cyber Monday"]
+
+
+class TestSparseFieldsets:
+    def test_list_returns_only_requested_fields(self, client):
+        _create_campaign(client)
+        resp = client.get("/api/campaigns", params={"fields": "name,budget"})
+        assert resp.status_code == 200
+        assert resp.json() == [{"id": 1, "name": "Test Campaign", "budget": 1000.0}]
+
+    def test_fields_combine_with_pagination(self, client):
+        for i in range(3):
+            _create_campaign(client, {**VALID_CAMPAIGN, "name": f"C{i}"})
+        resp = client.get("/api/campaigns", params={"fields": "name", "limit": 2})
+        assert [c["name"] for c in resp.json()] == ["C0", "C1"]
+        assert "X-Next-Cursor" in resp.headers
+
+    def test_get_single_with_fields(self, client):
+        created = _create_campaign(client).json()
+        resp = client.get(f"/api/campaigns/{created['id']}", params={"fields": "start_date"})
+        assert resp.json() == {"id": created["id"], "start_date": "2025-01-01"}
+
+    def test_unknown_field_returns_400(self, client):
+        resp = client.get("/api/campaigns", params={"fields": "name,password"})
+        assert resp.status_code == 400
+        assert "password" in resp.json()["detail"]
+
+
+class TestConditionalGet:
+    def test_list_sets_etag_and_answers_304(self, client):
+        _create_campaign(client)
+        first = client.get("/api/campaigns")
+        etag = first.headers["ETag"]
+        resp = client.get("/api/campaigns", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etag
+        assert resp.content == b""
+
+    def test_write_invalidates_etag(self, client):
+        created = _create_campaign(client).json()
+        etag = client.get("/api/campaigns").headers["ETag"]
+        client.patch(f"/api/campaigns/{created['id']}", json={"budget": 1})
+        resp = client.get("/api/campaigns", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    def test_etag_differs_per_query(self, client):
+        _create_campaign(client)
+        a = client.get("/api/campaigns", params={"status": "draft"}).headers["ETag"]
+        b = client.get("/api/campaigns", params={"status": "active"}).headers["ETag"]
+        assert a != b
+
+    def test_sparse_and_single_responses_carry_etag(self, client):
+        created = _create_campaign(client).json()
+        sparse = client.get("/api/campaigns", params={"fields": "name"})
+        single = client.get(f"/api/campaigns/{created['id']}", params={"fields": "name"})
+        assert "ETag" in sparse.headers
+        resp = client.get(
+            f"/api/campaigns/{created['id']}",
+            params={"fields": "name"},
+            headers={"If-None-Match": single.headers["ETag"]},
+        )
+        assert resp.status_code == 304
+
+
+    def test_sparse_responses_keep_cache_control(self, client):
+        created = _create_campaign(client).json()
+        for path in ("/api/campaigns", f"/api/campaigns/{created['id']}"):
+            resp = client.get(path, params={"fields": "name", "limit": 1})
+            assert resp.headers["Cache-Control"] == "no-cache"
+            assert "ETag" in resp.headers
+
+class TestCampaignNews:
+    def test_fans_out_over_active_campaigns(self, client, monkeypatch):
+        client.post("/api/campaigns", json={**VALID_CAMPAIGN, "name": "Alpha", "status": "active"})
+        client.post("/api/campaigns", json={**VALID_CAMPAIGN, "name": "Beta", "status": "paused"})
+        seen = []
+
+        async def fake_get_news(keyword=None):
+            seen.append(keyword)
+            article = NewsArticle(
+                title=keyword, description=None, source="S",
+                url=f"https://x/{keyword}", published_at="",
+            )
+            return news_service.CachedNews([article], 0.0)
+
+        monkeypatch.setattr(news_service, "get_news", fake_get_news)
+        resp = client.get("/api/campaigns/news")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert seen == ["Alpha"]
+        assert body["campaigns"][0]["status"] == "ok"
+        assert body["articles"][0]["url"] == "https://x/Alpha"
+
+    def test_by_category_and_limit_validation(self, client, monkeypatch):
+        client.post("/api/campaigns", json={**VALID_CAMPAIGN, "status": "active"})
+        seen = []
+
+        async def fake_get_news(keyword=None):
+            seen.append(keyword)
+            return news_service.CachedNews([], 0.0)
+
+        monkeypatch.setattr(news_service, "get_news", fake_get_news)
+        assert client.get("/api/campaigns/news", params={"by": "category"}).status_code == 200
+        assert seen == [VALID_CAMPAIGN["category"]]
+        assert client.get("/api/campaigns/news", params={"limit": 0}).status_code == 422
+
+    def test_cursor_reaches_every_active_campaign(self, client, monkeypatch):
+        for name in ("A", "B", "C"):
+            client.post("/api/campaigns", json={**VALID_CAMPAIGN, "name": name, "status": "active"})
+        seen = []
+
+        async def fake_get_news(keyword=None):
+            seen.append(keyword)
+            return news_service.CachedNews([], 0.0)
+
+        monkeypatch.setattr(news_service, "get_news", fake_get_news)
+        first = client.get("/api/campaigns/news", params={"limit": 2})
+        cursor = first.headers["X-Next-Cursor"]
+        last = client.get("/api/campaigns/news", params={"limit": 2, "cursor": cursor})
+        assert seen == ["A", "B", "C"]
+        assert "X-Next-Cursor" not in last.headers
+        assert client.get("/api/campaigns/news", params={"cursor": "bad"}).status_code == 400
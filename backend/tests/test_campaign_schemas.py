@@ -3,7 +3,13 @@ from datetime import date, datetime
 import pytest
 from pydantic import ValidationError
 
-from app.schemas.campaign import CampaignBase, CampaignCreate, CampaignResponse, CampaignUpdate
+from app.schemas.campaign import (
+    CampaignBase,
+    CampaignCreate,
+    CampaignPatch,
+    CampaignResponse,
+    CampaignUpdate,
+)
 
 
 class TestCampaignBase:
@@ -132,3 +138,26 @@ class TestCampaignResponse:
         assert resp.id == 1
         assert resp.name == "Campaign"
         assert resp.created_at == datetime(2025, 1, 1, 0, 0, 0)
+
+
+class TestCampaignPatch:
+    def test_tracks_only_supplied_fields(self):
+        patch = CampaignPatch(budget=50.0)
+        assert patch.model_dump(exclude_unset=True) == {"budget": 50.0}
+
+    def test_empty_patch_is_valid(self):
+        assert CampaignPatch().model_dump(exclude_unset=True) == {}
+
+    def test_explicit_null_rejected(self):
+        with pytest.raises(ValidationError):
+            CampaignPatch(name=None)
+
+    def test_field_constraints_still_apply(self):
+        with pytest.raises(ValidationError):
+            CampaignPatch(budget=-1.0)
+        with pytest.raises(ValidationError):
+            CampaignPatch(status="archived")
+
+    def test_both_dates_validated_together(self):
+        with pytest.raises(ValidationError):
+            CampaignPatch(start_date=date(2025, 6, 1), end_date=date(2025, 1, 1))
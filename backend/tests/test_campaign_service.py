@@ -1,15 +1,30 @@
+import json
 from datetime import date
 
 import pytest
 
-from app.schemas.campaign import CampaignCreate, CampaignUpdate
+from app.schemas.campaign import (
+    CampaignCreate,
+    CampaignFilters,
+    CampaignPatch,
+    CampaignUpdate,
+)
 from app.services.campaign_service import (
+    bulk_create_campaigns,
     create_campaign,
+    decode_cursor,
     delete_campaign,
+    encode_cursor,
+    export_statement,
     get_campaign,
+    get_campaign_page,
+    get_change_version,
     get_campaigns,
+    parse_fields,
+    patch_campaign,
     update_campaign,
 )
+from app.services.export_service import stream_export
 
 
 def _make_campaign_data(**overrides) -> CampaignCreate:
@@ -58,17 +73,39 @@ class TestGetCampaigns:
     def test_filter_by_status(self, db):
         create_campaign(db, _make_campaign_data(status="active"))
         create_campaign(db, _make_campaign_data(status="draft"))
-        result = get_campaigns(db, status="active")
+        result = get_campaigns(db, filters=CampaignFilters(status="active"))
         assert len(result) == 1
         assert result[0].status == "active"
 
     def test_filter_by_category(self, db):
         create_campaign(db, _make_campaign_data(category="sales"))
         create_campaign(db, _make_campaign_data(category="engagement"))
-        result = get_campaigns(db, category="sales")
+        result = get_campaigns(db, filters=CampaignFilters(category="sales"))
         assert len(result) == 1
         assert result[0].category == "sales"
 
+    def test_filter_by_platform(self, db):
+        create_campaign(db, _make_campaign_data(platform="email"))
+        create_campaign(db, _make_campaign_data(platform="google"))
+        result = get_campaigns(db, filters=CampaignFilters(platform="email"))
+        assert [c.platform for c in result] == ["email"]
+
+    def test_filter_by_active_window_overlap(self, db):
+        create_campaign(db, _make_campaign_data(
+            name="Q1", start_date=date(2025, 1, 1), end_date=date(2025, 3, 31)
+        ))
+        create_campaign(db, _make_campaign_data(
+            name="Q3", start_date=date(2025, 7, 1), end_date=date(2025, 9, 30)
+        ))
+        overlapping = get_campaigns(db, filters=CampaignFilters(
+            active_from=date(2025, 3, 31), active_to=date(2025, 6, 30)
+        ))
+        assert [c.name for c in overlapping] == ["Q1"]
+        later = CampaignFilters(active_from=date(2025, 4, 1))
+        earlier = CampaignFilters(active_to=date(2025, 6, 30))
+        assert [c.name for c in get_campaigns(db, filters=later)] == ["Q3"]
+        assert [c.name for c in get_campaigns(db, filters=earlier)] == ["Q1"]
+
     def test_sort_by_budget_asc(self, db):
         create_campaign(db, _make_campaign_data(name="Expensive", budget=5000))
         create_campaign(db, _make_campaign_data(name="Cheap", budget=100))
@@ -154,3 +191,268 @@ class TestDeleteCampaign:
     def test_returns_false_for_nonexistent_id(self, db):
         result = delete_campaign(db, 99999)
         assert result is False
+
+
+class TestGetCampaignPage:
+    """Keyset pagination over the campaign list."""
+
+    def _collect_pages(self, db, **kwargs):
+        seen, cursor = [], None
+        while True:
+            page, cursor = get_campaign_page(db, cursor=cursor, **kwargs)
+            seen.extend(page)
+            if cursor is None:
+                return seen
+
+    def test_pages_cover_every_campaign_once(self, db):
+        for i in range(7):
+            create_campaign(db, _make_campaign_data(name=f"C{i}"))
+        seen = self._collect_pages(db, limit=3)
+        assert [c.name for c in seen] == [f"C{i}" for i in range(7)]
+
+    def test_last_page_has_no_cursor(self, db):
+        create_campaign(db, _make_campaign_data())
+        page, cursor = get_campaign_page(db, limit=5)
+        assert len(page) == 1
+        assert cursor is None
+
+    def test_pages_follow_sort_with_duplicate_keys(self, db):
+        for budget in (500, 100, 500, 900, 100, 500):
+            create_campaign(db, _make_campaign_data(budget=budget))
+        seen = self._collect_pages(db, limit=2, sort_by="budget", sort_order="desc")
+        assert [c.budget for c in seen] == [900, 500, 500, 500, 100, 100]
+        assert len({c.id for c in seen}) == 6
+
+    def test_pages_by_start_date_respect_filters(self, db):
+        for month in (5, 1, 3):
+            create_campaign(db, _make_campaign_data(
+                status="active", start_date=date(2025, month, 1)
+            ))
+        create_campaign(db, _make_campaign_data(status="draft"))
+        seen = self._collect_pages(
+            db, limit=1, sort_by="start_date", filters=CampaignFilters(status="active")
+        )
+        assert [c.start_date.month for c in seen] == [1, 3, 5]
+
+    def test_cursor_round_trip(self, db):
+        created = create_campaign(db, _make_campaign_data(start_date=date(2025, 2, 3)))
+        cursor = encode_cursor(created, "start_date")
+        assert decode_cursor(cursor, "start_date") == (date(2025, 2, 3), created.id)
+
+    def test_malformed_cursor_rejected(self, db):
+        with pytest.raises(ValueError):
+            get_campaign_page(db, limit=10, cursor="not-a-cursor")
+
+    def test_cursor_for_other_sort_rejected(self, db):
+        created = create_campaign(db, _make_campaign_data())
+        cursor = encode_cursor(created)
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "budget")
+
+
+class TestExportStatement:
+    def _export(self, db, **kwargs):
+        stmt = export_statement(db.get_bind().dialect.name, **kwargs)
+        return list(stream_export(db, stmt, "ndjson"))
+
+    def test_yields_every_row_across_batches(self, db):
+        for i in range(5):
+            create_campaign(db, _make_campaign_data(name=f"C{i}"))
+        chunks = self._export(db, batch_size=2)
+        assert len(chunks) == 3
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert [r["name"] for r in rows] == [f"C{i}" for i in range(5)]
+
+    def test_rows_are_not_tracked_by_session(self, db):
+        create_campaign(db, _make_campaign_data())
+        db.expunge_all()
+        self._export(db)
+        assert len(db.identity_map) == 0
+
+
+class TestBulkCreateCampaigns:
+    def _item(self, **overrides):
+        return _make_campaign_data(**overrides).model_dump(mode="json")
+
+    def test_inserts_all_valid_items_in_order(self, db):
+        items = [self._item(name=f"C{i}") for i in range(5)]
+        result = bulk_create_campaigns(db, items, batch_size=2)
+        assert len(result.created_ids) == 5
+        assert result.errors == []
+        names = [get_campaign(db, cid).name for cid in result.created_ids]
+        assert names == [f"C{i}" for i in range(5)]
+
+    def test_reports_invalid_items_by_index(self, db):
+        items = [
+            self._item(name="Good"),
+            {**self._item(), "budget": -1},
+            {**self._item(), "start_date": "2025-06-01", "end_date": "2025-01-01"},
+            self._item(name="Also good"),
+        ]
+        result = bulk_create_campaigns(db, items)
+        assert len(result.created_ids) == 2
+        assert [e.index for e in result.errors] == [1, 2]
+        assert result.errors[0].errors[0]["loc"] == ("budget",)
+        assert len(get_campaigns(db)) == 2
+
+    def test_empty_batch_creates_nothing(self, db):
+        result = bulk_create_campaigns(db, [])
+        assert result.created_ids == []
+        assert get_campaigns(db) == []
+
+
+class TestSingleStatementWrites:
+    """Update and delete each issue one statement: no SELECT, no refresh."""
+
+    def test_update_uses_update_returning_only(self, db, statements):
+        created = create_campaign(db, _make_campaign_data())
+        statements.clear()
+        updated = update_campaign(db, created.id, CampaignUpdate(
+            name="Renamed", start_date=date(2025, 1, 1), end_date=date(2025, 12, 31)
+        ))
+        assert updated.name == "Renamed"
+        assert updated.updated_at is not None
+        assert [sql.split()[0] for sql in statements] == ["UPDATE"]
+
+    def test_delete_uses_delete_returning_only(self, db, statements):
+        created = create_campaign(db, _make_campaign_data())
+        statements.clear()
+        assert delete_campaign(db, created.id) is True
+        assert [sql.split()[0] for sql in statements] == ["DELETE"]
+
+
+class TestPatchCampaign:
+    def test_writes_only_supplied_fields(self, db):
+        created = create_campaign(db, _make_campaign_data(description="Keep me"))
+        patched = patch_campaign(db, created.id, CampaignPatch(status="active"))
+        assert patched.status == "active"
+        assert patched.description == "Keep me"
+        assert patched.name == "Test Campaign"
+
+    def test_single_date_checked_against_stored_value(self, db):
+        created = create_campaign(db, _make_campaign_data(
+            start_date=date(2025, 1, 1), end_date=date(2025, 3, 1)
+        ))
+        with pytest.raises(ValueError):
+            patch_campaign(db, created.id, CampaignPatch(start_date=date(2025, 4, 1)))
+        with pytest.raises(ValueError):
+            patch_campaign(db, created.id, CampaignPatch(end_date=date(2024, 12, 1)))
+        assert get_campaign(db, created.id).start_date == date(2025, 1, 1)
+
+        patched = patch_campaign(db, created.id, CampaignPatch(end_date=date(2025, 9, 1)))
+        assert patched.end_date == date(2025, 9, 1)
+
+    def test_returns_none_for_nonexistent_id(self, db):
+        assert patch_campaign(db, 99999, CampaignPatch(name="X")) is None
+        assert patch_campaign(db, 99999, CampaignPatch(start_date=date(2025, 1, 1))) is None
+
+    def test_empty_patch_returns_current_row(self, db):
+        created = create_campaign(db, _make_campaign_data())
+        assert patch_campaign(db, created.id, CampaignPatch()).id == created.id
+
+
+class TestSearchCampaigns:
+    """Full-text search over name and description."""
+
+    def test_matches_name_and_description(self, db):
+        create_campaign(db, _make_campaign_data(name="Summer Sale", description=""))
+        create_campaign(db, _make_campaign_data(name="Q3", description="Big summer push"))
+        create_campaign(db, _make_campaign_data(name="Winter", description="Holiday"))
+        result = get_campaigns(db, q="summer")
+        assert {c.name for c in result} == {"Summer Sale", "Q3"}
+
+    def test_all_words_must_match_and_last_is_prefix(self, db):
+        create_campaign(db, _make_campaign_data(name="Spring launch webinar"))
+        create_campaign(db, _make_campaign_data(name="Spring sale"))
+        assert [c.name for c in get_campaigns(db, q="spring web")] == ["Spring launch webinar"]
+
+    def test_index_follows_updates_and_deletes(self, db):
+        created = create_campaign(db, _make_campaign_data(name="Alpha"))
+        patch_campaign(db, created.id, CampaignPatch(name="Beta"))
+        assert get_campaigns(db, q="alpha") == []
+        assert [c.id for c in get_campaigns(db, q="beta")] == [created.id]
+        delete_campaign(db, created.id)
+        assert get_campaigns(db, q="beta") == []
+
+    def test_orders_by_relevance_and_sets_rank(self, db):
+        create_campaign(db, _make_campaign_data(name="Other", description="mentions email once"))
+        create_campaign(db, _make_campaign_data(name="Email email", description="email"))
+        result = get_campaigns(db, q="email")
+        assert result[0].name == "Email email"
+        assert all(c.search_rank is not None for c in result)
+
+    def test_explicit_sort_overrides_relevance(self, db):
+        create_campaign(db, _make_campaign_data(name="Promo", budget=900))
+        create_campaign(db, _make_campaign_data(name="Promo", budget=100))
+        result = get_campaigns(db, q="promo", sort_by="budget")
+        assert [c.budget for c in result] == [100, 900]
+
+    def test_paginates_over_relevance(self, db):
+        for i in range(5):
+            create_campaign(db, _make_campaign_data(name=f"Launch {i}"))
+        seen, cursor = [], None
+        while True:
+            page, cursor = get_campaign_page(db, limit=2, cursor=cursor, q="launch")
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert len({c.id for c in seen}) == 5
+
+    def test_syntax_characters_are_not_interpreted(self, db):
+        create_campaign(db, _make_campaign_data(name="AND OR NOT"))
+        assert len(get_campaigns(db, q='"AND" (OR) NOT*')) == 1
+        assert get_campaigns(db, q="!!!") == []
+
+
+class TestSparseFieldsets:
+    def test_parse_fields_always_includes_id(self):
+        assert parse_fields("name, status") == ["id", "name", "status"]
+        assert parse_fields(None) is None
+
+    def test_parse_fields_rejects_unknown_names(self):
+        with pytest.raises(ValueError, match="secret"):
+            parse_fields("name,secret")
+
+    def test_selects_only_requested_columns(self, db, statements):
+        create_campaign(db, _make_campaign_data(name="A"))
+        statements.clear()
+        rows = get_campaigns(db, fields=["id", "name"])
+        assert [r.name for r in rows] == ["A"]
+        assert set(rows[0]._fields) == {"id", "name"}
+        assert "description" not in statements[0]
+
+    def test_pages_by_sort_key_outside_fieldset(self, db):
+        for budget in (300, 100, 200):
+            create_campaign(db, _make_campaign_data(budget=budget))
+        page, cursor = get_campaign_page(db, limit=2, sort_by="budget", fields=["id"])
+        page2, _ = get_campaign_page(db, limit=2, sort_by="budget", fields=["id"], cursor=cursor)
+        assert [r.budget for r in page + page2] == [100, 200, 300]
+
+    def test_search_with_fieldset(self, db):
+        create_campaign(db, _make_campaign_data(name="Retarget"))
+        rows = get_campaigns(db, q="retarget", fields=["id", "name"])
+        assert rows[0].name == "Retarget"
+        assert rows[0].search_rank is not None
+
+    def test_get_campaign_with_fieldset(self, db):
+        created = create_campaign(db, _make_campaign_data())
+        row = get_campaign(db, created.id, fields=["id", "status"])
+        assert tuple(row) == (created.id, "draft")
+
+
+class TestChangeVersion:
+    def test_every_write_bumps_version(self, db):
+        v0 = get_change_version(db)
+        created = create_campaign(db, _make_campaign_data())
+        v1 = get_change_version(db)
+        patch_campaign(db, created.id, CampaignPatch(budget=5.0))
+        v2 = get_change_version(db)
+        delete_campaign(db, created.id)
+        v3 = get_change_version(db)
+        assert v0 < v1 < v2 < v3
+
+    def test_reads_do_not_bump_version(self, db):
+        create_campaign(db, _make_campaign_data())
+        before = get_change_version(db)
+        get_campaigns(db)
+        assert get_change_version(db) == before
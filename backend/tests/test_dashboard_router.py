@@ -0,0 +1,258 @@
+"""Tests for the dashboard router endpoints."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.database import get_db
+from app.routers.campaigns import router as campaigns_router
+from app.routers.dashboard import router as dashboard_router
+from app.routers.dashboard import stream_overview
+from app.schemas.campaign import CampaignFilters
+from app.services.dashboard_snapshot import dashboard_snapshots
+
+VALID_CAMPAIGN = {
+    "name": "Test Campaign",
+    "status": "active",
+    "budget": 1000.0,
+    "start_date": "2025-01-01",
+    "end_date": "2025-06-30",
+    "platform": "facebook",
+    "category": "sales",
+}
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(campaigns_router)
+    app.include_router(dashboard_router)
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as c:
+        yield c
+
+
+class TestDashboardEndpoints:
+    @pytest.mark.parametrize("path", [
+        "/api/dashboard/summary",
+        "/api/dashboard/status-distribution",
+        "/api/dashboard/budget-by-category",
+        "/api/dashboard/campaigns-over-time",
+    ])
+    def test_endpoint_returns_200(self, client, path):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        assert client.get(path).status_code == 200
+
+    def test_summary_reflects_campaigns(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        body = client.get("/api/dashboard/summary").json()
+        assert body["total_campaigns"] == 1
+        assert body["active_campaigns"] == 1
+
+
+class TestDashboardConditionalGet:
+    def test_outside_write_changes_body_with_etag(self, client, db):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        stale = client.get("/api/dashboard/summary")
+        db.execute(text(
+            "INSERT INTO campaigns (name, status, budget, start_date, end_date, platform, category) "
+            "VALUES ('Raw', 'draft', 10, '2025-01-01', '2025-02-01', 'other', 'other')"
+        ))
+        db.commit()
+
+        resp = client.get(
+            "/api/dashboard/summary", headers={"If-None-Match": stale.headers["ETag"]}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["total_campaigns"] == 2
+
+    @pytest.mark.parametrize("path", ["summary", "pivot", "pacing"])
+    def test_cache_hit_reads_the_version_once(self, client, statements, path):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        client.get(f"/api/dashboard/{path}")
+        statements.clear()
+        assert client.get(f"/api/dashboard/{path}").status_code == 200
+        # Only conditional_get's lookup; the cache reuses that version.
+        assert len(statements) == 1
+        assert "table_versions" in statements[0]
+
+    def test_unchanged_data_returns_304(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        etag = client.get("/api/dashboard/summary").headers["ETag"]
+        resp = client.get("/api/dashboard/summary", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_campaign_write_changes_etag(self, client):
+        etag = client.get("/api/dashboard/summary").headers["ETag"]
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        resp = client.get("/api/dashboard/summary", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["total_campaigns"] == 1
+
+    def test_wildcard_and_list_forms_match(self, client):
+        etag = client.get("/api/dashboard/summary").headers["ETag"]
+        for header in ("*", f'"other", W/{etag}'):
+            resp = client.get("/api/dashboard/summary", headers={"If-None-Match": header})
+            assert resp.status_code == 304
+
+
+class TestDashboardOverview:
+    def test_overview_combines_all_aggregates(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        client.post("/api/campaigns", json={**VALID_CAMPAIGN, "status": "draft"})
+        resp = client.get("/api/dashboard/overview")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["summary"] == client.get("/api/dashboard/summary").json()
+        assert body["status_distribution"] == [
+            {"status": "active", "count": 1},
+            {"status": "draft", "count": 1},
+        ]
+        assert body["budget_by_category"] == [
+            {"category": "sales", "total_budget": 2000.0}
+        ]
+        assert sum(p["count"] for p in body["campaigns_over_time"]) == 2
+
+    def test_overview_supports_conditional_get(self, client):
+        etag = client.get("/api/dashboard/overview").headers["ETag"]
+        resp = client.get("/api/dashboard/overview", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+
+class TestDashboardCacheStats:
+    def test_reports_hits_and_misses(self, client):
+        before = client.get("/api/dashboard/cache-stats").json()
+        client.get("/api/dashboard/summary")
+        client.get("/api/dashboard/summary")
+        after = client.get("/api/dashboard/cache-stats").json()
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+        assert after["size"] == 1
+
+
+class TestCampaignsOverTimeParams:
+    def test_granularity_and_fill(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        resp = client.get(
+            "/api/dashboard/campaigns-over-time",
+            params={"granularity": "month", "fill": "true"},
+        )
+        assert resp.status_code == 200
+        assert len(resp.json()) == 1
+        assert resp.json()[0]["date"].endswith("-01")
+
+    def test_invalid_granularity_rejected(self, client):
+        resp = client.get("/api/dashboard/campaigns-over-time?granularity=year")
+        assert resp.status_code == 422
+
+    def test_inverted_range_returns_400(self, client):
+        resp = client.get(
+            "/api/dashboard/campaigns-over-time?from=2025-02-01&to=2025-01-01"
+        )
+        assert resp.status_code == 400
+
+
+class TestPacingEndpoint:
+    def test_returns_columnar_series(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        resp = client.get("/api/dashboard/pacing", params={"granularity": "month"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["dates"][0] == "2025-01-01"
+        assert len(body["series"]["facebook"]) == len(body["dates"]) == 6
+        assert sum(body["total"]) == pytest.approx(1000.0, abs=0.05)
+
+    def test_invalid_window_returns_400(self, client):
+        resp = client.get("/api/dashboard/pacing?from=2025-02-01&to=2025-01-01")
+        assert resp.status_code == 400
+
+
+class TestPivotEndpoint:
+    def test_pivot_by_platform(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        resp = client.get(
+            "/api/dashboard/pivot", params={"dimensions": "platform", "measures": "count,max"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["columns"] == {
+            "platform": ["facebook"], "count": [1], "max": [1000.0],
+        }
+
+    def test_defaults_to_count_and_sum_total(self, client):
+        body = client.get("/api/dashboard/pivot").json()
+        assert body["measures"] == ["count", "sum"]
+        assert body["columns"] == {"count": [0], "sum": [0.0]}
+
+    def test_unknown_dimension_returns_400(self, client):
+        assert client.get("/api/dashboard/pivot?dimensions=name").status_code == 400
+
+    def test_empty_measure_list_uses_defaults(self, client):
+        resp = client.get("/api/dashboard/pivot?measures=,")
+        assert resp.status_code == 200
+        assert resp.json()["measures"] == ["count", "sum"]
+
+
+class TestDashboardFilters:
+    def test_every_endpoint_accepts_filters(self, client):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        client.post("/api/campaigns", json={**VALID_CAMPAIGN, "platform": "email"})
+        params = {"platform": "email", "active_from": "2025-03-01"}
+        for path in (
+            "overview", "summary", "status-distribution", "budget-by-category",
+            "campaigns-over-time", "pacing", "pivot",
+        ):
+            assert client.get(f"/api/dashboard/{path}", params=params).status_code == 200
+        summary = client.get("/api/dashboard/summary", params=params).json()
+        assert summary["total_campaigns"] == 1
+
+    def test_inverted_window_returns_422(self, client):
+        resp = client.get(
+            "/api/dashboard/summary",
+            params={"active_from": "2025-06-01", "active_to": "2025-01-01"},
+        )
+        assert resp.status_code == 422
+
+
+class TestDashboardStream:
+    @pytest.mark.asyncio
+    async def test_stream_starts_with_snapshot(self, db):
+        response = await stream_overview(filters=CampaignFilters(), db=db)
+        assert response.media_type == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        first = await response.body_iterator.__anext__()
+        assert first.startswith("event: snapshot\n")
+        await response.body_iterator.aclose()
+
+
+class TestDashboardSnapshot:
+    def test_current_snapshot_answers_unfiltered_reads(self, client, db):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        dashboard_snapshots.refresh(db)
+
+        resp = client.get("/api/dashboard/summary")
+        assert resp.headers["Age"] == "0"
+        assert resp.json()["total_campaigns"] == 1
+        assert client.get("/api/dashboard/overview").headers["Age"] == "0"
+
+    def test_snapshot_behind_the_change_version_is_not_served(self, client, db):
+        dashboard_snapshots.refresh(db)
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+
+        resp = client.get("/api/dashboard/summary")
+        assert "Age" not in resp.headers
+        assert resp.json()["total_campaigns"] == 1
+
+    def test_client_can_require_live_data(self, client, db):
+        dashboard_snapshots.refresh(db)
+
+        resp = client.get("/api/dashboard/summary", headers={"Cache-Control": "no-cache"})
+        assert "Age" not in resp.headers
+
+    def test_filtered_requests_bypass_snapshot(self, client, db):
+        client.post("/api/campaigns", json=VALID_CAMPAIGN)
+        dashboard_snapshots.refresh(db)
+
+        resp = client.get("/api/dashboard/summary", params={"status": "active"})
+        assert "Age" not in resp.headers
+        assert resp.json()["total_campaigns"] == 1
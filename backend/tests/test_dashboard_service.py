@@ -1,17 +1,35 @@
-from datetime import date
+from datetime import date, datetime, time
 
 import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql
 
-from app.schemas.campaign import CampaignCreate
-from app.services.campaign_service import create_campaign
+from app.cache import dashboard_cache
+from app.models.campaign import Campaign
+from app.schemas.campaign import CampaignCreate, CampaignFilters, CampaignPatch
+from app.services.campaign_service import (
+    create_campaign,
+    delete_campaign,
+    patch_campaign,
+)
 from app.services.dashboard_service import (
+    PIVOT_DIMENSIONS,
+    PIVOT_MEASURES,
     get_budget_by_category,
     get_campaigns_over_time,
+    get_overview,
+    get_pivot,
     get_status_distribution,
     get_summary,
+    parse_pivot_names,
 )
 
 
+def _aggregate_queries(statements):
+    """Captured SQL minus the change-version lookups made by the cache."""
+    return [sql for sql in statements if "FROM table_versions" not in sql]
+
+
 def _make_campaign(**overrides) -> CampaignCreate:
     defaults = {
         "name": "Test Campaign",
@@ -123,3 +141,285 @@ class TestGetCampaignsOverTime:
         # Should be a date string like "2025-01-15"
         assert isinstance(result[0].date, str)
         assert len(result[0].date) == 10  # YYYY-MM-DD format
+
+
+class TestGetOverview:
+    def test_empty_database(self, db):
+        overview = get_overview(db)
+        assert overview.summary.total_campaigns == 0
+        assert overview.summary.average_budget == 0.0
+        assert overview.status_distribution == []
+        assert overview.budget_by_category == []
+        assert overview.campaigns_over_time == []
+
+    def test_matches_individual_aggregates(self, db):
+        create_campaign(db, _make_campaign(name="A", status="active", budget=500.0))
+        create_campaign(db, _make_campaign(name="B", status="active", category="engagement"))
+        create_campaign(db, _make_campaign(name="C", status="paused", budget=250.0))
+
+        overview = get_overview(db)
+        assert overview.summary == get_summary(db)
+        assert overview.status_distribution == sorted(
+            get_status_distribution(db), key=lambda r: r.status
+        )
+        assert overview.budget_by_category == sorted(
+            get_budget_by_category(db), key=lambda r: r.category
+        )
+        assert overview.campaigns_over_time == get_campaigns_over_time(db)
+
+    def test_issues_a_single_query(self, db, statements):
+        create_campaign(db, _make_campaign(name="A"))
+        statements.clear()
+        get_overview(db)
+        assert len(_aggregate_queries(statements)) == 1
+
+    def test_postgres_uses_grouping_sets(self, db):
+        captured = []
+
+        class _Bind:
+            dialect = postgresql.dialect()
+
+        class _Session:
+            def get_bind(self):
+                return _Bind()
+
+            def execute(self, stmt):
+                captured.append(str(stmt.compile(dialect=_Bind.dialect)))
+                return []
+
+        # Unwrapped: the cache would look up the change version first.
+        overview = get_overview.__wrapped__(_Session())
+        assert "GROUPING SETS" in captured[0]
+        assert overview.summary.total_campaigns == 0
+
+
+class TestDashboardCache:
+    def test_repeated_reads_are_served_from_cache(self, db, statements):
+        create_campaign(db, _make_campaign(name="A"))
+        get_summary(db)
+        statements.clear()
+        hits = dashboard_cache.hits
+        assert get_summary(db).total_campaigns == 1
+        # Only the change-version lookup the cache key is built from.
+        assert len(statements) == 1
+        assert "table_versions" in statements[0]
+        assert dashboard_cache.hits == hits + 1
+
+    def test_writes_from_outside_the_process_are_seen(self, db):
+        create_campaign(db, _make_campaign(name="A"))
+        assert get_summary(db).total_campaigns == 1
+        # Raw SQL, as another worker would: the triggers bump the version but
+        # this process never clears its cache.
+        db.execute(insert(Campaign).values(
+            name="B", status="draft", budget=10.0, platform="other", category="other",
+            start_date=date(2025, 1, 1), end_date=date(2025, 2, 1),
+        ))
+        db.commit()
+        assert get_summary(db).total_campaigns == 2
+
+    @pytest.mark.parametrize("write", ["create", "patch", "delete"])
+    def test_campaign_writes_invalidate(self, db, write):
+        created = create_campaign(db, _make_campaign(name="A", status="active"))
+        assert get_summary(db).active_campaigns == 1
+        if write == "create":
+            create_campaign(db, _make_campaign(name="B", status="active"))
+            expected = 2
+        elif write == "patch":
+            patch_campaign(db, created.id, CampaignPatch(status="paused"))
+            expected = 0
+        else:
+            delete_campaign(db, created.id)
+            expected = 0
+        assert get_summary(db).active_campaigns == expected
+
+
+class TestCampaignsOverTimeBuckets:
+    @pytest.fixture
+    def history(self, db):
+        """Campaigns created on the given days (rollups follow via triggers)."""
+        days = [
+            date(2025, 1, 6),   # Monday, week of Jan 6
+            date(2025, 1, 12),  # Sunday, same week
+            date(2025, 1, 13),  # Monday, next week
+            date(2025, 3, 31),
+        ]
+        for index, day in enumerate(days):
+            created = create_campaign(db, _make_campaign(name=f"C{index}"))
+            db.execute(
+                update(Campaign)
+                .where(Campaign.id == created.id)
+                .values(created_at=datetime.combine(day, time(12)))
+            )
+        db.commit()
+        dashboard_cache.clear()
+
+    def _points(self, result):
+        return [(p.date, p.count) for p in result]
+
+    def test_day_buckets(self, db, history):
+        assert self._points(get_campaigns_over_time(db)) == [
+            ("2025-01-06", 1), ("2025-01-12", 1), ("2025-01-13", 1), ("2025-03-31", 1),
+        ]
+
+    def test_week_buckets_start_on_monday(self, db, history):
+        assert self._points(get_campaigns_over_time(db, "week")) == [
+            ("2025-01-06", 2), ("2025-01-13", 1), ("2025-03-31", 1),
+        ]
+
+    def test_month_buckets(self, db, history):
+        assert self._points(get_campaigns_over_time(db, "month")) == [
+            ("2025-01-01", 3), ("2025-03-01", 1),
+        ]
+
+    def test_bounds_are_inclusive(self, db, history):
+        result = get_campaigns_over_time(
+            db, date_from=date(2025, 1, 12), date_to=date(2025, 1, 13)
+        )
+        assert self._points(result) == [("2025-01-12", 1), ("2025-01-13", 1)]
+
+    def test_fill_spans_data_when_unbounded(self, db, history):
+        result = get_campaigns_over_time(db, "month", fill=True)
+        assert self._points(result) == [
+            ("2025-01-01", 3), ("2025-02-01", 0), ("2025-03-01", 1),
+        ]
+
+    def test_fill_spans_bounds(self, db, history):
+        result = get_campaigns_over_time(
+            db, "week", date_from=date(2024, 12, 31), date_to=date(2025, 1, 20), fill=True
+        )
+        assert self._points(result) == [
+            ("2024-12-30", 0), ("2025-01-06", 2), ("2025-01-13", 1), ("2025-01-20", 0),
+        ]
+
+    def test_fill_with_bounds_and_no_data(self, db):
+        result = get_campaigns_over_time(
+            db, "month", date_from=date(2025, 11, 15), date_to=date(2026, 1, 1), fill=True
+        )
+        assert self._points(result) == [
+            ("2025-11-01", 0), ("2025-12-01", 0), ("2026-01-01", 0),
+        ]
+
+    def test_inverted_range_rejected(self, db):
+        with pytest.raises(ValueError):
+            get_campaigns_over_time(db, date_from=date(2025, 2, 1), date_to=date(2025, 1, 1))
+
+    def test_fill_is_bounded(self, db):
+        with pytest.raises(ValueError):
+            get_campaigns_over_time(
+                db, date_from=date(1900, 1, 1), date_to=date(2100, 1, 1), fill=True
+            )
+
+
+class TestPivot:
+    @pytest.fixture
+    def campaigns(self, db):
+        create_campaign(db, _make_campaign(name="A", status="active", platform="email", budget=100.0))
+        create_campaign(db, _make_campaign(name="B", status="active", platform="email", budget=300.0))
+        create_campaign(db, _make_campaign(
+            name="C", status="draft", platform="google", budget=50.0,
+            start_date=date(2025, 2, 10),
+        ))
+
+    def test_cross_tab_is_columnar_and_ordered(self, db, campaigns):
+        pivot = get_pivot(db, ("status", "platform"), ("count", "sum", "avg", "min", "max"))
+        assert pivot.row_count == 2
+        assert pivot.columns == {
+            "status": ["active", "draft"],
+            "platform": ["email", "google"],
+            "count": [2, 1],
+            "sum": [400.0, 50.0],
+            "avg": [200.0, 50.0],
+            "min": [100.0, 50.0],
+            "max": [300.0, 50.0],
+        }
+
+    def test_start_month_dimension(self, db, campaigns):
+        pivot = get_pivot(db, ("start_month",), ("count",))
+        assert pivot.columns == {"start_month": ["2025-01", "2025-02"], "count": [2, 1]}
+
+    def test_no_dimensions_is_grand_total(self, db, campaigns):
+        pivot = get_pivot(db, (), ("count", "sum"))
+        assert pivot.columns == {"count": [3], "sum": [450.0]}
+
+    def test_empty_table_grand_total(self, db):
+        pivot = get_pivot(db, (), ("count", "avg"))
+        assert pivot.columns == {"count": [0], "avg": [None]}
+
+    def test_single_group_by_query(self, db, campaigns, statements):
+        statements.clear()
+        get_pivot(db, ("status", "category", "platform", "start_month"), ("count",))
+        queries = _aggregate_queries(statements)
+        assert len(queries) == 1
+        assert "GROUP BY" in queries[0]
+
+
+class TestParsePivotNames:
+    def test_default_when_missing(self):
+        assert parse_pivot_names(None, PIVOT_MEASURES, ("count",)) == ("count",)
+
+    def test_default_when_only_commas(self):
+        assert parse_pivot_names(" , ,", PIVOT_MEASURES, ("count",)) == ("count",)
+
+    def test_keeps_order_and_drops_duplicates(self):
+        assert parse_pivot_names("platform, status,platform", PIVOT_DIMENSIONS) == (
+            "platform", "status",
+        )
+
+    def test_unknown_name_rejected(self):
+        with pytest.raises(ValueError, match="budget"):
+            parse_pivot_names("status,budget", PIVOT_DIMENSIONS)
+
+
+class TestDashboardFilters:
+    @pytest.fixture
+    def campaigns(self, db):
+        create_campaign(db, _make_campaign(
+            name="A", status="active", platform="email", budget=100.0,
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 31),
+        ))
+        create_campaign(db, _make_campaign(
+            name="B", status="active", platform="google", category="engagement",
+            budget=300.0, start_date=date(2025, 6, 1), end_date=date(2025, 6, 30),
+        ))
+        create_campaign(db, _make_campaign(
+            name="C", status="draft", platform="email", budget=50.0,
+            start_date=date(2025, 6, 1), end_date=date(2025, 6, 30),
+        ))
+
+    def test_status_filter_reads_rollups(self, db, campaigns, statements):
+        statements.clear()
+        summary = get_summary(db, CampaignFilters(status="active"))
+        assert (summary.total_campaigns, summary.total_budget) == (2, 400.0)
+        assert "campaign_rollups" in _aggregate_queries(statements)[0]
+
+    def test_platform_filter_aggregates_campaigns(self, db, campaigns, statements):
+        statements.clear()
+        summary = get_summary(db, CampaignFilters(platform="email"))
+        assert (summary.total_campaigns, summary.active_campaigns) == (2, 1)
+        assert "FROM campaigns" in _aggregate_queries(statements)[0]
+
+    def test_active_window_filter(self, db, campaigns):
+        june = CampaignFilters(active_from=date(2025, 6, 15), active_to=date(2025, 7, 1))
+        assert [(r.status, r.count) for r in get_status_distribution(db, june)] == [
+            ("active", 1), ("draft", 1),
+        ]
+        assert [(r.category, r.total_budget) for r in get_budget_by_category(db, june)] == [
+            ("engagement", 300.0), ("sales", 50.0),
+        ]
+
+    def test_filtered_overview_matches_endpoints(self, db, campaigns):
+        filters = CampaignFilters(platform="email")
+        overview = get_overview(db, filters)
+        assert overview.summary == get_summary(db, filters)
+        assert overview.status_distribution == get_status_distribution(db, filters)
+        assert overview.campaigns_over_time == get_campaigns_over_time(db, filters=filters)
+
+    def test_filtered_time_series(self, db, campaigns):
+        result = get_campaigns_over_time(
+            db, "month", filters=CampaignFilters(platform="google")
+        )
+        assert [p.count for p in result] == [1]
+
+    def test_filtered_pivot(self, db, campaigns):
+        pivot = get_pivot(db, ("platform",), ("count",), CampaignFilters(status="active"))
+        assert pivot.columns == {"platform": ["email", "google"], "count": [1, 1]}
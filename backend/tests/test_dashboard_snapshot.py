@@ -0,0 +1,91 @@
+"""Tests for the background dashboard snapshot."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.cache import dashboard_cache
+from app.models.campaign import Campaign
+from app.notifier import ChangeNotifier
+from app.services.dashboard_snapshot import (
+    SnapshotStore,
+    fresh_enough,
+    max_acceptable_age,
+    run_snapshots,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _add_campaign(db, budget=100.0):
+    db.add(Campaign(
+        name="Snap",
+        status="active",
+        budget=budget,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 31),
+        platform="facebook",
+        category="sales",
+    ))
+    db.commit()
+
+
+class TestSnapshotStore:
+    def test_refresh_records_overview_version_and_time(self, db, clock):
+        _add_campaign(db)
+        store = SnapshotStore(timer=clock)
+        assert store.get() is None
+
+        snapshot = store.refresh(db)
+        assert store.get() is snapshot
+        assert snapshot.overview.summary.total_campaigns == 1
+        assert snapshot.version == 1
+        clock.now += 7.5
+        assert store.age(snapshot) == 7.5
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("", None),
+        ("no-store", None),
+        ("no-cache", 0.0),
+        ("max-age=30", 30.0),
+        ("no-transform, Max-Age=5", 5.0),
+        ('max-age="12"', 12.0),
+    ])
+    def test_max_acceptable_age(self, header, expected):
+        assert max_acceptable_age(header) == expected
+
+    def test_fresh_enough(self, db, clock):
+        store = SnapshotStore(timer=clock)
+        snapshot = store.refresh(db)
+        clock.now += 10
+        assert fresh_enough(store, snapshot, None)
+        assert fresh_enough(store, snapshot, "max-age=10")
+        assert not fresh_enough(store, snapshot, "max-age=9")
+        assert not fresh_enough(store, snapshot, "max-age=0")
+        assert not fresh_enough(store, snapshot, "no-cache")
+
+
+@pytest.mark.asyncio
+async def test_run_snapshots_refreshes_after_writes(db):
+    notifier = ChangeNotifier()
+    store = SnapshotStore()
+    task = asyncio.ensure_future(run_snapshots(
+        store, TestingSessionLocal, interval=60, notifier=notifier, coalesce=0
+    ))
+    try:
+        for _ in range(100):
+            if store.get() is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert store.get().overview.summary.total_campaigns == 0
+
+        _add_campaign(db)
+        dashboard_cache.clear()  # as campaign_service does after a write
+        notifier.notify()
+        for _ in range(100):
+            if store.get().overview.summary.total_campaigns == 1:
+                break
+            await asyncio.sleep(0.01)
+        assert store.get().overview.summary.total_campaigns == 1
+    finally:
+        task.cancel()
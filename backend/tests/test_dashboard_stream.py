@@ -0,0 +1,127 @@
+"""Tests for the live dashboard event stream."""
+import asyncio
+import json
+
+import pytest
+
+from app.notifier import ChangeNotifier, campaign_changes
+from app.schemas.campaign import CampaignCreate
+from app.services import campaign_service, dashboard_stream
+
+
+def _parse(frame):
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+class FakeLoad:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_then_delta_of_changed_sections():
+    notifier = ChangeNotifier()
+    load = FakeLoad({"summary": 1, "series": [1]}, {"summary": 2, "series": [1]})
+    events = dashboard_stream.overview_events(load, notifier=notifier, coalesce=0, keepalive=5)
+
+    assert _parse(await events.__anext__()) == (
+        "snapshot", 0, {"summary": 1, "series": [1]}
+    )
+    notifier.notify()
+    assert _parse(await events.__anext__()) == ("delta", 1, {"summary": 2})
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_burst_of_writes_is_one_recompute():
+    notifier = ChangeNotifier()
+    load = FakeLoad({"summary": 1}, {"summary": 4})
+    events = dashboard_stream.overview_events(load, notifier=notifier, coalesce=0.05, keepalive=5)
+    await events.__anext__()
+
+    pending = asyncio.ensure_future(events.__anext__())
+    for _ in range(3):
+        notifier.notify()
+        await asyncio.sleep(0.01)
+    assert _parse(await asyncio.wait_for(pending, 1)) == ("delta", 3, {"summary": 4})
+    assert load.calls == 2
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_keepalive_comment():
+    events = dashboard_stream.overview_events(
+        FakeLoad({}), notifier=ChangeNotifier(), coalesce=0, keepalive=0.01
+    )
+    await events.__anext__()
+    assert await events.__anext__() == ": keepalive\n\n"
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_recompute_sends_nothing():
+    notifier = ChangeNotifier()
+    events = dashboard_stream.overview_events(
+        FakeLoad({"summary": 1}), notifier=notifier, coalesce=0, keepalive=0.05
+    )
+    await events.__anext__()
+    notifier.notify()
+    assert await events.__anext__() == ": keepalive\n\n"
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_keepalive_picks_up_writes_from_other_workers():
+    shared = {"version": 7}
+
+    async def version():
+        return shared["version"]
+
+    load = FakeLoad({"summary": 1}, {"summary": 2})
+    events = dashboard_stream.overview_events(
+        load, version, notifier=ChangeNotifier(), coalesce=0, keepalive=0.01
+    )
+    await events.__anext__()
+    assert await events.__anext__() == ": keepalive\n\n"
+
+    shared["version"] = 8  # bumped by a write this process never saw
+    assert _parse(await events.__anext__()) == ("delta", 0, {"summary": 2})
+    assert await events.__anext__() == ": keepalive\n\n"
+    assert load.calls == 2
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_load_version_releases_the_transaction(db):
+    assert await dashboard_stream.load_version(db) == 0
+    assert not db.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_load_overview_returns_json_ready_sections(db):
+    overview = await dashboard_stream.load_overview(db, None)
+    assert set(overview) == {
+        "summary", "status_distribution", "budget_by_category", "campaigns_over_time"
+    }
+    assert overview["summary"]["total_campaigns"] == 0
+    assert not db.in_transaction()
+
+
+def test_campaign_write_notifies(db):
+    before = campaign_changes.version
+    campaign_service.create_campaign(db, CampaignCreate(
+        name="Streamed",
+        status="active",
+        budget=100.0,
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        platform="facebook",
+        category="sales",
+    ))
+    assert campaign_changes.version == before + 1
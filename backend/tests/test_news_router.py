@@ -7,8 +7,10 @@ import httpx
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app.database import get_db
 from app.routers.news import router as news_router
 from app.schemas.news import NewsArticle
+from app.services import news_store
 
 
 SAMPLE_API_RESPONSE = {
@@ -118,3 +120,49 @@ def test_news_router_included_in_main():
     resp = client.get("/api/news")
     assert resp.status_code != 404
     assert resp.status_code != 405
+
+
+def test_get_news_is_cached_with_age_header():
+    """A second request within the TTL is served from the cache."""
+    mock_response = httpx.Response(200, json=SAMPLE_API_RESPONSE)
+
+    with patch.dict("os.environ", {"NEWS_API_KEY": "test-key"}):
+        with patch("app.services.news_service.httpx.AsyncClient") as mock_client_cls:
+            mock_client = AsyncMock()
+            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            mock_client_cls.return_value = mock_client
+
+            client = TestClient(_make_app())
+            first = client.get("/api/news", params={"keyword": "ai"})
+            second = client.get("/api/news", params={"keyword": "AI"})
+
+            assert first.headers["Age"] == "0"
+            assert second.json() == first.json()
+            assert mock_client.get.call_count == 1
+
+
+def test_get_news_from_local_store(db):
+    news_store.store_articles(db, "ai", [
+        NewsArticle(
+            title=f"Stored {n}", description=None, source="Wire",
+            url=f"https://example.com/{n}", published_at=f"2025-01-0{n}T00:00:00Z",
+        )
+        for n in range(1, 4)
+    ])
+    app = _make_app()
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    with patch("app.services.news_service.httpx.AsyncClient") as mock_client_cls:
+        resp = client.get("/api/news", params={"keyword": "AI", "store": "true", "limit": 2})
+        mock_client_cls.assert_not_called()
+
+    assert resp.status_code == 200
+    assert [a["title"] for a in resp.json()] == ["Stored 3", "Stored 2"]
+    cursor = resp.headers["X-Next-Cursor"]
+    rest = client.get("/api/news", params={"keyword": "AI", "store": "true", "cursor": cursor})
+    assert [a["title"] for a in rest.json()] == ["Stored 1"]
+    bad = client.get("/api/news", params={"store": "true", "cursor": "garbage"})
+    assert bad.status_code == 400
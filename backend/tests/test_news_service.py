@@ -1,8 +1,14 @@
+import asyncio
+
 import pytest
 from unittest.mock import patch, AsyncMock
 import httpx
+from fastapi import HTTPException
 
-from app.services.news_service import fetch_news
+from app.ratelimit import TokenBucket
+from app.schemas.news import NewsArticle
+from app.services import news_service
+from app.services.news_service import CampaignKeyword, NewsCache, fetch_news
 
 
 SAMPLE_API_RESPONSE = {
@@ -141,3 +147,272 @@ async def test_fetch_news_network_error():
             from fastapi import HTTPException
             assert isinstance(exc_info.value, HTTPException)
             assert exc_info.value.status_code == 502
+
+
+@pytest.fixture
+def cache(monkeypatch, clock):
+    cache = NewsCache(maxsize=2, ttl=60, stale=600, timer=clock)
+    cache.clock = clock
+    monkeypatch.setattr(news_service, "news_cache", cache)
+    monkeypatch.setattr(news_service, "news_api_bucket", TokenBucket(1000, 1000))
+    return cache
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replaces fetch_news with a scripted list of results or exceptions."""
+    calls = []
+    script = []
+
+    async def fake_fetch(keyword=None):
+        calls.append(keyword)
+        result = script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(news_service, "fetch_news", fake_fetch)
+    return calls, script
+
+
+def _articles(title):
+    return [NewsArticle(title=title, description=None, source="S", url=f"https://x/{title}", published_at="")]
+
+
+class TestNewsCache:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_reused_per_normalised_keyword(self, cache, upstream):
+        calls, script = upstream
+        script.append(_articles("a"))
+        first = await news_service.get_news(" Marketing ")
+        second = await news_service.get_news("marketing")
+        assert second is first
+        assert calls == ["Marketing"]
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_served_while_refreshing(self, cache, upstream):
+        calls, script = upstream
+        script.extend([_articles("old"), _articles("new")])
+        await news_service.get_news()
+        cache.clock.now += 61
+
+        stale = await news_service.get_news()
+        assert stale.articles[0].title == "old"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert (await news_service.get_news()).articles[0].title == "new"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_stale_reads_start_one_refresh(self, cache, upstream):
+        calls, script = upstream
+        script.extend([_articles("old"), _articles("new")])
+        await news_service.get_news()
+        cache.clock.now += 61
+
+        await asyncio.gather(*(news_service.get_news() for _ in range(5)))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_background_refresh_keeps_stale_copy(self, cache, upstream):
+        calls, script = upstream
+        script.extend([_articles("old"), HTTPException(status_code=429, detail="limited")])
+        await news_service.get_news()
+        cache.clock.now += 61
+
+        await news_service.get_news()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert (await news_service.get_news()).articles[0].title == "old"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 502])
+    async def test_very_old_entry_is_served_when_upstream_fails(self, cache, upstream, status):
+        calls, script = upstream
+        script.extend([_articles("old"), HTTPException(status_code=status, detail="down")])
+        await news_service.get_news()
+        cache.clock.now += 1000
+
+        cached = await news_service.get_news()
+        assert cached.articles[0].title == "old"
+        assert cache.age(cached) == 1000
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_without_cached_copy_propagates(self, cache, upstream):
+        calls, script = upstream
+        script.append(HTTPException(status_code=429, detail="limited"))
+        with pytest.raises(HTTPException) as exc_info:
+            await news_service.get_news()
+        assert exc_info.value.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_empty_bucket_is_a_429_without_calling_upstream(self, cache, upstream, monkeypatch):
+        calls, script = upstream
+        monkeypatch.setattr(news_service, "news_api_bucket", TokenBucket(0.001, 1))
+        monkeypatch.setattr(news_service, "NEWS_API_MAX_WAIT", 5)
+        script.append(_articles("a"))
+        await news_service.get_news("a")
+        with pytest.raises(HTTPException) as exc_info:
+            await news_service.get_news("b")
+        assert exc_info.value.status_code == 429
+        assert calls == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_very_old_entry_is_served_when_bucket_is_empty(self, cache, upstream, monkeypatch):
+        calls, script = upstream
+        monkeypatch.setattr(news_service, "news_api_bucket", TokenBucket(0.001, 1))
+        monkeypatch.setattr(news_service, "NEWS_API_MAX_WAIT", 5)
+        script.append(_articles("old"))
+        await news_service.get_news()
+        cache.clock.now += 1000
+
+        cached = await news_service.get_news()
+        assert cached.articles[0].title == "old"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_make_one_upstream_call(self, cache, monkeypatch):
+        calls = []
+        release = asyncio.Event()
+
+        async def slow_fetch(keyword=None):
+            calls.append(keyword)
+            await release.wait()
+            return _articles("a")
+
+        monkeypatch.setattr(news_service, "fetch_news", slow_fetch)
+        waiters = [
+            asyncio.ensure_future(news_service.get_news(keyword))
+            for keyword in ("AI", "ai", " ai ", "AI")
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_upstream_error(self, cache, monkeypatch):
+        calls = []
+
+        async def limited(keyword=None):
+            calls.append(keyword)
+            await asyncio.sleep(0)
+            raise HTTPException(status_code=429, detail="limited")
+
+        monkeypatch.setattr(news_service, "fetch_news", limited)
+        results = await asyncio.gather(
+            *(news_service.get_news("ai") for _ in range(3)), return_exceptions=True
+        )
+        assert len(calls) == 1
+        assert [r.status_code for r in results] == [429, 429, 429]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_keyword_is_evicted(self, cache, upstream):
+        calls, script = upstream
+        script.extend([_articles("a"), _articles("b"), _articles("c")])
+        await news_service.get_news("a")
+        await news_service.get_news("b")
+        await news_service.get_news("c")
+        assert len(cache) == 2
+        assert cache.get("a") is None
+
+
+class TestSharedClient:
+    @pytest.mark.asyncio
+    async def test_fetch_news_uses_shared_client(self, monkeypatch):
+        shared = AsyncMock()
+        shared.get = AsyncMock(return_value=httpx.Response(200, json=SAMPLE_API_RESPONSE))
+        monkeypatch.setattr(news_service, "_http_client", shared)
+
+        with patch.dict("os.environ", {"NEWS_API_KEY": "test-key"}):
+            with patch("app.services.news_service.httpx.AsyncClient") as mock_client_cls:
+                articles = await fetch_news()
+
+        assert len(articles) == 2
+        shared.get.assert_awaited_once()
+        mock_client_cls.assert_not_called()
+
+    def test_make_http_client_applies_pool_limits(self):
+        with patch("app.services.news_service.httpx.AsyncClient") as client_cls:
+            news_service.make_http_client(
+                max_connections=7, max_keepalive=3, keepalive_expiry=12, http2=False
+            )
+        client_cls.assert_called_once_with(
+            limits=httpx.Limits(
+                max_connections=7, max_keepalive_connections=3, keepalive_expiry=12
+            ),
+            http2=False,
+            timeout=news_service.NEWS_HTTP_TIMEOUT,
+        )
+
+class TestCampaignNews:
+    @pytest.fixture
+    def keyword_fetch(self, cache, monkeypatch):
+        """fetch_news stand-in answering per keyword after a short delay."""
+        calls = []
+        answers = {}
+
+        async def fake_fetch(keyword=None):
+            calls.append(keyword)
+            delay, answer = answers[keyword.lower()]
+            await asyncio.sleep(delay)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        monkeypatch.setattr(news_service, "fetch_news", fake_fetch)
+        return calls, answers
+
+    @pytest.mark.asyncio
+    async def test_merges_deduplicates_and_reports_per_campaign(self, keyword_fetch):
+        calls, answers = keyword_fetch
+        shared = _articles("shared")[0]
+        answers["sales"] = (0, [shared, *_articles("s")])
+        answers["brand"] = (0, [shared, *_articles("b")])
+        answers["retail"] = (0, HTTPException(status_code=429, detail="limited"))
+
+        news = await news_service.get_campaign_news([
+            CampaignKeyword(1, "Spring", "sales"),
+            CampaignKeyword(2, "Summer", "Sales"),
+            CampaignKeyword(3, "Launch", "brand"),
+            CampaignKeyword(4, "Shops", "retail"),
+        ])
+
+        assert sorted(calls, key=str.lower) == ["brand", "retail", "sales"]
+        assert [a.url for a in news.articles] == [
+            "https://x/shared", "https://x/s", "https://x/b"
+        ]
+        by_id = {c.campaign_id: c for c in news.campaigns}
+        assert by_id[1].article_urls == ["https://x/shared", "https://x/s"]
+        assert by_id[2].article_urls == by_id[1].article_urls
+        assert by_id[3].status == "ok"
+        assert (by_id[4].status, by_id[4].error) == ("error", "limited")
+
+    @pytest.mark.asyncio
+    async def test_slow_keyword_times_out_without_failing_others(self, keyword_fetch):
+        calls, answers = keyword_fetch
+        answers["fast"] = (0, _articles("f"))
+        answers["slow"] = (5, _articles("s"))
+
+        news = await news_service.get_campaign_news(
+            [CampaignKeyword(1, "A", "fast"), CampaignKeyword(2, "B", "slow")],
+            timeout=0.05,
+        )
+        assert [c.status for c in news.campaigns] == ["ok", "timeout"]
+        assert [a.url for a in news.articles] == ["https://x/f"]
+
+    @pytest.mark.asyncio
+    async def test_fetches_run_concurrently_up_to_the_limit(self, keyword_fetch):
+        calls, answers = keyword_fetch
+        for i in range(6):
+            answers[f"k{i}"] = (0.1, _articles(f"a{i}"))
+        campaigns = [CampaignKeyword(i, f"C{i}", f"k{i}") for i in range(6)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await news_service.get_campaign_news(campaigns, concurrency=3)
+        elapsed = loop.time() - started
+        assert 0.2 <= elapsed < 0.4
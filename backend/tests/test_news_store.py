@@ -0,0 +1,88 @@
+"""Tests for the local news article store and its ingester."""
+from datetime import datetime
+
+import pytest
+
+from app.ratelimit import TokenBucket
+from app.schemas.news import NewsArticle
+from app.services import news_service, news_store
+from tests.conftest import TestingSessionLocal
+
+
+def _article(n, published_at="2025-01-0{n}T10:00:00Z", url=None):
+    return NewsArticle(
+        title=f"Article {n}",
+        description=None,
+        source="Wire",
+        url=url if url is not None else f"https://example.com/{n}",
+        published_at=published_at.format(n=n),
+    )
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-01-15T10:00:00Z", datetime(2025, 1, 15, 10)),
+    ("2025-01-15T12:00:00+02:00", datetime(2025, 1, 15, 10)),
+    ("", None),
+    (None, None),
+    ("yesterday", None),
+])
+def test_parse_published_at(value, expected):
+    assert news_store.parse_published_at(value) == expected
+
+
+class TestStoreArticles:
+    def test_inserts_new_urls_once(self, db):
+        assert news_store.store_articles(db, "AI", [_article(1), _article(2), _article(1)]) == 2
+        assert news_store.store_articles(db, "ai", [_article(2), _article(3)]) == 1
+        assert news_store.latest_published_at(db, " AI ") == datetime(2025, 1, 3, 10)
+
+    def test_skips_articles_without_url_or_date_and_older_than_since(self, db):
+        articles = [
+            _article(1),
+            _article(2, url=""),
+            _article(3, published_at="unknown"),
+            _article(4),
+        ]
+        added = news_store.store_articles(
+            db, None, articles, since=datetime(2025, 1, 2)
+        )
+        assert added == 1
+        assert news_store.latest_published_at(db, None) == datetime(2025, 1, 4, 10)
+
+
+class TestArticlePages:
+    def test_pages_newest_first_with_cursor(self, db):
+        news_store.store_articles(db, "ai", [_article(n) for n in range(1, 6)])
+        news_store.store_articles(db, "", [_article(9, url="https://example.com/top")])
+
+        first, cursor = news_store.get_article_page(db, "AI", limit=2)
+        assert [a.title for a in first] == ["Article 5", "Article 4"]
+        assert first[0].published_at == "2025-01-05T10:00:00Z"
+        second, cursor = news_store.get_article_page(db, "ai", limit=2, cursor=cursor)
+        third, cursor = news_store.get_article_page(db, "ai", limit=2, cursor=cursor)
+        assert [a.title for a in second + third] == ["Article 3", "Article 2", "Article 1"]
+        assert cursor is None
+
+        everything, _ = news_store.get_article_page(db, None, limit=10)
+        assert len(everything) == 6
+
+    def test_invalid_cursor_raises(self, db):
+        with pytest.raises(ValueError):
+            news_store.get_article_page(db, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_ingest_asks_only_for_newer_articles(db, monkeypatch):
+    requests = []
+    batches = [[_article(1), _article(2)], [_article(2), _article(3)]]
+
+    async def fake_fetch(keyword=None, since=None):
+        requests.append((keyword, since))
+        return batches.pop(0)
+
+    monkeypatch.setattr(news_service, "fetch_news", fake_fetch)
+    monkeypatch.setattr(news_service, "news_api_bucket", TokenBucket(1000, 1000))
+
+    assert await news_store.ingest(TestingSessionLocal, "AI") == 2
+    assert await news_store.ingest(TestingSessionLocal, "AI") == 1
+    assert requests == [("AI", None), ("AI", datetime(2025, 1, 2, 10))]
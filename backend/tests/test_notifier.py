@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.notifier import ChangeNotifier
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_already_behind():
+    notifier = ChangeNotifier()
+    notifier.notify()
+    assert await notifier.wait(0, timeout=1) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_seen_version():
+    notifier = ChangeNotifier()
+    assert await notifier.wait(0, timeout=0.01) == 0
+
+
+@pytest.mark.asyncio
+async def test_notify_from_another_thread_wakes_waiter():
+    notifier = ChangeNotifier()
+    waiter = asyncio.ensure_future(notifier.wait(0, timeout=5))
+    await asyncio.sleep(0)
+    thread = threading.Thread(target=notifier.notify)
+    thread.start()
+    thread.join()
+    assert await asyncio.wait_for(waiter, 1) == 1
+    assert not notifier._waiters
@@ -0,0 +1,169 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.schemas.campaign import CampaignCreate, CampaignFilters, CampaignPatch
+from app.services.campaign_service import create_campaign, delete_campaign, patch_campaign
+from app.services.pacing_service import bucket_days, get_pacing, spread_changes
+
+
+def _days(*values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+def _make_campaign(**overrides) -> CampaignCreate:
+    defaults = {
+        "name": "Test Campaign",
+        "budget": 70.0,
+        "start_date": date(2025, 1, 1),
+        "end_date": date(2025, 1, 7),
+        "platform": "google",
+    }
+    defaults.update(overrides)
+    return CampaignCreate(**defaults)
+
+
+def _spread(budgets, starts, ends, groups, n_groups, first_day, n_days):
+    """spread_changes for whole campaigns: +rate at the start, -rate after the end."""
+    rate = budgets / ((ends - starts).astype(np.int64) + 1)
+    return spread_changes(
+        np.concatenate([starts, ends + 1]),
+        np.concatenate([rate, -rate]),
+        np.concatenate([groups, groups]),
+        n_groups, first_day, n_days,
+    )
+
+
+class TestSpreadChanges:
+    def test_matches_per_day_loop(self):
+        rng = np.random.default_rng(7)
+        n, n_days = 200, 60
+        first_day = np.datetime64("2025-01-01")
+        starts = first_day + rng.integers(-20, n_days, n)
+        ends = starts + rng.integers(0, 40, n)
+        budgets = rng.uniform(0, 1000, n)
+        groups = rng.integers(0, 3, n)
+
+        expected = np.zeros((3, n_days))
+        for b, s, e, g in zip(budgets, starts, ends, groups):
+            rate = b / ((e - s).astype(int) + 1)
+            for offset in range(n_days):
+                if s <= first_day + offset <= e:
+                    expected[g, offset] += rate
+
+        result = _spread(budgets, starts, ends, groups, 3, first_day, n_days)
+        np.testing.assert_allclose(result, expected, atol=1e-9)
+
+    def test_campaign_ending_on_last_day(self):
+        result = _spread(
+            np.array([30.0]), _days("2025-01-01"), _days("2025-01-03"),
+            np.array([0]), 1, np.datetime64("2025-01-01"), 3,
+        )
+        assert result.tolist() == [[10.0, 10.0, 10.0]]
+
+    def test_campaigns_outside_window_are_ignored(self):
+        result = _spread(
+            np.array([30.0, 30.0]),
+            _days("2024-01-01", "2026-01-01"),
+            _days("2024-01-03", "2026-01-03"),
+            np.array([0, 0]), 1, np.datetime64("2025-01-01"), 2,
+        )
+        assert result.tolist() == [[0.0, 0.0]]
+
+
+class TestBucketDays:
+    def test_weeks_start_on_monday(self):
+        daily = np.ones((1, 10))  # Wed 2025-01-01 .. Fri 2025-01-10
+        labels, sums = bucket_days(daily, np.datetime64("2025-01-01"), "week")
+        assert [str(d) for d in labels] == ["2024-12-30", "2025-01-06"]
+        assert sums.tolist() == [[5.0, 5.0]]
+
+    def test_months(self):
+        daily = np.ones((2, 45))
+        labels, sums = bucket_days(daily, np.datetime64("2025-01-15"), "month")
+        assert [str(d) for d in labels] == ["2025-01-01", "2025-02-01"]
+        assert sums.tolist() == [[17.0, 28.0], [17.0, 28.0]]
+
+
+class TestGetPacing:
+    def test_empty_database(self, db):
+        pacing = get_pacing(db)
+        assert pacing.dates == [] and pacing.series == {} and pacing.total == []
+
+    def test_daily_series_by_platform(self, db):
+        create_campaign(db, _make_campaign())
+        create_campaign(db, _make_campaign(
+            platform="email", budget=20.0,
+            start_date=date(2025, 1, 6), end_date=date(2025, 1, 7),
+        ))
+        pacing = get_pacing(db)
+        assert pacing.dates[0] == "2025-01-01" and len(pacing.dates) == 7
+        assert pacing.series["google"] == [10.0] * 7
+        assert pacing.series["email"] == [0.0] * 5 + [10.0, 10.0]
+        assert pacing.total[-1] == 20.0
+
+    def test_monthly_by_category_within_window(self, db):
+        create_campaign(db, _make_campaign(
+            category="sales", budget=310.0,
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 31),
+        ))
+        pacing = get_pacing(
+            db, "category", "month",
+            date_from=date(2025, 1, 1), date_to=date(2025, 2, 28),
+        )
+        assert pacing.dates == ["2025-01-01", "2025-02-01"]
+        assert pacing.series == {"sales": [310.0, 0.0]}
+
+    def test_budget_is_conserved(self, db):
+        for offset in range(5):
+            start = date(2025, 1, 1) + timedelta(days=offset * 9)
+            create_campaign(db, _make_campaign(
+                name=f"C{offset}", budget=123.45,
+                start_date=start, end_date=start + timedelta(days=offset * 11),
+            ))
+        assert sum(get_pacing(db, granularity="week").total) == pytest.approx(5 * 123.45)
+
+    def test_window_validation(self, db):
+        create_campaign(db, _make_campaign())
+        with pytest.raises(ValueError):
+            get_pacing(db, date_from=date(2025, 2, 1), date_to=date(2025, 1, 1))
+        with pytest.raises(ValueError):
+            get_pacing(db, date_from=date(1900, 1, 1), date_to=date(2100, 1, 1))
+
+    def test_filters_apply(self, db):
+        create_campaign(db, _make_campaign(status="active"))
+        create_campaign(db, _make_campaign(platform="email"))
+        pacing = get_pacing(db, filters=CampaignFilters(status="active"))
+        assert list(pacing.series) == ["google"]
+
+    def test_window_clips_overlapping_campaigns(self, db):
+        create_campaign(db, _make_campaign(
+            budget=70.0, start_date=date(2024, 12, 29), end_date=date(2025, 1, 4),
+        ))
+        create_campaign(db, _make_campaign(
+            platform="email", start_date=date(2024, 1, 1), end_date=date(2024, 1, 7),
+        ))
+        pacing = get_pacing(db, date_from=date(2025, 1, 1), date_to=date(2025, 1, 7))
+        assert pacing.series == {
+            "email": [0.0] * 7,
+            "google": [10.0] * 4 + [0.0] * 3,
+        }
+
+    def test_active_window_filters_scan_campaigns(self, db):
+        create_campaign(db, _make_campaign())
+        create_campaign(db, _make_campaign(
+            platform="email", start_date=date(2025, 2, 1), end_date=date(2025, 2, 7),
+        ))
+        filters = CampaignFilters(active_to=date(2025, 1, 31))
+        pacing = get_pacing(db, filters=filters)
+        assert pacing.series == {"google": [10.0] * 7}
+
+    def test_follows_updates_and_deletes(self, db):
+        created = create_campaign(db, _make_campaign())
+        patch_campaign(db, created.id, CampaignPatch(
+            budget=30.0, end_date=date(2025, 1, 3),
+        ))
+        assert get_pacing(db).series == {"google": [10.0] * 3}
+        delete_campaign(db, created.id)
+        assert get_pacing(db).series == {}
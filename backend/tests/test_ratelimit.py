@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.ratelimit import TokenBucket
+
+
+def test_burst_up_to_capacity_then_waits_in_order(clock):
+    bucket = TokenBucket(rate=2, capacity=3, timer=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2, timer=clock)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now = 100
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+@pytest.mark.asyncio
+async def test_acquire_sleeps_for_reserved_delay(monkeypatch, clock):
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr("app.ratelimit.asyncio.sleep", fake_sleep)
+    bucket = TokenBucket(rate=10, capacity=1, timer=clock)
+    await bucket.acquire()
+    await bucket.acquire()
+    assert slept == [pytest.approx(0.1)]
+
+
+def test_reserve_past_max_wait_takes_no_token(clock):
+    bucket = TokenBucket(rate=1, capacity=1, timer=clock)
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0.5) is None
+    assert bucket.reserve(max_wait=1) == pytest.approx(1.0)
+    assert bucket.reserve(max_wait=1) is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_past_max_wait_returns_false(monkeypatch, clock):
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr("app.ratelimit.asyncio.sleep", fake_sleep)
+    bucket = TokenBucket(rate=1, capacity=1, timer=clock)
+    assert await bucket.acquire(max_wait=0) is True
+    assert await bucket.acquire(max_wait=0.5) is False
+    assert slept == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_refunds_its_token(monkeypatch, clock):
+    async def cancelled_sleep(delay):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr("app.ratelimit.asyncio.sleep", cancelled_sleep)
+    bucket = TokenBucket(rate=1, capacity=1, timer=clock)
+    await bucket.acquire()
+    with pytest.raises(asyncio.CancelledError):
+        await bucket.acquire()
+    assert bucket.reserve() == pytest.approx(1.0)
@@ -0,0 +1,183 @@
+from datetime import date
+
+from sqlalchemy import select, text, update
+
+from app import cli
+from app.models.campaign import Campaign
+from app.models.campaign_pacing import CampaignPacing
+from app.models.campaign_rollup import CampaignRollup
+from app.schemas.campaign import CampaignCreate, CampaignPatch
+from app.services.campaign_service import (
+    bulk_create_campaigns,
+    create_campaign,
+    delete_campaign,
+    patch_campaign,
+)
+from app.services.rollup_service import (
+    check_pacing,
+    check_rollups,
+    rebuild_pacing,
+    rebuild_rollups,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _make_campaign(**overrides) -> CampaignCreate:
+    defaults = {
+        "name": "Test Campaign",
+        "status": "draft",
+        "budget": 100.0,
+        "start_date": date(2025, 1, 1),
+        "end_date": date(2025, 12, 31),
+        "category": "sales",
+    }
+    defaults.update(overrides)
+    return CampaignCreate(**defaults)
+
+
+def _rollups(db):
+    return {
+        (r.status, r.category): (r.campaign_count, r.total_budget)
+        for r in db.execute(select(CampaignRollup.__table__))
+    }
+
+
+class TestRollupTriggers:
+    def test_create_adds_to_group(self, db):
+        create_campaign(db, _make_campaign(budget=100.0))
+        create_campaign(db, _make_campaign(budget=50.0))
+        assert _rollups(db) == {("draft", "sales"): (2, 150.0)}
+
+    def test_bulk_create_is_counted(self, db):
+        bulk_create_campaigns(db, [_make_campaign(), _make_campaign(status="active")])
+        assert _rollups(db) == {
+            ("draft", "sales"): (1, 100.0),
+            ("active", "sales"): (1, 100.0),
+        }
+
+    def test_update_moves_between_groups(self, db):
+        created = create_campaign(db, _make_campaign(budget=100.0))
+        create_campaign(db, _make_campaign(budget=40.0))
+        patch_campaign(db, created.id, CampaignPatch(status="active", budget=70.0))
+        assert _rollups(db) == {
+            ("draft", "sales"): (1, 40.0),
+            ("active", "sales"): (1, 70.0),
+        }
+
+    def test_unrelated_update_leaves_rollups_alone(self, db):
+        created = create_campaign(db, _make_campaign())
+        patch_campaign(db, created.id, CampaignPatch(name="Renamed"))
+        assert _rollups(db) == {("draft", "sales"): (1, 100.0)}
+
+    def test_delete_drops_empty_group(self, db):
+        created = create_campaign(db, _make_campaign())
+        delete_campaign(db, created.id)
+        assert _rollups(db) == {}
+
+
+def _pacing(db):
+    return {
+        (r.platform, r.day): (r.campaign_count, round(r.rate_change, 6))
+        for r in db.execute(select(CampaignPacing.__table__))
+    }
+
+
+class TestPacingTriggers:
+    def test_create_adds_rate_at_start_and_removes_it_after_end(self, db):
+        create_campaign(db, _make_campaign(
+            budget=70.0, start_date=date(2025, 1, 1), end_date=date(2025, 1, 7),
+        ))
+        assert _pacing(db) == {
+            ("other", date(2025, 1, 1)): (1, 10.0),
+            ("other", date(2025, 1, 8)): (1, -10.0),
+        }
+
+    def test_shared_days_are_summed(self, db):
+        bulk_create_campaigns(db, [
+            _make_campaign(budget=70.0, start_date=date(2025, 1, 1), end_date=date(2025, 1, 7)),
+            _make_campaign(budget=20.0, start_date=date(2025, 1, 8), end_date=date(2025, 1, 9)),
+        ])
+        assert _pacing(db)[("other", date(2025, 1, 8))] == (2, 0.0)
+
+    def test_update_moves_the_rate(self, db):
+        created = create_campaign(db, _make_campaign(
+            budget=70.0, start_date=date(2025, 1, 1), end_date=date(2025, 1, 7),
+        ))
+        patch_campaign(db, created.id, CampaignPatch(platform="email", budget=7.0))
+        assert _pacing(db) == {
+            ("email", date(2025, 1, 1)): (1, 1.0),
+            ("email", date(2025, 1, 8)): (1, -1.0),
+        }
+
+    def test_delete_drops_unreferenced_rows(self, db):
+        created = create_campaign(db, _make_campaign())
+        delete_campaign(db, created.id)
+        assert _pacing(db) == {}
+
+
+class TestRollupMaintenance:
+    def test_consistent_after_writes(self, db):
+        created = create_campaign(db, _make_campaign())
+        create_campaign(db, _make_campaign(category="engagement"))
+        patch_campaign(db, created.id, CampaignPatch(budget=12.5))
+        assert check_rollups(db) == []
+
+    def test_detects_and_rebuilds_drift(self, db):
+        create_campaign(db, _make_campaign(budget=100.0))
+        create_campaign(db, _make_campaign(status="active"))
+        db.execute(update(CampaignRollup).values(campaign_count=5))
+        db.execute(text("DELETE FROM campaign_rollups WHERE status = 'active'"))
+        db.commit()
+
+        mismatches = check_rollups(db)
+        assert {(m.status, m.expected_count, m.actual_count) for m in mismatches} == {
+            ("draft", 1, 5),
+            ("active", 1, 0),
+        }
+
+        assert rebuild_rollups(db) == 2
+        assert check_rollups(db) == []
+        assert _rollups(db)[("draft", "sales")] == (1, 100.0)
+
+    def test_rebuild_matches_campaign_dates(self, db):
+        created = create_campaign(db, _make_campaign())
+        db.execute(
+            update(Campaign)
+            .where(Campaign.id == created.id)
+            .values(created_at=text("'2024-03-01 10:00:00'"))
+        )
+        db.commit()
+        days = db.scalars(select(CampaignRollup.created_date)).all()
+        assert days == [date(2024, 3, 1)]
+        assert check_rollups(db) == []
+
+    def test_pacing_detects_and_rebuilds_drift(self, db):
+        create_campaign(db, _make_campaign(
+            budget=70.0, start_date=date(2025, 1, 1), end_date=date(2025, 1, 7),
+        ))
+        created = create_campaign(db, _make_campaign(status="active"))
+        patch_campaign(db, created.id, CampaignPatch(budget=12.5))
+        assert check_pacing(db) == []
+
+        db.execute(update(CampaignPacing).values(rate_change=0.0))
+        db.commit()
+        assert len(check_pacing(db)) == 4
+
+        assert rebuild_pacing(db) == 4
+        assert check_pacing(db) == []
+        assert _pacing(db)[("other", date(2025, 1, 8))] == (1, -10.0)
+
+
+class TestRollupCli:
+    def test_check_and_rebuild(self, db, monkeypatch, capsys):
+        monkeypatch.setattr(cli, "SessionLocal", TestingSessionLocal)
+        create_campaign(db, _make_campaign())
+        db.execute(text("DELETE FROM campaign_rollups"))
+        db.execute(text("DELETE FROM campaign_pacing"))
+        db.commit()
+
+        assert cli.main(["rollups", "check"]) == 1
+        assert "out of sync" in capsys.readouterr().out
+        assert cli.main(["rollups", "rebuild"]) == 0
+        assert cli.main(["rollups", "check"]) == 0
+        assert "consistent" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return "result"
+
+    waiters = [asyncio.ensure_future(flights.do("k", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"started": 1, "shared": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    waiters = [asyncio.ensure_future(flights.do("k", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_finished_call_is_not_reused():
+    flights = SingleFlight()
+    counter = iter(range(10))
+
+    async def fetch():
+        return next(counter)
+
+    assert await flights.do("k", fetch) == 0
+    assert await flights.do("k", fetch) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "ok"
+
+    first = asyncio.ensure_future(flights.do("k", fetch))
+    second = asyncio.ensure_future(flights.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "ok"